@@ -0,0 +1,100 @@
+"""match record baseline
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-16 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+RESULT_EXPRESSION = """
+    CASE
+        WHEN my_score > opponent_score THEN 'WIN'
+        WHEN my_score < opponent_score THEN 'LOSS'
+        ELSE 'DRAW'
+    END
+"""
+SEASON_EXPRESSION = "strftime('%Y/%m', played_at, '-9 hours')"
+
+
+def _match_record_columns() -> list[sa.Column]:
+    return [
+        sa.Column("played_at", sa.DateTime(), nullable=False),
+        sa.Column("rule", sa.String(length=64), nullable=False),
+        sa.Column("stage", sa.String(length=200), nullable=False),
+        sa.Column("my_score", sa.Integer(), nullable=False),
+        sa.Column("opponent_score", sa.Integer(), nullable=False),
+        sa.Column("my_character", sa.String(length=100), nullable=False),
+        sa.Column("my_partner_character", sa.String(length=100), nullable=True),
+        sa.Column("opponent_character", sa.String(length=100), nullable=False),
+        sa.Column("opponent_partner_character", sa.String(length=100), nullable=True),
+        sa.Column("my_racket", sa.String(length=100), nullable=True),
+        sa.Column("my_partner_racket", sa.String(length=100), nullable=True),
+        sa.Column("opponent_racket", sa.String(length=100), nullable=True),
+        sa.Column("opponent_partner_racket", sa.String(length=100), nullable=True),
+        sa.Column("my_rate", sa.Integer(), nullable=False),
+        sa.Column("my_rate_band", sa.String(length=3), nullable=False),
+        sa.Column("my_partner_rate_band", sa.String(length=3), nullable=True),
+        sa.Column("opponent_rate_band", sa.String(length=3), nullable=False),
+        sa.Column("opponent_partner_rate_band", sa.String(length=3), nullable=True),
+        sa.Column("opponent_player_name", sa.String(length=100), nullable=True),
+        sa.Column("my_partner_player_name", sa.String(length=100), nullable=True),
+        sa.Column("opponent_partner_player_name", sa.String(length=100), nullable=True),
+        sa.Column("id", sa.Integer(), nullable=False, primary_key=True),
+        sa.Column("season", sa.String(length=7), nullable=False),
+        sa.Column("result", sa.String(length=10), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False)
+    ]
+
+
+def _placeholder_default(column: sa.Column) -> sa.TextClause:
+    if isinstance(column.type, sa.Integer):
+        return sa.text("0")
+    if isinstance(column.type, sa.DateTime):
+        return sa.text("CURRENT_TIMESTAMP")
+    return sa.text("'-'")
+
+
+def _upgrade_legacy_match_record_table(existing_columns: set[str]) -> None:
+    for column in _match_record_columns():
+        if column.primary_key or column.name in existing_columns:
+            continue
+        if column.nullable or column.name in {"season", "result"}:
+            op.add_column("matchrecord", sa.Column(column.name, column.type, nullable=True))
+        else:
+            # Legacy databases predate this column; keep their rows with an editable placeholder.
+            op.add_column(
+                "matchrecord",
+                sa.Column(column.name, column.type, nullable=False, server_default=_placeholder_default(column))
+            )
+
+    op.execute(
+        f"""
+        UPDATE matchrecord
+        SET result = {RESULT_EXPRESSION},
+            season = {SEASON_EXPRESSION}
+        WHERE result IS NOT {RESULT_EXPRESSION}
+            OR season IS NOT {SEASON_EXPRESSION}
+        """
+    )
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    if inspector.has_table("matchrecord"):
+        existing_columns = {column["name"] for column in inspector.get_columns("matchrecord")}
+        _upgrade_legacy_match_record_table(existing_columns)
+        return
+
+    op.create_table("matchrecord", *_match_record_columns())
+
+
+def downgrade() -> None:
+    op.drop_table("matchrecord")
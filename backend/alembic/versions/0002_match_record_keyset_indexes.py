@@ -0,0 +1,30 @@
+"""match record keyset indexes
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-16 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_matchrecord_played_at_id", "matchrecord", ["played_at", "id"], if_not_exists=True)
+    op.create_index(
+        "ix_matchrecord_rule_played_at_id",
+        "matchrecord",
+        ["rule", "played_at", "id"],
+        if_not_exists=True
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_matchrecord_rule_played_at_id", table_name="matchrecord")
+    op.drop_index("ix_matchrecord_played_at_id", table_name="matchrecord")
@@ -0,0 +1,59 @@
+"""match stat rollup
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-16 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+ROLLUP_DIMENSIONS = (
+    "stage",
+    "my_character",
+    "opponent_character",
+    "my_racket",
+    "opponent_racket",
+    "opponent_rate_band"
+)
+WIN_COUNT_EXPRESSION = "SUM(CASE WHEN result = 'WIN' THEN 1 ELSE 0 END)"
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    if inspector.has_table("matchstatrollup"):
+        op.execute("DELETE FROM matchstatrollup")
+    else:
+        op.create_table(
+            "matchstatrollup",
+            sa.Column("season", sa.String(length=7), nullable=False),
+            sa.Column("rule", sa.String(length=64), nullable=False),
+            sa.Column("dimension", sa.String(length=64), nullable=False),
+            sa.Column("value", sa.String(length=200), nullable=False),
+            sa.Column("match_count", sa.Integer(), nullable=False),
+            sa.Column("win_count", sa.Integer(), nullable=False),
+            sa.PrimaryKeyConstraint("season", "rule", "dimension", "value")
+        )
+
+    selects = [
+        f"SELECT season, rule, 'total', '', COUNT(*), {WIN_COUNT_EXPRESSION} FROM matchrecord GROUP BY season, rule"
+    ]
+    for dimension in ROLLUP_DIMENSIONS:
+        selects.append(
+            f"SELECT season, rule, '{dimension}', COALESCE({dimension}, ''), COUNT(*), {WIN_COUNT_EXPRESSION} "
+            f"FROM matchrecord GROUP BY season, rule, COALESCE({dimension}, '')"
+        )
+    op.execute(
+        "INSERT INTO matchstatrollup (season, rule, dimension, value, match_count, win_count) "
+        + " UNION ALL ".join(selects)
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("matchstatrollup")
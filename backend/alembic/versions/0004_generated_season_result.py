@@ -0,0 +1,131 @@
+"""generated season and result columns
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-16 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+SEASON_EXPRESSION = "strftime('%Y/%m', played_at, '-9 hours')"
+RESULT_EXPRESSION = (
+    "CASE WHEN my_score > opponent_score THEN 'WIN' "
+    "WHEN my_score < opponent_score THEN 'LOSS' ELSE 'DRAW' END"
+)
+ROLLUP_DIMENSIONS = (
+    "stage",
+    "my_character",
+    "opponent_character",
+    "my_racket",
+    "opponent_racket",
+    "opponent_rate_band"
+)
+WIN_COUNT_EXPRESSION = "SUM(CASE WHEN result = 'WIN' THEN 1 ELSE 0 END)"
+STORED_COLUMNS = [
+    "played_at",
+    "rule",
+    "stage",
+    "my_score",
+    "opponent_score",
+    "my_character",
+    "my_partner_character",
+    "opponent_character",
+    "opponent_partner_character",
+    "my_racket",
+    "my_partner_racket",
+    "opponent_racket",
+    "opponent_partner_racket",
+    "my_rate",
+    "my_rate_band",
+    "my_partner_rate_band",
+    "opponent_rate_band",
+    "opponent_partner_rate_band",
+    "opponent_player_name",
+    "my_partner_player_name",
+    "opponent_partner_player_name",
+    "id",
+    "created_at"
+]
+
+
+def _create_match_record_table(table_name: str, generated: bool) -> None:
+    if generated:
+        season_column = sa.Column("season", sa.String(length=7), sa.Computed(SEASON_EXPRESSION, persisted=True))
+        result_column = sa.Column("result", sa.String(length=10), sa.Computed(RESULT_EXPRESSION, persisted=True))
+    else:
+        season_column = sa.Column("season", sa.String(length=7), nullable=False)
+        result_column = sa.Column("result", sa.String(length=10), nullable=False)
+
+    op.create_table(
+        table_name,
+        sa.Column("played_at", sa.DateTime(), nullable=False),
+        sa.Column("rule", sa.String(length=64), nullable=False),
+        sa.Column("stage", sa.String(length=200), nullable=False),
+        sa.Column("my_score", sa.Integer(), nullable=False),
+        sa.Column("opponent_score", sa.Integer(), nullable=False),
+        sa.Column("my_character", sa.String(length=100), nullable=False),
+        sa.Column("my_partner_character", sa.String(length=100), nullable=True),
+        sa.Column("opponent_character", sa.String(length=100), nullable=False),
+        sa.Column("opponent_partner_character", sa.String(length=100), nullable=True),
+        sa.Column("my_racket", sa.String(length=100), nullable=True),
+        sa.Column("my_partner_racket", sa.String(length=100), nullable=True),
+        sa.Column("opponent_racket", sa.String(length=100), nullable=True),
+        sa.Column("opponent_partner_racket", sa.String(length=100), nullable=True),
+        sa.Column("my_rate", sa.Integer(), nullable=False),
+        sa.Column("my_rate_band", sa.String(length=3), nullable=False),
+        sa.Column("my_partner_rate_band", sa.String(length=3), nullable=True),
+        sa.Column("opponent_rate_band", sa.String(length=3), nullable=False),
+        sa.Column("opponent_partner_rate_band", sa.String(length=3), nullable=True),
+        sa.Column("opponent_player_name", sa.String(length=100), nullable=True),
+        sa.Column("my_partner_player_name", sa.String(length=100), nullable=True),
+        sa.Column("opponent_partner_player_name", sa.String(length=100), nullable=True),
+        sa.Column("id", sa.Integer(), nullable=False, primary_key=True),
+        season_column,
+        result_column,
+        sa.Column("created_at", sa.DateTime(), nullable=False)
+    )
+
+
+def _rebuild_match_record_table(generated: bool, copied_columns: list[str]) -> None:
+    _create_match_record_table("matchrecord_new", generated)
+    column_list = ", ".join(copied_columns)
+    op.execute(f"INSERT INTO matchrecord_new ({column_list}) SELECT {column_list} FROM matchrecord")
+    op.drop_table("matchrecord")
+    op.rename_table("matchrecord_new", "matchrecord")
+    op.create_index("ix_matchrecord_played_at_id", "matchrecord", ["played_at", "id"])
+    op.create_index("ix_matchrecord_rule_played_at_id", "matchrecord", ["rule", "played_at", "id"])
+
+
+def _rebuild_match_stat_rollups() -> None:
+    selects = [
+        f"SELECT season, rule, 'total', '', COUNT(*), {WIN_COUNT_EXPRESSION} FROM matchrecord GROUP BY season, rule"
+    ]
+    for dimension in ROLLUP_DIMENSIONS:
+        selects.append(
+            f"SELECT season, rule, '{dimension}', COALESCE({dimension}, ''), COUNT(*), {WIN_COUNT_EXPRESSION} "
+            f"FROM matchrecord GROUP BY season, rule, COALESCE({dimension}, '')"
+        )
+    op.execute("DELETE FROM matchstatrollup")
+    op.execute(
+        "INSERT INTO matchstatrollup (season, rule, dimension, value, match_count, win_count) "
+        + " UNION ALL ".join(selects)
+    )
+
+
+def upgrade() -> None:
+    _rebuild_match_record_table(generated=True, copied_columns=STORED_COLUMNS)
+    op.create_index("ix_matchrecord_season_played_at_id", "matchrecord", ["season", "played_at", "id"])
+    op.create_index("ix_matchrecord_season_rule_result", "matchrecord", ["season", "rule", "result"])
+    # Stored season/result values may have drifted from the derived ones, so recount from scratch.
+    _rebuild_match_stat_rollups()
+
+
+def downgrade() -> None:
+    _rebuild_match_record_table(generated=False, copied_columns=[*STORED_COLUMNS, "season", "result"])
@@ -0,0 +1,28 @@
+"""data revision counter
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-16 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "datarevision",
+        sa.Column("id", sa.Integer(), nullable=False, primary_key=True),
+        sa.Column("revision", sa.Integer(), nullable=False)
+    )
+    op.execute("INSERT INTO datarevision (id, revision) VALUES (1, 1)")
+
+
+def downgrade() -> None:
+    op.drop_table("datarevision")
@@ -0,0 +1,122 @@
+"""record change log
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-16 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+SEASON_EXPRESSION = "strftime('%Y/%m', played_at, '-9 hours')"
+RESULT_EXPRESSION = (
+    "CASE WHEN my_score > opponent_score THEN 'WIN' "
+    "WHEN my_score < opponent_score THEN 'LOSS' ELSE 'DRAW' END"
+)
+STORED_COLUMNS = [
+    "played_at",
+    "rule",
+    "stage",
+    "my_score",
+    "opponent_score",
+    "my_character",
+    "my_partner_character",
+    "opponent_character",
+    "opponent_partner_character",
+    "my_racket",
+    "my_partner_racket",
+    "opponent_racket",
+    "opponent_partner_racket",
+    "my_rate",
+    "my_rate_band",
+    "my_partner_rate_band",
+    "opponent_rate_band",
+    "opponent_partner_rate_band",
+    "opponent_player_name",
+    "my_partner_player_name",
+    "opponent_partner_player_name",
+    "id",
+    "created_at"
+]
+MATCH_RECORD_INDEXES = {
+    "ix_matchrecord_played_at_id": ["played_at", "id"],
+    "ix_matchrecord_rule_played_at_id": ["rule", "played_at", "id"],
+    "ix_matchrecord_season_played_at_id": ["season", "played_at", "id"],
+    "ix_matchrecord_season_rule_result": ["season", "rule", "result"]
+}
+
+
+def _create_match_record_table(table_name: str, with_revision: bool) -> None:
+    extra_columns = []
+    if with_revision:
+        extra_columns.append(sa.Column("revision", sa.Integer(), nullable=False, server_default="0"))
+
+    op.create_table(
+        table_name,
+        sa.Column("played_at", sa.DateTime(), nullable=False),
+        sa.Column("rule", sa.String(length=64), nullable=False),
+        sa.Column("stage", sa.String(length=200), nullable=False),
+        sa.Column("my_score", sa.Integer(), nullable=False),
+        sa.Column("opponent_score", sa.Integer(), nullable=False),
+        sa.Column("my_character", sa.String(length=100), nullable=False),
+        sa.Column("my_partner_character", sa.String(length=100), nullable=True),
+        sa.Column("opponent_character", sa.String(length=100), nullable=False),
+        sa.Column("opponent_partner_character", sa.String(length=100), nullable=True),
+        sa.Column("my_racket", sa.String(length=100), nullable=True),
+        sa.Column("my_partner_racket", sa.String(length=100), nullable=True),
+        sa.Column("opponent_racket", sa.String(length=100), nullable=True),
+        sa.Column("opponent_partner_racket", sa.String(length=100), nullable=True),
+        sa.Column("my_rate", sa.Integer(), nullable=False),
+        sa.Column("my_rate_band", sa.String(length=3), nullable=False),
+        sa.Column("my_partner_rate_band", sa.String(length=3), nullable=True),
+        sa.Column("opponent_rate_band", sa.String(length=3), nullable=False),
+        sa.Column("opponent_partner_rate_band", sa.String(length=3), nullable=True),
+        sa.Column("opponent_player_name", sa.String(length=100), nullable=True),
+        sa.Column("my_partner_player_name", sa.String(length=100), nullable=True),
+        sa.Column("opponent_partner_player_name", sa.String(length=100), nullable=True),
+        sa.Column("id", sa.Integer(), nullable=False, primary_key=True),
+        sa.Column("season", sa.String(length=7), sa.Computed(SEASON_EXPRESSION, persisted=True)),
+        sa.Column("result", sa.String(length=10), sa.Computed(RESULT_EXPRESSION, persisted=True)),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        *extra_columns,
+        sqlite_autoincrement=with_revision
+    )
+
+
+def _rebuild_match_record_table(with_revision: bool, copied_columns: str, source_columns: str) -> None:
+    _create_match_record_table("matchrecord_new", with_revision)
+    op.execute(f"INSERT INTO matchrecord_new ({copied_columns}) SELECT {source_columns} FROM matchrecord")
+    op.drop_table("matchrecord")
+    op.rename_table("matchrecord_new", "matchrecord")
+    for index_name, columns in MATCH_RECORD_INDEXES.items():
+        op.create_index(index_name, "matchrecord", columns)
+
+
+def upgrade() -> None:
+    # AUTOINCREMENT keeps ids of deleted records from being reused, so tombstones stay unambiguous.
+    column_list = ", ".join(STORED_COLUMNS)
+    _rebuild_match_record_table(
+        with_revision=True,
+        copied_columns=f"{column_list}, revision",
+        source_columns=f"{column_list}, (SELECT revision FROM datarevision WHERE id = 1)"
+    )
+    op.create_index("ix_matchrecord_revision", "matchrecord", ["revision"])
+    op.create_table(
+        "matchrecordtombstone",
+        sa.Column("record_id", sa.Integer(), nullable=False, primary_key=True, autoincrement=False),
+        sa.Column("revision", sa.Integer(), nullable=False)
+    )
+    op.create_index("ix_matchrecordtombstone_revision", "matchrecordtombstone", ["revision"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_matchrecordtombstone_revision", table_name="matchrecordtombstone")
+    op.drop_table("matchrecordtombstone")
+    column_list = ", ".join(STORED_COLUMNS)
+    _rebuild_match_record_table(with_revision=False, copied_columns=column_list, source_columns=column_list)
@@ -0,0 +1,104 @@
+"""record search index
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-16 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+PLAYER_NAME_COLUMNS = ("opponent_player_name", "my_partner_player_name", "opponent_partner_player_name")
+SEARCH_COLUMNS = ("stage", *PLAYER_NAME_COLUMNS)
+SEARCH_COLUMN_LIST = ", ".join(SEARCH_COLUMNS)
+
+
+def _player_names(row: str) -> str:
+    return " UNION ".join(f"SELECT {row}.{name} COLLATE NOCASE AS name" for name in PLAYER_NAME_COLUMNS)
+
+
+def _count_player_names(row: str) -> str:
+    return (
+        f"INSERT INTO playername (name, match_count) SELECT name, 1 FROM ({_player_names(row)}) "
+        "WHERE name IS NOT NULL AND name <> '' "
+        "ON CONFLICT (name) DO UPDATE SET match_count = match_count + 1;"
+    )
+
+
+def _uncount_player_names(row: str) -> str:
+    return (
+        f"UPDATE playername SET match_count = match_count - 1 WHERE name IN ({_player_names(row)}); "
+        "DELETE FROM playername WHERE match_count <= 0;"
+    )
+
+
+def _index_search_row(row: str) -> str:
+    values = ", ".join(f"{row}.{name}" for name in SEARCH_COLUMNS)
+    return f"INSERT INTO matchrecord_fts (rowid, {SEARCH_COLUMN_LIST}) VALUES ({row}.id, {values});"
+
+
+def _unindex_search_row(row: str) -> str:
+    values = ", ".join(f"{row}.{name}" for name in SEARCH_COLUMNS)
+    return (
+        f"INSERT INTO matchrecord_fts (matchrecord_fts, rowid, {SEARCH_COLUMN_LIST}) "
+        f"VALUES ('delete', {row}.id, {values});"
+    )
+
+
+def _create_search_triggers() -> None:
+    op.execute(
+        "CREATE TRIGGER matchrecord_search_ai AFTER INSERT ON matchrecord BEGIN "
+        f"{_index_search_row('NEW')} {_count_player_names('NEW')} END"
+    )
+    op.execute(
+        "CREATE TRIGGER matchrecord_search_ad AFTER DELETE ON matchrecord BEGIN "
+        f"{_unindex_search_row('OLD')} {_uncount_player_names('OLD')} END"
+    )
+    op.execute(
+        f"CREATE TRIGGER matchrecord_search_au AFTER UPDATE OF {SEARCH_COLUMN_LIST} ON matchrecord BEGIN "
+        f"{_unindex_search_row('OLD')} {_index_search_row('NEW')} END"
+    )
+    op.execute(
+        f"CREATE TRIGGER matchrecord_player_name_au AFTER UPDATE OF {', '.join(PLAYER_NAME_COLUMNS)} "
+        f"ON matchrecord BEGIN {_uncount_player_names('OLD')} {_count_player_names('NEW')} END"
+    )
+
+
+def upgrade() -> None:
+    # Trigram tokens make every substring of three or more characters searchable, which suits
+    # player names written in Japanese without word boundaries.
+    op.execute(
+        f"CREATE VIRTUAL TABLE matchrecord_fts USING fts5({SEARCH_COLUMN_LIST}, "
+        "content='matchrecord', content_rowid='id', tokenize='trigram')"
+    )
+    op.execute("INSERT INTO matchrecord_fts (matchrecord_fts) VALUES ('rebuild')")
+
+    op.create_table(
+        "playername",
+        sa.Column("name", sa.String(length=100, collation="NOCASE"), nullable=False, primary_key=True),
+        sa.Column("match_count", sa.Integer(), nullable=False)
+    )
+    op.execute(
+        "INSERT INTO playername (name, match_count) SELECT name, COUNT(*) FROM ("
+        + " UNION ".join(f"SELECT id, {name} COLLATE NOCASE AS name FROM matchrecord" for name in PLAYER_NAME_COLUMNS)
+        + ") WHERE name IS NOT NULL AND name <> '' GROUP BY name COLLATE NOCASE"
+    )
+    _create_search_triggers()
+
+
+def downgrade() -> None:
+    for trigger_name in (
+        "matchrecord_search_ai",
+        "matchrecord_search_ad",
+        "matchrecord_search_au",
+        "matchrecord_player_name_au"
+    ):
+        op.execute(f"DROP TRIGGER IF EXISTS {trigger_name}")
+    op.drop_table("playername")
+    op.execute("DROP TABLE IF EXISTS matchrecord_fts")
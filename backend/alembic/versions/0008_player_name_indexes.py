@@ -0,0 +1,32 @@
+"""player name indexes
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-16 00:00:00
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "0008"
+down_revision = "0007"
+branch_labels = None
+depends_on = None
+
+# Names group case-insensitively, matching playername, so the indexes carry the NOCASE collation.
+PLAYER_NAME_INDEXES = {
+    "ix_matchrecord_opponent_player_name": "opponent_player_name",
+    "ix_matchrecord_my_partner_player_name": "my_partner_player_name"
+}
+
+
+def upgrade() -> None:
+    for index_name, column_name in PLAYER_NAME_INDEXES.items():
+        op.execute(
+            f"CREATE INDEX {index_name} ON matchrecord ({column_name} COLLATE NOCASE, played_at)"
+        )
+
+
+def downgrade() -> None:
+    for index_name in PLAYER_NAME_INDEXES:
+        op.drop_index(index_name, table_name="matchrecord")
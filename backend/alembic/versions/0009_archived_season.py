@@ -0,0 +1,34 @@
+"""archived season registry
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-16 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0009"
+down_revision = "0008"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "archivedseason",
+        sa.Column("season", sa.String(length=7), nullable=False, primary_key=True),
+        sa.Column("archive", sa.String(length=4), nullable=False),
+        sa.Column("match_count", sa.Integer(), nullable=False),
+        sa.Column("win_count", sa.Integer(), nullable=False),
+        sa.Column("first_played_at", sa.DateTime(), nullable=False),
+        sa.Column("last_played_at", sa.DateTime(), nullable=False),
+        sa.Column("archived_at", sa.DateTime(), nullable=False)
+    )
+    op.create_index("ix_archivedseason_archive", "archivedseason", ["archive"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_archivedseason_archive", table_name="archivedseason")
+    op.drop_table("archivedseason")
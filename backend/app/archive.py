@@ -0,0 +1,347 @@
+import argparse
+import re
+import threading
+from contextlib import contextmanager
+from datetime import UTC, datetime
+from itertools import groupby
+from pathlib import Path
+from urllib.parse import quote
+
+from sqlalchemy import MetaData, case, create_engine, event, func, literal, select as core_select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.engine import Connection
+from sqlmodel import Session, select
+
+from .database import (
+    DATABASE_PATH,
+    ServerRunningError,
+    async_read_engine,
+    bounded_slot,
+    engine,
+    init_db,
+    maintenance_slot,
+    read_engine,
+    writer_slot
+)
+from .filters import RecordFilters
+from .models import ArchivedSeason, ArchivedSeasonRead, MatchRecord
+from .revisions import bump_data_revision
+from .season import compute_season_from_played_at
+from .stats import compute_win_rate
+
+ARCHIVE_DIR = DATABASE_PATH.parent / "archives"
+ARCHIVE_SCHEMA_PREFIX = "archive_"
+ATTACHED_ARCHIVES_KEY = "mfstat_attached_archives"
+SEASON_PATTERN = re.compile(r"\d{4}/\d{2}")
+# Held while rows move between the working database and an archive, and by backups that copy both.
+ARCHIVE_LOCK = threading.Lock()
+
+SEARCH_INSERT_TRIGGER = "matchrecord_search_ai"
+SEARCH_DELETE_TRIGGER = "matchrecord_search_ad"
+
+record_table = MatchRecord.__table__
+RECORD_COLUMN_NAMES = [column.name for column in record_table.columns]
+STORED_COLUMN_NAMES = [column.name for column in record_table.columns if column.computed is None]
+
+
+def archive_slot():
+    # Backups hold the archive lock for a whole copy, so archive and restore wait a bounded time
+    # and answer busy instead of tying up a request thread until the copy ends.
+    return bounded_slot(ARCHIVE_LOCK, "A backup or archive is in progress; retry shortly")
+
+
+def current_season() -> str:
+    return compute_season_from_played_at(datetime.now(UTC))
+
+
+def archive_path(archive: str) -> Path:
+    return ARCHIVE_DIR / f"mfstat-{archive}.db"
+
+
+def _archive_schema(archive: str) -> str:
+    return f"{ARCHIVE_SCHEMA_PREFIX}{archive}"
+
+
+def _archive_record_table(archive: str):
+    return record_table.to_metadata(MetaData(), schema=_archive_schema(archive))
+
+
+def _create_archive_database(archive: str) -> Path:
+    path = archive_path(archive)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    archive_engine = create_engine(f"sqlite:///{path}")
+    try:
+        record_table.create(archive_engine, checkfirst=True)
+    finally:
+        archive_engine.dispose()
+    return path
+
+
+@contextmanager
+def _suspended_trigger(connection: Connection, name: str):
+    # SQLite cannot disable a trigger, so it is dropped and recreated inside the same transaction.
+    trigger_sql = connection.exec_driver_sql(
+        "SELECT sql FROM main.sqlite_master WHERE type = 'trigger' AND name = ?",
+        (name,)
+    ).scalar_one()
+    connection.exec_driver_sql(f"DROP TRIGGER main.{name}")
+    yield
+    connection.exec_driver_sql(trigger_sql)
+
+
+def _move_seasons_to_archive(archive: str, seasons: list[str]) -> None:
+    # The record store reads through this module.
+    from .record_store import invalidate_record_store
+
+    path = _create_archive_database(archive)
+    archive_table = _archive_record_table(archive)
+    archived_at = datetime.utcnow()
+    registry_source = (
+        core_select(
+            archive_table.c.season,
+            literal(archive),
+            func.count(),
+            func.sum(case((archive_table.c.result == "WIN", 1), else_=0)),
+            func.min(archive_table.c.played_at),
+            func.max(archive_table.c.played_at),
+            literal(archived_at)
+        )
+        .where(archive_table.c.season.in_(seasons))
+        .group_by(archive_table.c.season)
+    )
+    registry_statement = sqlite_insert(ArchivedSeason.__table__).from_select(
+        ["season", "archive", "match_count", "win_count", "first_played_at", "last_played_at", "archived_at"],
+        registry_source
+    )
+    registry_statement = registry_statement.on_conflict_do_update(
+        index_elements=["season"],
+        set_={
+            name: getattr(registry_statement.excluded, name)
+            for name in ("match_count", "win_count", "first_played_at", "last_played_at", "archived_at")
+        }
+    )
+
+    with engine.connect() as connection:
+        connection.exec_driver_sql(f"ATTACH DATABASE ? AS {_archive_schema(archive)}", (str(path),))
+        connection.commit()
+        try:
+            connection.execute(
+                archive_table.insert().from_select(
+                    STORED_COLUMN_NAMES,
+                    core_select(*[record_table.c[name] for name in STORED_COLUMN_NAMES]).where(
+                        record_table.c.season.in_(seasons)
+                    )
+                )
+            )
+            connection.execute(registry_statement)
+            # Archived rows keep their search index entries and player name counts, and the rollups
+            # stay too, so search, suggestions and season summaries still cover them. The index is
+            # external-content over main.matchrecord, so an FTS 'rebuild' or 'integrity-check' would
+            # drop or flag these entries; neither may run while archives exist.
+            with _suspended_trigger(connection, SEARCH_DELETE_TRIGGER):
+                connection.execute(record_table.delete().where(record_table.c.season.in_(seasons)))
+            bump_data_revision(connection)
+            connection.commit()
+        finally:
+            connection.rollback()
+            connection.exec_driver_sql(f"DETACH DATABASE {_archive_schema(archive)}")
+            connection.commit()
+    invalidate_record_store()
+
+
+def archive_closed_seasons(before: str | None = None, vacuum: bool = False) -> list[str]:
+    open_season = current_season()
+    before = before or open_season
+    if not SEASON_PATTERN.fullmatch(before):
+        raise ValueError("before must be a season in YYYY/MM format")
+    if before > open_season:
+        raise ValueError(f"Only seasons before the current season {open_season} can be archived")
+
+    with archive_slot(), writer_slot():
+        with Session(engine) as session:
+            seasons = session.exec(
+                select(MatchRecord.season).where(MatchRecord.season < before).distinct().order_by(MatchRecord.season)
+            ).all()
+        for archive, archive_seasons in groupby(seasons, key=lambda season: season[:4]):
+            _move_seasons_to_archive(archive, list(archive_seasons))
+
+        if seasons and vacuum:
+            with engine.connect() as connection:
+                connection.exec_driver_sql("VACUUM")
+                connection.exec_driver_sql("PRAGMA wal_checkpoint(TRUNCATE)")
+    return seasons
+
+
+def restore_archive(archive: str) -> int:
+    from .record_store import invalidate_record_store
+
+    path = archive_path(archive)
+    if not path.exists():
+        raise ValueError(f"Archive {archive} does not exist")
+    archive_table = _archive_record_table(archive)
+
+    with archive_slot(), writer_slot(), engine.connect() as connection:
+        connection.exec_driver_sql(f"ATTACH DATABASE ? AS {_archive_schema(archive)}", (str(path),))
+        connection.commit()
+        try:
+            # The search index and player name counts never dropped these rows, so they are not re-added.
+            with _suspended_trigger(connection, SEARCH_INSERT_TRIGGER):
+                restored = connection.execute(
+                    record_table.insert().from_select(
+                        STORED_COLUMN_NAMES,
+                        core_select(*[archive_table.c[name] for name in STORED_COLUMN_NAMES])
+                    )
+                ).rowcount
+            connection.execute(ArchivedSeason.__table__.delete().where(ArchivedSeason.archive == archive))
+            bump_data_revision(connection)
+            connection.commit()
+        finally:
+            connection.rollback()
+            connection.exec_driver_sql(f"DETACH DATABASE {_archive_schema(archive)}")
+            connection.commit()
+        path.unlink()
+    invalidate_record_store()
+    return restored
+
+
+def list_archived_seasons(session: Session) -> list[ArchivedSeasonRead]:
+    return [
+        ArchivedSeasonRead(
+            **archived_season.model_dump(),
+            win_rate=compute_win_rate(archived_season.match_count, archived_season.win_count)
+        )
+        for archived_season in session.exec(select(ArchivedSeason).order_by(ArchivedSeason.season.desc())).all()
+    ]
+
+
+def _needed_archives(connection: Connection, filters: RecordFilters | None) -> tuple[str, ...]:
+    statement = select(ArchivedSeason.archive).distinct().order_by(ArchivedSeason.archive)
+    if filters is not None:
+        if filters.season:
+            statement = statement.where(ArchivedSeason.season.in_(filters.season))
+        if filters.played_from is not None:
+            statement = statement.where(ArchivedSeason.last_played_at >= filters.played_from)
+        if filters.played_to is not None:
+            statement = statement.where(ArchivedSeason.first_played_at <= filters.played_to)
+    return tuple(connection.execute(statement).scalars().all())
+
+
+def _detach_archives(cursor, archives) -> None:
+    cursor.execute("DROP VIEW IF EXISTS temp.matchrecord")
+    for archive in archives:
+        cursor.execute(f"DETACH DATABASE {_archive_schema(archive)}")
+
+
+def attach_record_archives(
+    connection: Connection,
+    filters: RecordFilters | None = None,
+    read_only: bool = True
+) -> None:
+    archives = _needed_archives(connection, filters)
+    attached = connection.info.get(ATTACHED_ARCHIVES_KEY, ())
+    if archives == attached:
+        return
+
+    cursor = connection.connection.cursor()
+    try:
+        _detach_archives(cursor, attached)
+        connection.info.pop(ATTACHED_ARCHIVES_KEY, None)
+        if not archives:
+            return
+        for archive in archives:
+            # The write engine is not opened with URI filenames, so it attaches the plain path.
+            location = str(archive_path(archive))
+            if read_only:
+                location = f"file:{quote(archive_path(archive).as_posix(), safe='/:')}?mode=ro"
+            cursor.execute(f"ATTACH DATABASE ? AS {_archive_schema(archive)}", (location,))
+        connection.info[ATTACHED_ARCHIVES_KEY] = archives
+        # A temp view shadows main.matchrecord for this connection only, so every existing query
+        # reads the working table and the archives it needs as one UNION ALL without rewriting.
+        columns = ", ".join(RECORD_COLUMN_NAMES)
+        sources = ["main", *(_archive_schema(archive) for archive in archives)]
+        cursor.execute(
+            "CREATE TEMP VIEW matchrecord AS "
+            + " UNION ALL ".join(f"SELECT {columns} FROM {source}.matchrecord" for source in sources)
+        )
+    finally:
+        cursor.close()
+
+
+def detach_record_archives(connection: Connection) -> None:
+    archives = connection.info.pop(ATTACHED_ARCHIVES_KEY, None)
+    if not archives:
+        return
+    cursor = connection.connection.cursor()
+    try:
+        _detach_archives(cursor, archives)
+    finally:
+        cursor.close()
+
+
+def attach_archives(session: Session, filters: RecordFilters | None = None) -> None:
+    attach_record_archives(session.connection(), filters)
+
+
+def find_archived_record(record_id: int) -> bool:
+    with Session(read_engine) as session:
+        attach_archives(session)
+        return session.exec(select(MatchRecord.id).where(MatchRecord.id == record_id)).first() is not None
+
+
+def _register_archive_reset(target_engine) -> None:
+    # Archives are attached per request, so a pooled connection goes back without them and the
+    # next request reads only the working database unless it asks for more.
+    @event.listens_for(target_engine, "checkin")
+    def _reset_archives(dbapi_connection, connection_record) -> None:
+        archives = connection_record.info.pop(ATTACHED_ARCHIVES_KEY, None)
+        if not archives or dbapi_connection is None:
+            return
+        cursor = dbapi_connection.cursor()
+        try:
+            _detach_archives(cursor, archives)
+        finally:
+            cursor.close()
+
+
+_register_archive_reset(read_engine)
+_register_archive_reset(async_read_engine.sync_engine)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m app.archive")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    archive_parser = subparsers.add_parser("archive", help="move closed seasons into yearly archive files")
+    archive_parser.add_argument("--before", default=None, help="archive seasons before YYYY/MM (default: current)")
+    archive_parser.add_argument("--vacuum", action="store_true", help="reclaim the freed space afterwards")
+    restore_parser = subparsers.add_parser("restore", help="move an archive back into the working database")
+    restore_parser.add_argument("archive", help="archive year, e.g. 2024")
+    subparsers.add_parser("list", help="show archived seasons")
+    args = parser.parse_args()
+
+    if args.command != "list":
+        try:
+            with maintenance_slot():
+                init_db()
+                if args.command == "archive":
+                    seasons = archive_closed_seasons(args.before, args.vacuum)
+                    print(f"Archived {len(seasons)} season(s): {', '.join(seasons) or '-'}")
+                else:
+                    path = archive_path(args.archive)
+                    print(f"Restored {restore_archive(args.archive)} record(s) from {path}")
+        except ServerRunningError as exc:
+            parser.exit(1, f"{parser.prog}: {exc}\n")
+        except ValueError as exc:
+            parser.error(str(exc))
+        return
+
+    init_db()
+    with Session(engine) as session:
+        for archived_season in list_archived_seasons(session):
+            print(
+                f"{archived_season.season}  {archived_season.archive}  "
+                f"{archived_season.match_count:>7} matches  {archived_season.win_count:>7} wins"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,248 @@
+import argparse
+import logging
+import os
+import re
+import shutil
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Literal, Optional
+
+from .archive import ARCHIVE_DIR, ARCHIVE_LOCK
+from .database import DATABASE_FILE_NAME, DATABASE_PATH
+from .models import BackupSnapshot, BackupStatus
+
+BackupReason = Literal["manual", "pre-migration"]
+
+BACKUP_DIR = DATABASE_PATH.parent / "backups"
+BACKUP_FILE_PREFIX = "mfstat-"
+BACKUP_TIMESTAMP_FORMAT = "%Y%m%d-%H%M%S-%f"
+LEGACY_BACKUP_TIMESTAMP_FORMAT = "%Y%m%d-%H%M%S"
+BACKUP_NAME_PATTERN = re.compile(rf"{BACKUP_FILE_PREFIX}(\d{{8}}-\d{{6}}(?:-\d{{6}})?)-([a-z-]+)")
+PARTIAL_SUFFIX = ".partial"
+SNAPSHOT_NAME_RETRY_SECONDS = 0.001
+BACKUP_BUSY_TIMEOUT_MS = 5000
+DEFAULT_BACKUP_RETENTION = 7
+DEFAULT_BACKUP_STEP_PAGES = 256
+BACKUP_STEP_PAUSE_SECONDS = 0.005
+
+logger = logging.getLogger("mfstat.backup")
+
+
+def _resolve_backup_retention() -> int:
+    configured = os.getenv("MFSTAT_BACKUP_RETENTION")
+    return max(1, int(configured)) if configured else DEFAULT_BACKUP_RETENTION
+
+
+def _resolve_backup_step_pages() -> int:
+    configured = os.getenv("MFSTAT_BACKUP_STEP_PAGES")
+    return max(1, int(configured)) if configured else DEFAULT_BACKUP_STEP_PAGES
+
+
+def _pre_migration_backup_enabled() -> bool:
+    return os.getenv("MFSTAT_PRE_MIGRATION_BACKUP", "1").strip().lower() not in {"0", "false", "no", "off"}
+
+
+BACKUP_RETENTION = _resolve_backup_retention()
+BACKUP_STEP_PAGES = _resolve_backup_step_pages()
+
+
+def _snapshot_name(reason: BackupReason) -> str:
+    return f"{BACKUP_FILE_PREFIX}{datetime.now().strftime(BACKUP_TIMESTAMP_FORMAT)}-{reason}"
+
+
+def _claim_snapshot_dirs(reason: BackupReason) -> tuple[Path, Path]:
+    # Creating the partial directory claims a name, so two backups started in the same clock tick
+    # (a pre-migration and a manual one) never share a target; the later one takes the next tick.
+    while True:
+        target_dir = BACKUP_DIR / _snapshot_name(reason)
+        partial_dir = target_dir.with_name(target_dir.name + PARTIAL_SUFFIX)
+        if not target_dir.exists():
+            try:
+                partial_dir.mkdir()
+            except FileExistsError:
+                pass
+            else:
+                return target_dir, partial_dir
+        time.sleep(SNAPSHOT_NAME_RETRY_SECONDS)
+
+
+def _parse_snapshot(path: Path) -> Optional[BackupSnapshot]:
+    match = BACKUP_NAME_PATTERN.fullmatch(path.name)
+    if match is None or not path.is_dir():
+        return None
+    # Snapshots taken before names carried microseconds keep their second-resolution timestamp.
+    timestamp_format = BACKUP_TIMESTAMP_FORMAT if match.group(1).count("-") == 2 else LEGACY_BACKUP_TIMESTAMP_FORMAT
+    return BackupSnapshot(
+        name=path.name,
+        reason=match.group(2),
+        created_at=datetime.strptime(match.group(1), timestamp_format),
+        size=sum(file.stat().st_size for file in path.rglob("*.db")),
+        archives=sorted(file.name for file in (path / ARCHIVE_DIR.name).glob("*.db"))
+    )
+
+
+def list_backups() -> list[BackupSnapshot]:
+    if not BACKUP_DIR.exists():
+        return []
+    snapshots = [_parse_snapshot(path) for path in BACKUP_DIR.glob(f"{BACKUP_FILE_PREFIX}*")]
+    return sorted(
+        (snapshot for snapshot in snapshots if snapshot is not None),
+        key=lambda snapshot: (snapshot.created_at, snapshot.name),
+        reverse=True
+    )
+
+
+def _rotate_backups(reason: BackupReason) -> None:
+    # Retention is counted per reason so routine snapshots never push out a pre-migration one.
+    snapshots = [snapshot for snapshot in list_backups() if snapshot.reason == reason]
+    for snapshot in snapshots[BACKUP_RETENTION:]:
+        shutil.rmtree(BACKUP_DIR / snapshot.name, ignore_errors=True)
+
+
+def _backup_database_file(source_path: Path, target_path: Path, on_step: Callable[[int, int, int], None]) -> int:
+    source = sqlite3.connect(source_path)
+    target = sqlite3.connect(target_path)
+    try:
+        source.execute(f"PRAGMA busy_timeout={BACKUP_BUSY_TIMEOUT_MS}")
+        if source.execute("PRAGMA journal_mode").fetchone()[0].lower() == "wal":
+            # An open read transaction pins one WAL snapshot for every step, so commits made while
+            # the copy runs neither restart it nor leak into it. Without WAL the reader would hold
+            # off writers for the whole copy, so each step takes its own lock instead.
+            source.execute("BEGIN")
+            source.execute("SELECT count(*) FROM sqlite_master").fetchone()
+        source.backup(target, pages=BACKUP_STEP_PAGES, progress=on_step)
+        return target.execute("PRAGMA page_count").fetchone()[0]
+    finally:
+        source.close()
+        target.close()
+
+
+def create_backup(
+    reason: BackupReason = "manual",
+    progress: Optional[Callable[[int, int], None]] = None
+) -> Path:
+    BACKUP_DIR.mkdir(parents=True, exist_ok=True)
+    target_dir, partial_dir = _claim_snapshot_dirs(reason)
+    (partial_dir / ARCHIVE_DIR.name).mkdir()
+    copied_pages = 0
+
+    def _on_step(_status: int, remaining: int, total: int) -> None:
+        if progress is not None:
+            progress(copied_pages + total - remaining, copied_pages + total)
+        # A short pause between steps leaves the disk and the GIL to request handling.
+        time.sleep(BACKUP_STEP_PAUSE_SECONDS)
+
+    try:
+        # Archived seasons live only in the archive files, so they are copied with the working
+        # database; the lock keeps an archive or restore from moving rows between the two mid-copy.
+        with ARCHIVE_LOCK:
+            sources = [(DATABASE_PATH, partial_dir / DATABASE_FILE_NAME)]
+            sources += [
+                (archive_file, partial_dir / ARCHIVE_DIR.name / archive_file.name)
+                for archive_file in sorted(ARCHIVE_DIR.glob("*.db"))
+            ]
+            for source_path, target_path in sources:
+                copied_pages += _backup_database_file(source_path, target_path, _on_step)
+    except BaseException:
+        shutil.rmtree(partial_dir, ignore_errors=True)
+        raise
+    partial_dir.replace(target_dir)
+    _rotate_backups(reason)
+    return target_dir
+
+
+def backup_before_migration() -> Optional[Path]:
+    if not _pre_migration_backup_enabled():
+        return None
+    path = create_backup("pre-migration")
+    logger.info("Saved a pre-migration snapshot to %s", path)
+    return path
+
+
+class BackupManager:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self.state = "idle"
+        self.reason: Optional[str] = None
+        self.started_at: Optional[datetime] = None
+        self.finished_at: Optional[datetime] = None
+        self.pages_copied = 0
+        self.pages_total = 0
+        self.error: Optional[str] = None
+
+    def start(self, reason: BackupReason = "manual") -> bool:
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return False
+            self.state = "running"
+            self.reason = reason
+            self.started_at = datetime.utcnow()
+            self.finished_at = None
+            self.pages_copied = 0
+            self.pages_total = 0
+            self.error = None
+            self._thread = threading.Thread(target=self._run, args=(reason,), name="mfstat-backup", daemon=True)
+            self._thread.start()
+        return True
+
+    def _on_progress(self, copied: int, total: int) -> None:
+        self.pages_copied = copied
+        self.pages_total = total
+
+    def _run(self, reason: BackupReason) -> None:
+        try:
+            path = create_backup(reason, progress=self._on_progress)
+        except Exception as exc:
+            logger.exception("Backup failed")
+            state, error = "failed", str(exc)
+        else:
+            logger.info("Saved a %s backup to %s", reason, path)
+            state, error = "succeeded", None
+        with self._lock:
+            self.state = state
+            self.error = error
+            self.finished_at = datetime.utcnow()
+
+    def status(self) -> BackupStatus:
+        with self._lock:
+            return BackupStatus(
+                state=self.state,
+                reason=self.reason,
+                started_at=self.started_at,
+                finished_at=self.finished_at,
+                pages_copied=self.pages_copied,
+                pages_total=self.pages_total,
+                error=self.error,
+                snapshots=list_backups()
+            )
+
+
+BACKUP_MANAGER = BackupManager()
+
+
+def start_backup(reason: BackupReason = "manual") -> bool:
+    return BACKUP_MANAGER.start(reason)
+
+
+def backup_status() -> BackupStatus:
+    return BACKUP_MANAGER.status()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m app.backup")
+    parser.add_argument("command", choices=["create", "list"])
+    args = parser.parse_args()
+
+    if args.command == "create":
+        print(f"Saved {create_backup()}")
+        return
+    for snapshot in list_backups():
+        print(f"{snapshot.name}  {snapshot.size:>12} bytes")
+
+
+if __name__ == "__main__":
+    main()
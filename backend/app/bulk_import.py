@@ -0,0 +1,180 @@
+import codecs
+import csv
+import json
+from datetime import datetime
+from typing import AsyncIterator, Iterator, Literal
+
+from anyio import from_thread
+from pydantic import ValidationError
+from sqlalchemy import insert
+from sqlalchemy.exc import OperationalError
+from sqlmodel import Session
+from starlette.concurrency import run_in_threadpool
+
+from .database import WriterBusyError, engine, writer_slot
+from .models import BulkImportReport, BulkImportRowError, MatchRecord, MatchRecordCreate
+from .revisions import bump_data_revision
+from .rollups import adjust_match_stat_rollups
+from .season import normalize_played_at
+
+BulkImportFormat = Literal["csv", "ndjson"]
+
+BULK_IMPORT_BATCH_SIZE = 5000
+BULK_IMPORT_MAX_ERRORS = 100
+CSV_CONTENT_TYPES = ("text/csv", "application/csv")
+
+
+def resolve_bulk_import_format(content_type: str | None) -> BulkImportFormat:
+    media_type = (content_type or "").split(";", 1)[0].strip().lower()
+    if media_type in CSV_CONTENT_TYPES:
+        return "csv"
+    return "ndjson"
+
+
+def _iter_chunks(chunks: AsyncIterator[bytes]) -> Iterator[bytes]:
+    # The import runs on a worker thread; each chunk is still awaited on the event loop.
+    async def _next_chunk() -> bytes | None:
+        return await anext(chunks, None)
+
+    while (chunk := from_thread.run(_next_chunk)) is not None:
+        yield chunk
+
+
+def _iter_lines(chunks: Iterator[bytes]) -> Iterator[str]:
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = ""
+    for chunk in chunks:
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            yield f"{line}\n"
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending
+
+
+def _iter_ndjson_rows(lines: Iterator[str]) -> Iterator[object]:
+    for line in lines:
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError as exc:
+            yield ValueError(f"Invalid JSON: {exc.msg}")
+
+
+def _iter_csv_rows(lines: Iterator[str]) -> Iterator[object]:
+    # Lines keep their newline so quoted fields spanning lines parse as the csv module expects.
+    reader = csv.reader(lines, strict=True)
+    header: list[str] | None = None
+    while True:
+        try:
+            values = next(reader)
+        except StopIteration:
+            return
+        except csv.Error as exc:
+            yield ValueError(f"Malformed CSV: {exc}")
+            continue
+        if not any(value.strip() for value in values):
+            continue
+        if header is None:
+            header = [value.strip() for value in values]
+            continue
+        if len(values) != len(header):
+            yield ValueError(f"Expected {len(header)} columns, got {len(values)}")
+            continue
+        yield {key: (value if value.strip() else None) for key, value in zip(header, values)}
+
+
+def _format_validation_error(exc: ValidationError) -> list[str]:
+    messages = []
+    for error in exc.errors(include_url=False):
+        location = ".".join(str(part) for part in error["loc"])
+        messages.append(f"{location}: {error['msg']}" if location else error["msg"])
+    return messages
+
+
+def _to_insert_row(payload: MatchRecordCreate, created_at: datetime) -> dict:
+    row = payload.model_dump()
+    row["played_at"] = normalize_played_at(payload.played_at)
+    row["created_at"] = created_at
+    return row
+
+
+def _insert_batch(rows: list[dict]) -> None:
+    with writer_slot(), Session(engine) as session:
+        revision = bump_data_revision(session)
+        session.execute(insert(MatchRecord.__table__), [{**row, "revision": revision} for row in rows])
+        adjust_match_stat_rollups(session, MatchRecord.revision == revision, 1)
+        session.commit()
+
+
+def _try_insert_batch(rows: list[dict]) -> str | None:
+    try:
+        _insert_batch(rows)
+    except (WriterBusyError, OperationalError) as exc:
+        return str(exc)
+    return None
+
+
+def _import_rows(rows: Iterator[object]) -> BulkImportReport:
+    created_at = datetime.utcnow()
+    batch: list[dict] = []
+    errors: list[BulkImportRowError] = []
+    received = 0
+    inserted = 0
+    failed = 0
+    committed_through_row = 0
+    aborted = None
+
+    def _record_error(messages: list[str]) -> None:
+        nonlocal failed
+        failed += 1
+        if len(errors) < BULK_IMPORT_MAX_ERRORS:
+            errors.append(BulkImportRowError(row=received, errors=messages))
+
+    # Each batch commits on its own, so a failing batch stops the import and the report says
+    # which rows are settled; the client resends from the row after committed_through_row.
+    for row in rows:
+        received += 1
+        if isinstance(row, ValueError):
+            _record_error([str(row)])
+            continue
+        try:
+            payload = MatchRecordCreate.model_validate(row)
+        except ValidationError as exc:
+            _record_error(_format_validation_error(exc))
+            continue
+
+        batch.append(_to_insert_row(payload, created_at))
+        if len(batch) >= BULK_IMPORT_BATCH_SIZE:
+            aborted = _try_insert_batch(batch)
+            if aborted is not None:
+                break
+            inserted += len(batch)
+            committed_through_row = received
+            batch = []
+
+    if aborted is None:
+        aborted = _try_insert_batch(batch) if batch else None
+        if aborted is None:
+            inserted += len(batch)
+            committed_through_row = received
+
+    return BulkImportReport(
+        received=received,
+        inserted=inserted,
+        failed=failed,
+        errors=errors,
+        committed_through_row=committed_through_row,
+        aborted=aborted
+    )
+
+
+def _import_records(chunks: AsyncIterator[bytes], import_format: BulkImportFormat) -> BulkImportReport:
+    lines = _iter_lines(_iter_chunks(chunks))
+    return _import_rows(_iter_csv_rows(lines) if import_format == "csv" else _iter_ndjson_rows(lines))
+
+
+async def import_records(chunks: AsyncIterator[bytes], import_format: BulkImportFormat) -> BulkImportReport:
+    return await run_in_threadpool(_import_records, chunks, import_format)
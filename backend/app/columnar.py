@@ -0,0 +1,101 @@
+from datetime import datetime
+from typing import Iterable, Literal, Sequence
+
+from sqlalchemy import Select, column, select
+
+from .models import MatchRecord
+
+RecordListFormat = Literal["json", "columnar"]
+
+RECORD_COLUMNS = [
+    "id",
+    "played_at",
+    "season",
+    "rule",
+    "stage",
+    "my_score",
+    "opponent_score",
+    "my_character",
+    "my_partner_character",
+    "opponent_character",
+    "opponent_partner_character",
+    "my_racket",
+    "my_partner_racket",
+    "opponent_racket",
+    "opponent_partner_racket",
+    "my_rate",
+    "result",
+    "my_rate_band",
+    "my_partner_rate_band",
+    "opponent_rate_band",
+    "opponent_partner_rate_band",
+    "opponent_player_name",
+    "my_partner_player_name",
+    "opponent_partner_player_name",
+    "created_at",
+    "revision"
+]
+DATETIME_COLUMNS = {"played_at", "created_at"}
+DICTIONARY_ENCODED_COLUMNS = {
+    "season",
+    "rule",
+    "stage",
+    "my_character",
+    "my_partner_character",
+    "opponent_character",
+    "opponent_partner_character",
+    "my_racket",
+    "my_partner_racket",
+    "opponent_racket",
+    "opponent_partner_racket",
+    "result",
+    "my_rate_band",
+    "my_partner_rate_band",
+    "opponent_rate_band",
+    "opponent_partner_rate_band"
+}
+
+_DATETIME_INDEXES = [RECORD_COLUMNS.index(name) for name in DATETIME_COLUMNS]
+
+
+def to_iso_datetime(value: object) -> object:
+    if isinstance(value, str):
+        value = value.replace(" ", "T", 1)
+        return value[:-7] if value.endswith(".000000") else value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def select_record_rows() -> Select:
+    # Untyped columns hand back the stored SQLite values without any result processing.
+    return select(*[column(name) for name in RECORD_COLUMNS]).select_from(MatchRecord.__table__)
+
+
+def normalize_record_row(row: Sequence) -> tuple:
+    values = list(row)
+    for index in _DATETIME_INDEXES:
+        values[index] = to_iso_datetime(values[index])
+    return tuple(values)
+
+
+def encode_columnar_rows(rows: Iterable[Sequence], columns: Sequence[str] = RECORD_COLUMNS) -> dict:
+    column_values: list[list] = [[] for _ in columns]
+    dictionaries: dict[str, dict[object, int]] = {
+        name: {} for name in columns if name in DICTIONARY_ENCODED_COLUMNS
+    }
+    row_count = 0
+    for row in rows:
+        row_count += 1
+        for values, value in zip(column_values, row):
+            values.append(value)
+
+    encoded_columns = []
+    for name, values in zip(columns, column_values):
+        dictionary = dictionaries.get(name)
+        if dictionary is None:
+            encoded_columns.append({"name": name, "values": values})
+            continue
+        codes = [dictionary.setdefault(value, len(dictionary)) for value in values]
+        encoded_columns.append({"name": name, "dictionary": list(dictionary), "codes": codes})
+    return {"row_count": row_count, "columns": encoded_columns}
@@ -1,18 +1,35 @@
+import asyncio
 import os
 import shutil
+import sqlite3
 import sys
+import threading
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
+from urllib.parse import quote
 
-from sqlmodel import Session, SQLModel, create_engine
-
-from .season import compute_season_from_played_at, parse_database_datetime
+from sqlalchemy import event
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import Session, create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 APP_NAME = "mfstat"
 DATABASE_FILE_NAME = "mfstat.db"
 LEGACY_DATABASE_PATH = Path(__file__).resolve().parent.parent / DATABASE_FILE_NAME
 
 
+def _resolve_alembic_script_location() -> Path:
+    bundled_base_dir = getattr(sys, "_MEIPASS", None)
+    if bundled_base_dir:
+        return Path(bundled_base_dir) / "alembic"
+    return Path(__file__).resolve().parent.parent / "alembic"
+
+
+ALEMBIC_SCRIPT_LOCATION = _resolve_alembic_script_location()
+
+
 def _resolve_app_data_dir() -> Path:
     configured_data_dir = os.getenv("MFSTAT_DATA_DIR")
     if configured_data_dir:
@@ -53,143 +70,218 @@ def _prepare_database_path() -> Path:
 
 
 DATABASE_PATH = _prepare_database_path()
+SERVER_LOCK_PATH = DATABASE_PATH.with_name(f"{APP_NAME}.lock")
 DATABASE_URL = f"sqlite:///{DATABASE_PATH}"
-
-engine = create_engine(DATABASE_URL, echo=False, connect_args={"check_same_thread": False})
-
-MATCH_RECORD_REQUIRED_COLUMNS = {
-    "id",
-    "played_at",
-    "season",
-    "rule",
-    "stage",
-    "my_score",
-    "opponent_score",
-    "my_character",
-    "my_partner_character",
-    "opponent_character",
-    "opponent_partner_character",
-    "my_racket",
-    "my_partner_racket",
-    "opponent_racket",
-    "opponent_partner_racket",
-    "my_rate",
-    "result",
-    "my_rate_band",
-    "my_partner_rate_band",
-    "opponent_rate_band",
-    "opponent_partner_rate_band",
-    "opponent_player_name",
-    "my_partner_player_name",
-    "opponent_partner_player_name",
-    "created_at"
+READ_ONLY_DATABASE_URL = f"sqlite:///file:{quote(DATABASE_PATH.as_posix(), safe='/:')}?mode=ro&uri=true"
+ASYNC_READ_ONLY_DATABASE_URL = READ_ONLY_DATABASE_URL.replace("sqlite://", "sqlite+aiosqlite://", 1)
+
+DEFAULT_STORAGE_PROFILE = "wal"
+STORAGE_PROFILES: dict[str, dict[str, str | int]] = {
+    "compat": {},
+    "wal": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "mmap_size": 256 * 1024 * 1024,
+        "cache_size": -64 * 1024,
+        "busy_timeout": 5000,
+        "temp_store": "MEMORY"
+    },
+    "durable": {
+        "journal_mode": "WAL",
+        "synchronous": "FULL",
+        "cache_size": -16 * 1024,
+        "busy_timeout": 5000,
+        "temp_store": "MEMORY"
+    }
 }
+WRITER_ONLY_PRAGMAS = {"journal_mode", "synchronous"}
+DEFAULT_READ_POOL_SIZE = 4
+DEFAULT_WRITE_TIMEOUT_SECONDS = 5.0
 
 
-def _ensure_match_record_result_column() -> None:
-    existing_columns = _match_record_columns()
-    if "result" in existing_columns:
-        return
-
-    with engine.begin() as connection:
-        connection.exec_driver_sql("ALTER TABLE matchrecord ADD COLUMN result TEXT")
-        connection.exec_driver_sql(
-            """
-            UPDATE matchrecord
-            SET result = CASE
-                WHEN my_score > opponent_score THEN 'WIN'
-                WHEN my_score < opponent_score THEN 'LOSS'
-                ELSE 'DRAW'
-            END
-            """
-        )
+class WriterBusyError(Exception):
+    pass
 
 
-def _sync_match_record_result_values() -> None:
-    with engine.begin() as connection:
-        connection.exec_driver_sql(
-            """
-            UPDATE matchrecord
-            SET result = CASE
-                WHEN my_score > opponent_score THEN 'WIN'
-                WHEN my_score < opponent_score THEN 'LOSS'
-                ELSE 'DRAW'
-            END
-            """
-        )
-
+class ServerRunningError(RuntimeError):
+    pass
 
-def _ensure_match_record_partner_rate_band_columns() -> None:
-    existing_columns = _match_record_columns()
-    statements: list[str] = []
-    if "my_partner_rate_band" not in existing_columns:
-        statements.append("ALTER TABLE matchrecord ADD COLUMN my_partner_rate_band TEXT")
-    if "opponent_partner_rate_band" not in existing_columns:
-        statements.append("ALTER TABLE matchrecord ADD COLUMN opponent_partner_rate_band TEXT")
 
-    if not statements:
+def _resolve_storage_profile() -> dict[str, str | int]:
+    profile_name = os.getenv("MFSTAT_STORAGE_PROFILE", DEFAULT_STORAGE_PROFILE).strip().lower()
+    if profile_name not in STORAGE_PROFILES:
+        raise ValueError(
+            f"Unknown MFSTAT_STORAGE_PROFILE {profile_name!r}; expected one of {', '.join(STORAGE_PROFILES)}"
+        )
+    return STORAGE_PROFILES[profile_name]
+
+
+def _resolve_read_pool_size() -> int:
+    configured_size = os.getenv("MFSTAT_READ_POOL_SIZE")
+    return max(1, int(configured_size)) if configured_size else DEFAULT_READ_POOL_SIZE
+
+
+def _resolve_write_timeout() -> float:
+    configured_timeout = os.getenv("MFSTAT_WRITE_TIMEOUT")
+    return max(0.0, float(configured_timeout)) if configured_timeout else DEFAULT_WRITE_TIMEOUT_SECONDS
+
+
+def _resolve_read_concurrency() -> int:
+    configured_limit = os.getenv("MFSTAT_READ_CONCURRENCY")
+    return max(1, int(configured_limit)) if configured_limit else READ_POOL_SIZE
+
+
+def _register_pragmas(target_engine, pragmas: dict[str, str | int]) -> None:
+    @event.listens_for(target_engine, "connect")
+    def _apply_pragmas(dbapi_connection, _connection_record) -> None:
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+
+
+STORAGE_PROFILE = _resolve_storage_profile()
+READ_PRAGMAS = {name: value for name, value in STORAGE_PROFILE.items() if name not in WRITER_ONLY_PRAGMAS}
+READ_POOL_SIZE = _resolve_read_pool_size()
+
+engine = create_engine(
+    DATABASE_URL,
+    echo=False,
+    connect_args={"check_same_thread": False},
+    pool_size=1,
+    max_overflow=0
+)
+_register_pragmas(engine, STORAGE_PROFILE)
+
+read_engine = create_engine(
+    READ_ONLY_DATABASE_URL,
+    echo=False,
+    connect_args={"check_same_thread": False},
+    pool_size=READ_POOL_SIZE,
+    max_overflow=0
+)
+_register_pragmas(read_engine, READ_PRAGMAS)
+
+# aiosqlite runs each connection on its own thread, so awaiting reads never occupies
+# the request threadpool; the semaphore queues requests beyond the pool instead of
+# letting them time out on checkout.
+async_read_engine = create_async_engine(
+    ASYNC_READ_ONLY_DATABASE_URL,
+    echo=False,
+    pool_size=READ_POOL_SIZE,
+    max_overflow=0
+)
+_register_pragmas(async_read_engine.sync_engine, READ_PRAGMAS)
+_read_concurrency_limit = asyncio.Semaphore(_resolve_read_concurrency())
+
+# SQLite takes one writer at a time and the write engine holds a single connection, so writers
+# queue here and give up after a bounded wait instead of timing out on the pool checkout.
+WRITE_TIMEOUT_SECONDS = _resolve_write_timeout()
+_writer_lock = threading.Lock()
+
+
+@contextmanager
+def bounded_slot(lock: threading.Lock, busy_message: str):
+    if not lock.acquire(timeout=WRITE_TIMEOUT_SECONDS):
+        raise WriterBusyError(busy_message)
+    try:
+        yield
+    finally:
+        lock.release()
+
+
+def writer_slot():
+    return bounded_slot(_writer_lock, "Another write is in progress; retry shortly")
+
+
+# writer_slot only queues writers inside the server process. The maintenance CLIs run in their own
+# processes, so the server keeps an exclusive lock on a side file for its lifetime and the CLIs refuse
+# to start while it is held. The OS drops the lock when the process exits, even after a crash.
+_server_lock_connection: sqlite3.Connection | None = None
+
+
+def _open_server_lock() -> sqlite3.Connection:
+    connection = sqlite3.connect(SERVER_LOCK_PATH, timeout=0, isolation_level=None, check_same_thread=False)
+    try:
+        connection.execute("BEGIN EXCLUSIVE")
+    except sqlite3.OperationalError:
+        connection.close()
+        raise
+    return connection
+
+
+def hold_server_lock() -> None:
+    global _server_lock_connection
+    if _server_lock_connection is not None:
         return
+    try:
+        _server_lock_connection = _open_server_lock()
+    except sqlite3.OperationalError:
+        # Another server or a running CLI already holds it; the CLIs stay locked out either way.
+        pass
 
-    with engine.begin() as connection:
-        for statement in statements:
-            connection.exec_driver_sql(statement)
 
+@contextmanager
+def maintenance_slot():
+    try:
+        connection = _open_server_lock()
+    except sqlite3.OperationalError:
+        raise ServerRunningError(
+            f"The mfstat server or another maintenance command is using {DATABASE_PATH}; stop it and retry"
+        ) from None
+    try:
+        yield
+    finally:
+        connection.close()
 
-def _ensure_match_record_season_column() -> None:
-    existing_columns = _match_record_columns()
-    if "season" in existing_columns:
-        return
 
-    with engine.begin() as connection:
-        connection.exec_driver_sql("ALTER TABLE matchrecord ADD COLUMN season TEXT")
+SCHEMA_HEAD_REVISION = "0009"
 
 
-def _sync_match_record_season_values() -> None:
-    with engine.begin() as connection:
-        rows = connection.exec_driver_sql("SELECT id, played_at, season FROM matchrecord").fetchall()
-        for row in rows:
-            played_at = parse_database_datetime(row[1])
-            if played_at is None:
-                continue
-
-            season = compute_season_from_played_at(played_at)
-            if row[2] == season:
-                continue
+def _current_schema_revision() -> str | None:
+    with engine.connect() as connection:
+        try:
+            return connection.exec_driver_sql("SELECT version_num FROM alembic_version").scalar()
+        except OperationalError:
+            return None
 
-            connection.exec_driver_sql(
-                "UPDATE matchrecord SET season = ? WHERE id = ?",
-                (season, row[0])
-            )
 
+def _upgrade_schema() -> None:
+    from alembic import command
+    from alembic.config import Config
 
-def _match_record_table_exists() -> bool:
-    with engine.connect() as connection:
-        result = connection.exec_driver_sql(
-            "SELECT name FROM sqlite_master WHERE type='table' AND name='matchrecord'"
-        )
-        return result.first() is not None
+    config = Config()
+    config.set_main_option("script_location", str(ALEMBIC_SCRIPT_LOCATION))
+    with engine.begin() as connection:
+        config.attributes["connection"] = connection
+        command.upgrade(config, "head")
 
 
-def _match_record_columns() -> set[str]:
+def _has_user_tables() -> bool:
     with engine.connect() as connection:
-        result = connection.exec_driver_sql("PRAGMA table_info(matchrecord)")
-        return {row[1] for row in result.fetchall()}
+        statement = "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%' LIMIT 1"
+        return connection.exec_driver_sql(statement).first() is not None
 
 
 def init_db() -> None:
-    if _match_record_table_exists():
-        _ensure_match_record_result_column()
-        _ensure_match_record_partner_rate_band_columns()
-        _ensure_match_record_season_column()
-        _sync_match_record_result_values()
-        _sync_match_record_season_values()
-        existing_columns = _match_record_columns()
-        if not MATCH_RECORD_REQUIRED_COLUMNS.issubset(existing_columns):
-            with engine.begin() as connection:
-                connection.exec_driver_sql("DROP TABLE matchrecord")
-    SQLModel.metadata.create_all(engine)
+    if _current_schema_revision() == SCHEMA_HEAD_REVISION:
+        return
+    # Baseline databases have no alembic_version yet, and they are the ones whose tables get rebuilt.
+    if _has_user_tables():
+        from .backup import backup_before_migration
+
+        backup_before_migration()
+    _upgrade_schema()
 
 
 def get_session():
-    with Session(engine) as session:
+    with writer_slot(), Session(engine) as session:
         yield session
+
+
+async def get_async_read_session():
+    async with _read_concurrency_limit:
+        async with AsyncSession(async_read_engine) as session:
+            yield session
@@ -0,0 +1,118 @@
+import csv
+import io
+import json
+import tempfile
+from typing import Iterator, Literal
+
+from sqlalchemy.engine import Connection
+
+from .archive import attach_record_archives
+from .columnar import DICTIONARY_ENCODED_COLUMNS, RECORD_COLUMNS, normalize_record_row, select_record_rows
+from .database import read_engine
+from .filters import RecordFilters, apply_record_filters
+from .models import MatchRecord
+from .revisions import read_snapshot_revision
+
+ExportFormat = Literal["csv", "ndjson", "columnar"]
+
+EXPORT_MEDIA_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+    "columnar": "application/json"
+}
+EXPORT_FILE_EXTENSIONS = {"csv": "csv", "ndjson": "ndjson", "columnar": "json"}
+EXPORT_FETCH_SIZE = 2000
+TEMP_FILE_READ_SIZE = 64 * 1024
+
+
+def open_export_snapshot(filters: RecordFilters) -> tuple[Connection, int]:
+    connection = read_engine.connect()
+    try:
+        revision = read_snapshot_revision(connection)
+        attach_record_archives(connection, filters)
+    except BaseException:
+        connection.close()
+        raise
+    return connection, revision
+
+
+def _iter_row_batches(connection: Connection, filters: RecordFilters) -> Iterator[list[tuple]]:
+    statement = apply_record_filters(select_record_rows(), filters).order_by(
+        MatchRecord.played_at.desc(),
+        MatchRecord.id.desc()
+    )
+
+    with connection:
+        result = connection.execution_options(stream_results=True).execute(statement)
+        while True:
+            rows = result.fetchmany(EXPORT_FETCH_SIZE)
+            if not rows:
+                break
+            yield [normalize_record_row(row) for row in rows]
+
+
+def _iter_csv(connection: Connection, filters: RecordFilters) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow(RECORD_COLUMNS)
+    for batch in _iter_row_batches(connection, filters):
+        writer.writerows(batch)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def _iter_ndjson(connection: Connection, filters: RecordFilters) -> Iterator[str]:
+    for batch in _iter_row_batches(connection, filters):
+        yield "".join(
+            json.dumps(dict(zip(RECORD_COLUMNS, row)), ensure_ascii=False, separators=(",", ":")) + "\n"
+            for row in batch
+        )
+
+
+def _iter_columnar(connection: Connection, filters: RecordFilters) -> Iterator[str]:
+    column_files = [tempfile.TemporaryFile(mode="w+", encoding="utf-8") for _ in RECORD_COLUMNS]
+    dictionaries: dict[str, dict[object, int]] = {name: {} for name in DICTIONARY_ENCODED_COLUMNS}
+    row_count = 0
+    try:
+        for batch in _iter_row_batches(connection, filters):
+            for index, name in enumerate(RECORD_COLUMNS):
+                values = [row[index] for row in batch]
+                dictionary = dictionaries.get(name)
+                if dictionary is not None:
+                    values = [dictionary.setdefault(value, len(dictionary)) for value in values]
+                encoded = json.dumps(values, ensure_ascii=False, separators=(",", ":"))[1:-1]
+                column_files[index].write(f",{encoded}" if row_count else encoded)
+            row_count += len(batch)
+
+        yield f'{{"row_count":{row_count},"columns":['
+        for index, name in enumerate(RECORD_COLUMNS):
+            header = "," if index else ""
+            header += f'{{"name":{json.dumps(name)}'
+            dictionary = dictionaries.get(name)
+            if dictionary is not None:
+                encoded_dictionary = json.dumps(list(dictionary), ensure_ascii=False, separators=(",", ":"))
+                header += f',"dictionary":{encoded_dictionary},"codes":['
+            else:
+                header += ',"values":['
+            yield header
+
+            column_file = column_files[index]
+            column_file.seek(0)
+            while chunk := column_file.read(TEMP_FILE_READ_SIZE):
+                yield chunk
+            yield "]}"
+        yield "]}"
+    finally:
+        for column_file in column_files:
+            column_file.close()
+
+
+def iter_export(connection: Connection, filters: RecordFilters, export_format: ExportFormat) -> Iterator[str]:
+    if export_format == "csv":
+        return _iter_csv(connection, filters)
+    if export_format == "ndjson":
+        return _iter_ndjson(connection, filters)
+    return _iter_columnar(connection, filters)
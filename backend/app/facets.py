@@ -0,0 +1,51 @@
+from typing import Mapping, Optional
+
+from sqlalchemy import func, literal, union_all
+from sqlmodel import Session, select
+
+from .filters import RECORD_FILTER_COLUMNS, RecordFilters, record_filter_conditions
+from .models import MatchRecord, RecordFacetCount, RecordFacets
+
+FACET_DIMENSIONS = list(RECORD_FILTER_COLUMNS)
+
+
+def build_record_facets(total: int, counts: Mapping[str, Mapping[Optional[str], int]]) -> RecordFacets:
+    return RecordFacets(
+        total=total,
+        facets={
+            name: [
+                RecordFacetCount(value=value, count=count)
+                for value, count in sorted(
+                    counts.get(name, {}).items(),
+                    key=lambda item: (-item[1], item[0] is None, item[0] or "")
+                )
+                if count > 0
+            ]
+            for name in FACET_DIMENSIONS
+        }
+    )
+
+
+def compute_record_facets(session: Session, filters: RecordFilters) -> RecordFacets:
+    # Each dimension ignores its own filter, so every facet is its own GROUP BY; UNION ALL sends them
+    # to SQLite as one statement instead of one round trip per dimension.
+    facet_queries = [
+        select(literal(name).label("dimension"), column.label("value"), func.count().label("matches"))
+        .where(*record_filter_conditions(filters, exclude=name))
+        .group_by(column)
+        for name, column in RECORD_FILTER_COLUMNS.items()
+    ]
+    total_query = (
+        select(literal(None), literal(None), func.count())
+        .select_from(MatchRecord)
+        .where(*record_filter_conditions(filters))
+    )
+
+    total = 0
+    counts: dict[str, dict[Optional[str], int]] = {name: {} for name in FACET_DIMENSIONS}
+    for dimension, value, matches in session.exec(union_all(*facet_queries, total_query)).all():
+        if dimension is None:
+            total = matches
+        else:
+            counts[dimension][value] = matches
+    return build_record_facets(total, counts)
@@ -0,0 +1,119 @@
+import base64
+import binascii
+from datetime import datetime
+from typing import Optional
+
+from fastapi import Query
+from sqlalchemy import and_, or_
+from pydantic import field_validator
+from sqlmodel import Field, SQLModel
+
+from .models import MatchRecord
+from .season import normalize_played_at, parse_database_datetime
+
+RECORD_FILTER_COLUMNS = {
+    "rule": MatchRecord.rule,
+    "stage": MatchRecord.stage,
+    "my_character": MatchRecord.my_character,
+    "my_racket": MatchRecord.my_racket,
+    "opponent_character": MatchRecord.opponent_character,
+    "opponent_racket": MatchRecord.opponent_racket,
+    "opponent_rate_band": MatchRecord.opponent_rate_band,
+    "season": MatchRecord.season
+}
+
+
+class RecordFilters(SQLModel):
+    rule: list[str] = Field(default_factory=list)
+    stage: list[str] = Field(default_factory=list)
+    my_character: list[str] = Field(default_factory=list)
+    my_racket: list[str] = Field(default_factory=list)
+    opponent_character: list[str] = Field(default_factory=list)
+    opponent_racket: list[str] = Field(default_factory=list)
+    opponent_rate_band: list[str] = Field(default_factory=list)
+    season: list[str] = Field(default_factory=list)
+    played_from: Optional[datetime] = None
+    played_to: Optional[datetime] = None
+
+    @field_validator("played_from", "played_to")
+    @classmethod
+    def _normalize_played_bound(cls, value: Optional[datetime]) -> Optional[datetime]:
+        # played_at is stored as naive JST, so offset-bearing bounds are converted before comparing.
+        return None if value is None else normalize_played_at(value)
+
+
+def get_record_filters(
+    rule: list[str] = Query(default=[]),
+    stage: list[str] = Query(default=[]),
+    my_character: list[str] = Query(default=[]),
+    my_racket: list[str] = Query(default=[]),
+    opponent_character: list[str] = Query(default=[]),
+    opponent_racket: list[str] = Query(default=[]),
+    opponent_rate_band: list[str] = Query(default=[]),
+    season: list[str] = Query(default=[]),
+    played_from: Optional[datetime] = Query(default=None),
+    played_to: Optional[datetime] = Query(default=None)
+) -> RecordFilters:
+    return RecordFilters(
+        rule=rule,
+        stage=stage,
+        my_character=my_character,
+        my_racket=my_racket,
+        opponent_character=opponent_character,
+        opponent_racket=opponent_racket,
+        opponent_rate_band=opponent_rate_band,
+        season=season,
+        played_from=played_from,
+        played_to=played_to
+    )
+
+
+def record_filter_conditions(filters: RecordFilters, exclude: str | None = None) -> list:
+    conditions = []
+    for name, column in RECORD_FILTER_COLUMNS.items():
+        values = getattr(filters, name)
+        if name != exclude and values:
+            conditions.append(column.in_(values))
+    if filters.played_from is not None:
+        conditions.append(MatchRecord.played_at >= filters.played_from)
+    if filters.played_to is not None:
+        conditions.append(MatchRecord.played_at <= filters.played_to)
+    return conditions
+
+
+def apply_record_filters(statement, filters: RecordFilters):
+    conditions = record_filter_conditions(filters)
+    if conditions:
+        statement = statement.where(*conditions)
+    return statement
+
+
+def encode_record_cursor(played_at: datetime, record_id: int) -> str:
+    raw_cursor = f"{played_at.isoformat()}|{record_id}".encode()
+    return base64.urlsafe_b64encode(raw_cursor).decode().rstrip("=")
+
+
+def decode_record_cursor(cursor: str) -> tuple[datetime, int]:
+    padded_cursor = cursor + "=" * (-len(cursor) % 4)
+    try:
+        raw_cursor = base64.urlsafe_b64decode(padded_cursor.encode()).decode()
+        raw_played_at, raw_record_id = raw_cursor.rsplit("|", 1)
+        record_id = int(raw_record_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as exc:
+        raise ValueError("Invalid cursor") from exc
+
+    played_at = parse_database_datetime(raw_played_at)
+    if played_at is None:
+        raise ValueError("Invalid cursor")
+    return played_at, record_id
+
+
+def apply_record_cursor(statement, cursor: tuple[datetime, int]):
+    played_at, record_id = cursor
+    return statement.where(
+        MatchRecord.played_at <= played_at,
+        or_(
+            MatchRecord.played_at < played_at,
+            and_(MatchRecord.played_at == played_at, MatchRecord.id < record_id)
+        )
+    )
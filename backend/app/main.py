@@ -1,19 +1,87 @@
 import os
 import sys
 import logging
-import subprocess
 from pathlib import Path
 
-from fastapi import Depends, FastAPI, HTTPException, Request, status
+from fastapi import Depends, FastAPI, HTTPException, Query, Request, Response, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.responses import JSONResponse
-from fastapi.responses import FileResponse
-from fastapi.staticfiles import StaticFiles
+from fastapi.responses import ORJSONResponse
+from fastapi.responses import StreamingResponse
 from sqlmodel import Session, select
-
-from .database import get_session, init_db
-from .models import MatchRecord, MatchRecordCreate, MatchRecordRead, MatchRecordUpdate
-from .season import compute_season_from_played_at
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from .archive import archive_closed_seasons, attach_archives, find_archived_record, list_archived_seasons
+from .backup import backup_status, start_backup
+from .bulk_import import BulkImportFormat, import_records, resolve_bulk_import_format
+from .columnar import RECORD_COLUMNS, RecordListFormat, encode_columnar_rows, normalize_record_row, select_record_rows
+from .database import (
+    WriterBusyError,
+    async_read_engine,
+    engine,
+    get_async_read_session,
+    get_session,
+    hold_server_lock,
+    init_db,
+    read_engine
+)
+from .export import EXPORT_FILE_EXTENSIONS, EXPORT_MEDIA_TYPES, ExportFormat, iter_export, open_export_snapshot
+from .facets import compute_record_facets
+from .filters import (
+    RecordFilters,
+    apply_record_cursor,
+    apply_record_filters,
+    decode_record_cursor,
+    encode_record_cursor,
+    get_record_filters
+)
+from .metrics import METRICS_ENABLED, PROMETHEUS_CONTENT_TYPE, install_metrics, render_metrics
+from .models import (
+    ArchivedSeasonRead,
+    BackupStatus,
+    BulkImportReport,
+    ColumnarRecords,
+    DailyRateCandle,
+    MatchRecord,
+    MatchRecordBatchResult,
+    MatchRecordChanges,
+    MatchRecordCreate,
+    MatchRecordRead,
+    MatchRecordUpdate,
+    MatchStatRollup,
+    MatchStatRollupRead,
+    PlayerSuggestion,
+    RateDelta,
+    RateTrendSeries,
+    RecordFacets,
+    RivalStatsPage,
+    SeasonArchiveRequest,
+    WinRateBreakdown
+)
+from .mutations import (
+    MatchRecordBatchUpdate,
+    MatchRecordSelection,
+    RecordsNotFoundError,
+    delete_records,
+    update_records
+)
+from .record_store import invalidate_record_store, pinned_record_store, start_record_store
+from .revisions import (
+    bump_data_revision,
+    check_data_revision_etag,
+    list_record_changes,
+    record_tombstone,
+    revision_etag_headers
+)
+from .rollups import adjust_match_stat_rollups, compute_rollup_win_rate_breakdown
+from .rivals import RivalRole, RivalSort, SortOrder, compute_rival_stats
+from .search import search_records, suggest_player_names
+from .season import normalize_played_at, parse_database_datetime
+from .static_assets import build_static_asset_index, serve_static_asset
+from .stats import BreakdownDimension, BreakdownGrouping, compute_win_rate, compute_win_rate_breakdown
+from .trends import RateTrendGranularity, compute_daily_rate_candles, compute_rate_deltas, compute_rate_trend
+from .version import resolve_app_version
 
 app = FastAPI(title="MFStat API")
 logger = logging.getLogger("mfstat.api")
@@ -54,7 +122,12 @@ def _resolve_frontend_dist_dir() -> Path | None:
 
 
 FRONTEND_DIST_DIR = _resolve_frontend_dist_dir()
-PROJECT_ROOT_DIR = Path(__file__).resolve().parents[2]
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+MAX_RECORD_PAGE_SIZE = 1000
+MAX_PLAYER_SUGGESTIONS = 50
+MAX_RIVAL_PAGE_SIZE = 500
+GZIP_MINIMUM_SIZE = 1024
+GZIP_COMPRESS_LEVEL = 6
 
 app.add_middleware(
     CORSMiddleware,
@@ -62,96 +135,212 @@ app.add_middleware(
     allow_origin_regex=_resolve_cors_origin_regex(),
     allow_credentials=False,
     allow_methods=["*"],
-    allow_headers=["*"]
+    allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER]
 )
 
-if FRONTEND_DIST_DIR and (FRONTEND_DIST_DIR / "assets").is_dir():
-    app.mount("/assets", StaticFiles(directory=FRONTEND_DIST_DIR / "assets"), name="frontend-assets")
+app.add_middleware(GZipMiddleware, minimum_size=GZIP_MINIMUM_SIZE, compresslevel=GZIP_COMPRESS_LEVEL)
+install_metrics(app, (engine, "write"), (read_engine, "read"), (async_read_engine.sync_engine, "async_read"))
 
+STATIC_ASSET_INDEX = build_static_asset_index(FRONTEND_DIST_DIR) if FRONTEND_DIST_DIR else {}
 
-@app.exception_handler(Exception)
-async def unhandled_exception_handler(request: Request, exc: Exception):
-    logger.exception("Unhandled exception on %s %s", request.method, request.url.path)
-    return JSONResponse(status_code=500, content={"detail": str(exc)})
 
-
-def compute_result(my_score: int, opponent_score: int) -> str:
-    if my_score > opponent_score:
-        return "WIN"
-    if my_score < opponent_score:
-        return "LOSS"
-    return "DRAW"
-
-
-def _resolve_runtime_app_version() -> str:
-    tag_result = subprocess.run(
-        ["git", "-C", str(PROJECT_ROOT_DIR), "tag", "--points-at", "HEAD"],
-        check=False,
-        capture_output=True,
-        text=True
+@app.exception_handler(WriterBusyError)
+async def writer_busy_handler(request: Request, exc: WriterBusyError):
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": str(exc)},
+        headers={"Retry-After": "1"}
     )
-    if tag_result.returncode == 0:
-        tag = next((line.strip() for line in tag_result.stdout.splitlines() if line.strip()), "")
-        if tag:
-            return tag
-
-    sha_result = subprocess.run(
-        ["git", "-C", str(PROJECT_ROOT_DIR), "rev-parse", "--short", "HEAD"],
-        check=False,
-        capture_output=True,
-        text=True
-    )
-    short_sha = sha_result.stdout.strip() if sha_result.returncode == 0 else ""
 
-    latest_tag_result = subprocess.run(
-        ["git", "-C", str(PROJECT_ROOT_DIR), "describe", "--tags", "--abbrev=0"],
-        check=False,
-        capture_output=True,
-        text=True
-    )
-    latest_tag = latest_tag_result.stdout.strip() if latest_tag_result.returncode == 0 else ""
-    if latest_tag and short_sha:
-        return f"{latest_tag}+{short_sha}"
 
-    if short_sha:
-        return f"dev-{short_sha}"
-
-    return os.getenv("MFSTAT_APP_VERSION", "unknown")
+@app.exception_handler(Exception)
+async def unhandled_exception_handler(request: Request, exc: Exception):
+    logger.exception("Unhandled exception on %s %s", request.method, request.url.path)
+    return JSONResponse(status_code=500, content={"detail": str(exc)})
 
 
 @app.on_event("startup")
 def on_startup() -> None:
     init_db()
+    hold_server_lock()
+    start_record_store()
 
 
 @app.get("/health")
-def health_check():
+async def health_check():
     return {"status": "ok"}
 
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    if not METRICS_ENABLED:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Metrics are disabled")
+    return Response(render_metrics(), media_type=PROMETHEUS_CONTENT_TYPE)
+
+
 @app.get("/app-version")
 def app_version():
-    return {"version": _resolve_runtime_app_version()}
+    return {"version": resolve_app_version()}
+
+
+@app.get(
+    "/records",
+    response_class=ORJSONResponse,
+    # format=json returns the record list and format=columnar the column-encoded object.
+    responses={status.HTTP_200_OK: {"model": list[MatchRecordRead] | ColumnarRecords}}
+)
+async def list_records(
+    response: Response,
+    limit: int | None = Query(default=None, ge=1, le=MAX_RECORD_PAGE_SIZE),
+    cursor: str | None = Query(default=None),
+    format: RecordListFormat = Query(default="json"),
+    filters: RecordFilters = Depends(get_record_filters),
+    revision: int = Depends(check_data_revision_etag),
+    session: AsyncSession = Depends(get_async_read_session)
+):
+    record_cursor = None
+    if cursor:
+        try:
+            record_cursor = decode_record_cursor(cursor)
+        except ValueError as exc:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+    fetch_limit = None if limit is None else limit + 1
+
+    with pinned_record_store(revision) as record_store:
+        if record_store is not None:
+            rows = record_store.list_rows(filters, record_cursor, fetch_limit)
+    if record_store is None:
+        statement = apply_record_filters(select_record_rows(), filters)
+        if record_cursor is not None:
+            statement = apply_record_cursor(statement, record_cursor)
+        statement = statement.order_by(MatchRecord.played_at.desc(), MatchRecord.id.desc()).limit(fetch_limit)
+        # Rows come straight from the table, so they skip ORM hydration and response_model validation.
+        await session.run_sync(attach_archives, filters)
+        rows = [normalize_record_row(row) for row in await session.execute(statement)]
+    headers = dict(response.headers)
+    if limit is not None and len(rows) > limit:
+        rows = rows[:limit]
+        last_row = dict(zip(RECORD_COLUMNS, rows[-1]))
+        headers[NEXT_CURSOR_HEADER] = encode_record_cursor(
+            parse_database_datetime(last_row["played_at"]),
+            last_row["id"]
+        )
+    if format == "columnar":
+        return ORJSONResponse(encode_columnar_rows(rows), headers=headers)
+    return ORJSONResponse([dict(zip(RECORD_COLUMNS, row)) for row in rows], headers=headers)
+
+
+@app.get(
+    "/records/changes",
+    response_model=MatchRecordChanges,
+    dependencies=[Depends(check_data_revision_etag)]
+)
+async def list_changed_records(
+    since: int = Query(default=0, ge=0),
+    session: AsyncSession = Depends(get_async_read_session)
+):
+    await session.run_sync(attach_archives)
+    return await session.run_sync(list_record_changes, since)
 
 
-@app.get("/records", response_model=list[MatchRecordRead])
-def list_records(session: Session = Depends(get_session)):
-    statement = select(MatchRecord).order_by(MatchRecord.played_at.desc())
-    return session.exec(statement).all()
+@app.get("/records/facets", response_model=RecordFacets)
+async def record_facets(
+    filters: RecordFilters = Depends(get_record_filters),
+    revision: int = Depends(check_data_revision_etag),
+    session: AsyncSession = Depends(get_async_read_session)
+):
+    with pinned_record_store(revision) as record_store:
+        if record_store is not None:
+            return record_store.facets(filters)
+    # Each dimension is counted without its own filter, so the season counts need every archive
+    # the other filters allow.
+    await session.run_sync(attach_archives, filters.model_copy(update={"season": []}))
+    return await session.run_sync(compute_record_facets, filters)
+
+
+@app.get("/records/export", dependencies=[Depends(check_data_revision_etag)])
+def export_records(
+    request: Request,
+    response: Response,
+    format: ExportFormat = Query(default="csv"),
+    filters: RecordFilters = Depends(get_record_filters)
+):
+    # The body streams from its own connection after the headers go out, so the ETag is retaken
+    # from the snapshot that connection reads.
+    connection, revision = open_export_snapshot(filters)
+    file_name = f"mfstat-records.{EXPORT_FILE_EXTENSIONS[format]}"
+    headers = {**response.headers, **revision_etag_headers(request, revision)}
+    headers["Content-Disposition"] = f'attachment; filename="{file_name}"'
+    return StreamingResponse(
+        iter_export(connection, filters, format),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers=headers
+    )
 
 
 @app.post("/records", response_model=MatchRecordRead, status_code=status.HTTP_201_CREATED)
 def create_record(payload: MatchRecordCreate, session: Session = Depends(get_session)):
     payload_data = payload.model_dump()
-    payload_data["season"] = compute_season_from_played_at(payload.played_at)
-    payload_data["result"] = compute_result(payload.my_score, payload.opponent_score)
+    payload_data["played_at"] = normalize_played_at(payload.played_at)
+    payload_data["revision"] = bump_data_revision(session)
     record = MatchRecord.model_validate(payload_data)
     session.add(record)
+    session.flush()
+    adjust_match_stat_rollups(session, MatchRecord.id == record.id, 1)
     session.commit()
+    invalidate_record_store()
     session.refresh(record)
     return record
 
 
+@app.post("/records/bulk", response_model=BulkImportReport)
+async def bulk_import_records(request: Request, format: BulkImportFormat | None = Query(default=None)):
+    import_format = format or resolve_bulk_import_format(request.headers.get("content-type"))
+    report = await import_records(request.stream(), import_format)
+    invalidate_record_store()
+    if report.aborted is not None:
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content=report.model_dump(),
+            headers={"Retry-After": "1"}
+        )
+    return report
+
+
+@app.patch("/records", response_model=MatchRecordBatchResult)
+def update_records_batch(payload: MatchRecordBatchUpdate, session: Session = Depends(get_session)):
+    try:
+        affected = update_records(session, payload, payload.changes)
+    except RecordsNotFoundError as exc:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(exc)) from exc
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+    invalidate_record_store()
+    return MatchRecordBatchResult(affected=affected)
+
+
+@app.delete("/records", response_model=MatchRecordBatchResult)
+def delete_records_batch(payload: MatchRecordSelection, session: Session = Depends(get_session)):
+    try:
+        affected = delete_records(session, payload)
+    except RecordsNotFoundError as exc:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(exc)) from exc
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+    invalidate_record_store()
+    return MatchRecordBatchResult(affected=affected)
+
+
+def _raise_record_not_found(record_id: int) -> None:
+    if find_archived_record(record_id):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Record belongs to an archived season; restore the archive to change it"
+        )
+    raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Record not found")
+
+
 @app.put("/records/{record_id}", response_model=MatchRecordRead)
 def update_record(
     record_id: int,
@@ -160,16 +349,21 @@ def update_record(
 ):
     record = session.get(MatchRecord, record_id)
     if record is None:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Record not found")
+        _raise_record_not_found(record_id)
 
+    adjust_match_stat_rollups(session, MatchRecord.id == record_id, -1)
     update_data = payload.model_dump(exclude_unset=True)
+    if update_data.get("played_at") is not None:
+        update_data["played_at"] = normalize_played_at(update_data["played_at"])
     for key, value in update_data.items():
         setattr(record, key, value)
-    record.season = compute_season_from_played_at(record.played_at)
-    record.result = compute_result(record.my_score, record.opponent_score)
+    record.revision = bump_data_revision(session)
 
     session.add(record)
+    session.flush()
+    adjust_match_stat_rollups(session, MatchRecord.id == record_id, 1)
     session.commit()
+    invalidate_record_store()
     session.refresh(record)
     return record
 
@@ -178,28 +372,200 @@ def update_record(
 def delete_record(record_id: int, session: Session = Depends(get_session)):
     record = session.get(MatchRecord, record_id)
     if record is None:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Record not found")
+        _raise_record_not_found(record_id)
 
+    adjust_match_stat_rollups(session, MatchRecord.id == record_id, -1)
     session.delete(record)
+    record_tombstone(session, record_id, bump_data_revision(session))
     session.commit()
+    invalidate_record_store()
+
+
+@app.get("/stats/breakdown", response_model=WinRateBreakdown)
+async def stats_breakdown(
+    group_by: list[BreakdownDimension] = Query(min_length=1),
+    grouping: BreakdownGrouping = Query(default="joint"),
+    filters: RecordFilters = Depends(get_record_filters),
+    revision: int = Depends(check_data_revision_etag),
+    session: AsyncSession = Depends(get_async_read_session)
+):
+    # Season and rule summaries come straight from the rollup counters, which also cover archives.
+    breakdown = await session.run_sync(compute_rollup_win_rate_breakdown, group_by, filters, grouping)
+    if breakdown is not None:
+        return breakdown
+    with pinned_record_store(revision) as record_store:
+        if record_store is not None:
+            return record_store.win_rate_breakdown(group_by, filters, grouping)
+    await session.run_sync(attach_archives, filters)
+    return await session.run_sync(compute_win_rate_breakdown, group_by, filters, grouping)
+
+
+@app.get(
+    "/stats/rollups",
+    response_model=list[MatchStatRollupRead],
+    dependencies=[Depends(check_data_revision_etag)]
+)
+async def stats_rollups(
+    season: list[str] = Query(default=[]),
+    rule: list[str] = Query(default=[]),
+    dimension: list[str] = Query(default=[]),
+    session: AsyncSession = Depends(get_async_read_session)
+):
+    statement = select(MatchStatRollup)
+    if season:
+        statement = statement.where(MatchStatRollup.season.in_(season))
+    if rule:
+        statement = statement.where(MatchStatRollup.rule.in_(rule))
+    if dimension:
+        statement = statement.where(MatchStatRollup.dimension.in_(dimension))
+    statement = statement.order_by(
+        MatchStatRollup.season.desc(),
+        MatchStatRollup.rule,
+        MatchStatRollup.dimension,
+        MatchStatRollup.match_count.desc()
+    )
+    return [
+        MatchStatRollupRead(
+            **rollup.model_dump(),
+            win_rate=compute_win_rate(rollup.match_count, rollup.win_count)
+        )
+        for rollup in (await session.exec(statement)).all()
+    ]
+
+
+@app.get(
+    "/stats/rivals",
+    response_model=RivalStatsPage,
+    dependencies=[Depends(check_data_revision_etag)]
+)
+async def stats_rivals(
+    role: RivalRole = Query(default="opponent"),
+    name: str | None = Query(default=None, min_length=1, max_length=100),
+    min_matches: int = Query(default=1, ge=1),
+    sort: RivalSort = Query(default="matches"),
+    order: SortOrder = Query(default="desc"),
+    limit: int = Query(default=50, ge=1, le=MAX_RIVAL_PAGE_SIZE),
+    offset: int = Query(default=0, ge=0),
+    filters: RecordFilters = Depends(get_record_filters),
+    session: AsyncSession = Depends(get_async_read_session)
+):
+    await session.run_sync(attach_archives, filters)
+    return await session.run_sync(compute_rival_stats, role, filters, name, min_matches, sort, order, limit, offset)
+
+
+@app.get(
+    "/stats/rate-trend",
+    response_model=list[RateTrendSeries],
+    dependencies=[Depends(check_data_revision_etag)]
+)
+async def stats_rate_trend(
+    granularity: RateTrendGranularity = Query(default="match"),
+    max_points: int | None = Query(default=None, ge=3),
+    filters: RecordFilters = Depends(get_record_filters),
+    session: AsyncSession = Depends(get_async_read_session)
+):
+    await session.run_sync(attach_archives, filters)
+    return await session.run_sync(compute_rate_trend, filters, granularity, max_points)
+
+
+@app.get(
+    "/stats/rate-candles",
+    response_model=list[DailyRateCandle],
+    dependencies=[Depends(check_data_revision_etag)]
+)
+async def stats_rate_candles(
+    filters: RecordFilters = Depends(get_record_filters),
+    session: AsyncSession = Depends(get_async_read_session)
+):
+    await session.run_sync(attach_archives, filters)
+    return await session.run_sync(compute_daily_rate_candles, filters)
+
+
+@app.get(
+    "/stats/rate-deltas",
+    response_model=list[RateDelta],
+    dependencies=[Depends(check_data_revision_etag)]
+)
+async def stats_rate_deltas(
+    rule: list[str] = Query(default=[]),
+    season: list[str] = Query(default=[]),
+    session: AsyncSession = Depends(get_async_read_session)
+):
+    await session.run_sync(attach_archives, RecordFilters(season=season))
+    return await session.run_sync(compute_rate_deltas, rule, season)
+
+
+@app.get(
+    "/search",
+    response_model=list[MatchRecordRead],
+    dependencies=[Depends(check_data_revision_etag)]
+)
+async def search_match_records(
+    q: str = Query(min_length=1, max_length=200),
+    limit: int = Query(default=50, ge=1, le=MAX_RECORD_PAGE_SIZE),
+    filters: RecordFilters = Depends(get_record_filters),
+    session: AsyncSession = Depends(get_async_read_session)
+):
+    await session.run_sync(attach_archives, filters)
+    return await session.run_sync(search_records, q, filters, limit)
+
+
+@app.get(
+    "/players/suggest",
+    response_model=list[PlayerSuggestion],
+    dependencies=[Depends(check_data_revision_etag)]
+)
+async def suggest_players(
+    prefix: str = Query(min_length=1, max_length=100),
+    limit: int = Query(default=10, ge=1, le=MAX_PLAYER_SUGGESTIONS),
+    session: AsyncSession = Depends(get_async_read_session)
+):
+    return await session.run_sync(suggest_player_names, prefix, limit)
+
+
+@app.get("/archives", response_model=list[ArchivedSeasonRead])
+async def archived_seasons(session: AsyncSession = Depends(get_async_read_session)):
+    return await session.run_sync(list_archived_seasons)
+
+
+@app.post("/archives", response_model=list[ArchivedSeasonRead])
+def archive_seasons(payload: SeasonArchiveRequest):
+    # Archiving takes the writer slot itself, so the route must not hold a write session.
+    try:
+        archive_closed_seasons(payload.before)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+    with Session(read_engine) as session:
+        return list_archived_seasons(session)
+
+
+@app.get("/backups", response_model=BackupStatus)
+def backups():
+    return backup_status()
+
+
+@app.post("/backups", response_model=BackupStatus, status_code=status.HTTP_202_ACCEPTED)
+def trigger_backup():
+    if not start_backup():
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="A backup is already running")
+    return backup_status()
 
 
 @app.get("/", include_in_schema=False)
-def serve_index():
+def serve_index(request: Request):
     if FRONTEND_DIST_DIR is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Frontend build not found")
-    return FileResponse(FRONTEND_DIST_DIR / "index.html")
+    return serve_static_asset(request, STATIC_ASSET_INDEX["index.html"])
 
 
 @app.get("/{full_path:path}", include_in_schema=False)
-def serve_spa(full_path: str):
+def serve_spa(full_path: str, request: Request):
     if FRONTEND_DIST_DIR is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Frontend build not found")
 
-    requested_path = full_path.lstrip("/")
-    if requested_path:
-        candidate = (FRONTEND_DIST_DIR / requested_path).resolve()
-        if FRONTEND_DIST_DIR in candidate.parents and candidate.is_file():
-            return FileResponse(candidate)
-
-    return FileResponse(FRONTEND_DIST_DIR / "index.html")
+    asset = STATIC_ASSET_INDEX.get(full_path.lstrip("/"))
+    if asset is None:
+        if full_path.startswith("assets/"):
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+        asset = STATIC_ASSET_INDEX["index.html"]
+    return serve_static_asset(request, asset)
@@ -0,0 +1,199 @@
+import logging
+import os
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Optional
+
+from sqlalchemy import event
+
+DEFAULT_SLOW_QUERY_MS = 200
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STATEMENT_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+SLOW_QUERY_LOG_LIMIT = 500
+UNMATCHED_ROUTE = "unmatched"
+
+logger = logging.getLogger("mfstat.sql")
+
+
+def _env_flag(name: str) -> bool:
+    return os.getenv(name, "").strip().lower() in {"1", "true", "yes", "on"}
+
+
+def _resolve_slow_query_seconds() -> float:
+    configured = os.getenv("MFSTAT_SLOW_QUERY_MS")
+    return (float(configured) if configured else DEFAULT_SLOW_QUERY_MS) / 1000
+
+
+METRICS_ENABLED = _env_flag("MFSTAT_METRICS")
+SERVER_TIMING_ENABLED = _env_flag("MFSTAT_SERVER_TIMING")
+SLOW_QUERY_SECONDS = _resolve_slow_query_seconds()
+
+
+class Histogram:
+    def __init__(self, buckets: tuple[float, ...]) -> None:
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.total = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.total += value
+
+
+@dataclass
+class RequestStats:
+    statement_count: int = 0
+    statement_seconds: float = 0.0
+
+
+# The middleware stores one mutable RequestStats per request, so hooks running on threadpool threads
+# or inside SQLAlchemy's async greenlets (which see a copy of the context) still update the same object.
+_request_stats: ContextVar[Optional[RequestStats]] = ContextVar("mfstat_request_stats", default=None)
+_lock = threading.Lock()
+_request_durations: dict[tuple[str, str], Histogram] = defaultdict(lambda: Histogram(LATENCY_BUCKETS))
+_request_totals: dict[tuple[str, str, int], int] = defaultdict(int)
+_request_statements: dict[tuple[str, str], Histogram] = defaultdict(lambda: Histogram(STATEMENT_COUNT_BUCKETS))
+_statement_durations: dict[str, Histogram] = defaultdict(lambda: Histogram(LATENCY_BUCKETS))
+_slow_statements: dict[str, int] = defaultdict(int)
+_requests_in_progress = 0
+
+
+def instrument_engine(target_engine, name: str) -> None:
+    @event.listens_for(target_engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+        conn.info.setdefault("mfstat_statement_started_at", []).append(time.perf_counter())
+
+    @event.listens_for(target_engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+        elapsed = time.perf_counter() - conn.info["mfstat_statement_started_at"].pop()
+        stats = _request_stats.get()
+        if stats is not None:
+            stats.statement_count += 1
+            stats.statement_seconds += elapsed
+        with _lock:
+            _statement_durations[name].observe(elapsed)
+            if elapsed >= SLOW_QUERY_SECONDS:
+                _slow_statements[name] += 1
+        if elapsed >= SLOW_QUERY_SECONDS:
+            logger.warning(
+                "Slow query on %s engine (%.1f ms): %s",
+                name,
+                elapsed * 1000,
+                " ".join(statement.split())[:SLOW_QUERY_LOG_LIMIT]
+            )
+
+
+class RequestMetricsMiddleware:
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        global _requests_in_progress
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = _request_stats.set(stats)
+        started_at = time.perf_counter()
+        status_code = 500
+
+        async def send_with_timing(message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if SERVER_TIMING_ENABLED:
+                    app_ms = (time.perf_counter() - started_at) * 1000
+                    db_ms = stats.statement_seconds * 1000
+                    server_timing = (
+                        f'app;dur={app_ms:.1f}, db;dur={db_ms:.1f};desc="{stats.statement_count} queries"'
+                    )
+                    message = {
+                        **message,
+                        "headers": [*message.get("headers", []), (b"server-timing", server_timing.encode())]
+                    }
+            await send(message)
+
+        with _lock:
+            _requests_in_progress += 1
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            elapsed = time.perf_counter() - started_at
+            _request_stats.reset(token)
+            route = scope.get("route")
+            key = (scope["method"], getattr(route, "path", UNMATCHED_ROUTE))
+            with _lock:
+                _requests_in_progress -= 1
+                _request_durations[key].observe(elapsed)
+                _request_totals[(*key, status_code)] += 1
+                _request_statements[key].observe(stats.statement_count)
+
+
+def install_metrics(app, *engines: tuple[object, str]) -> None:
+    if not METRICS_ENABLED:
+        return
+    for target_engine, name in engines:
+        instrument_engine(target_engine, name)
+    app.add_middleware(RequestMetricsMiddleware)
+
+
+def _escape_label(value: object) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(**labels: object) -> str:
+    return ",".join(f'{name}="{_escape_label(value)}"' for name, value in labels.items())
+
+
+def _format_bound(bound: float) -> str:
+    return "+Inf" if bound == float("inf") else repr(float(bound))
+
+
+def _histogram_lines(name: str, histograms: dict, label_names: tuple[str, ...]) -> list[str]:
+    lines = []
+    for key, histogram in sorted(histograms.items()):
+        labels = _labels(**dict(zip(label_names, key if isinstance(key, tuple) else (key,))))
+        cumulative = 0
+        for bound, count in zip((*histogram.buckets, float("inf")), histogram.counts):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{labels},le="{_format_bound(bound)}"}} {cumulative}')
+        lines.append(f"{name}_sum{{{labels}}} {histogram.total}")
+        lines.append(f"{name}_count{{{labels}}} {cumulative}")
+    return lines
+
+
+def render_metrics() -> str:
+    with _lock:
+        lines = [
+            "# HELP mfstat_http_requests_in_progress Requests currently being served.",
+            "# TYPE mfstat_http_requests_in_progress gauge",
+            f"mfstat_http_requests_in_progress {_requests_in_progress}",
+            "# HELP mfstat_http_requests_total Completed requests by route and status code.",
+            "# TYPE mfstat_http_requests_total counter",
+            *(
+                f"mfstat_http_requests_total{{{_labels(method=method, route=route, status=status_code)}}} {count}"
+                for (method, route, status_code), count in sorted(_request_totals.items())
+            ),
+            "# HELP mfstat_http_request_duration_seconds Request latency by route.",
+            "# TYPE mfstat_http_request_duration_seconds histogram",
+            *_histogram_lines("mfstat_http_request_duration_seconds", _request_durations, ("method", "route")),
+            "# HELP mfstat_http_request_db_statements SQL statements executed per request.",
+            "# TYPE mfstat_http_request_db_statements histogram",
+            *_histogram_lines("mfstat_http_request_db_statements", _request_statements, ("method", "route")),
+            "# HELP mfstat_db_statement_duration_seconds SQL statement latency by engine.",
+            "# TYPE mfstat_db_statement_duration_seconds histogram",
+            *_histogram_lines("mfstat_db_statement_duration_seconds", _statement_durations, ("engine",)),
+            "# HELP mfstat_db_slow_statements_total SQL statements slower than the slow-query threshold.",
+            "# TYPE mfstat_db_slow_statements_total counter",
+            *(
+                f"mfstat_db_slow_statements_total{{{_labels(engine=name)}}} {count}"
+                for name, count in sorted(_slow_statements.items())
+            )
+        ]
+    return "\n".join(lines) + "\n"
@@ -1,8 +1,16 @@
 from datetime import datetime
 from typing import Optional
 
+from sqlalchemy import Column, Computed, Index, String, text
 from sqlmodel import Field, SQLModel
 
+from .season import SEASON_SQL_EXPRESSION
+
+RESULT_SQL_EXPRESSION = (
+    "CASE WHEN my_score > opponent_score THEN 'WIN' "
+    "WHEN my_score < opponent_score THEN 'LOSS' ELSE 'DRAW' END"
+)
+
 
 class MatchRecordBase(SQLModel):
     played_at: datetime
@@ -29,10 +37,62 @@ class MatchRecordBase(SQLModel):
 
 
 class MatchRecord(MatchRecordBase, table=True):
+    __table_args__ = (
+        Index("ix_matchrecord_played_at_id", "played_at", "id"),
+        Index("ix_matchrecord_rule_played_at_id", "rule", "played_at", "id"),
+        Index("ix_matchrecord_season_played_at_id", "season", "played_at", "id"),
+        Index("ix_matchrecord_season_rule_result", "season", "rule", "result"),
+        Index("ix_matchrecord_revision", "revision"),
+        Index("ix_matchrecord_opponent_player_name", text("opponent_player_name COLLATE NOCASE"), "played_at"),
+        Index("ix_matchrecord_my_partner_player_name", text("my_partner_player_name COLLATE NOCASE"), "played_at"),
+        {"sqlite_autoincrement": True}
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
-    season: str = Field(min_length=7, max_length=7)
-    result: str = Field(min_length=1, max_length=10)
+    season: Optional[str] = Field(
+        default=None,
+        sa_column=Column(String(7), Computed(SEASON_SQL_EXPRESSION, persisted=True))
+    )
+    result: Optional[str] = Field(
+        default=None,
+        sa_column=Column(String(10), Computed(RESULT_SQL_EXPRESSION, persisted=True))
+    )
     created_at: datetime = Field(default_factory=datetime.utcnow, nullable=False)
+    revision: int = Field(default=0)
+
+
+class MatchRecordTombstone(SQLModel, table=True):
+    record_id: int = Field(primary_key=True, sa_column_kwargs={"autoincrement": False})
+    revision: int = Field(index=True)
+
+
+class MatchStatRollup(SQLModel, table=True):
+    season: str = Field(primary_key=True, max_length=7)
+    rule: str = Field(primary_key=True, max_length=64)
+    dimension: str = Field(primary_key=True, max_length=64)
+    value: str = Field(default="", primary_key=True, max_length=200)
+    match_count: int = Field(default=0)
+    win_count: int = Field(default=0)
+
+
+class PlayerName(SQLModel, table=True):
+    name: str = Field(sa_column=Column(String(100, collation="NOCASE"), primary_key=True))
+    match_count: int = Field(default=0)
+
+
+class DataRevision(SQLModel, table=True):
+    id: Optional[int] = Field(default=None, primary_key=True)
+    revision: int = Field(default=1)
+
+
+class ArchivedSeason(SQLModel, table=True):
+    season: str = Field(primary_key=True, max_length=7)
+    archive: str = Field(index=True, max_length=4)
+    match_count: int = Field(default=0)
+    win_count: int = Field(default=0)
+    first_played_at: datetime
+    last_played_at: datetime
+    archived_at: datetime = Field(default_factory=datetime.utcnow)
 
 
 class MatchRecordCreate(MatchRecordBase):
@@ -68,3 +128,163 @@ class MatchRecordRead(MatchRecordBase):
     season: str
     result: str
     created_at: datetime
+    revision: int
+
+
+class ColumnarRecordColumn(SQLModel):
+    name: str
+    values: Optional[list] = None
+    dictionary: Optional[list] = None
+    codes: Optional[list[int]] = None
+
+
+class ColumnarRecords(SQLModel):
+    row_count: int
+    columns: list[ColumnarRecordColumn]
+
+
+class MatchRecordChanges(SQLModel):
+    revision: int
+    upserts: list[MatchRecordRead]
+    deletes: list[int]
+
+
+class MatchRecordBatchResult(SQLModel):
+    affected: int
+
+
+class ArchivedSeasonRead(SQLModel):
+    season: str
+    archive: str
+    match_count: int
+    win_count: int
+    win_rate: Optional[float]
+    first_played_at: datetime
+    last_played_at: datetime
+    archived_at: datetime
+
+
+class SeasonArchiveRequest(SQLModel):
+    before: Optional[str] = Field(default=None, min_length=7, max_length=7)
+
+
+class MatchStatRollupRead(SQLModel):
+    season: str
+    rule: str
+    dimension: str
+    value: str
+    match_count: int
+    win_count: int
+    win_rate: Optional[float]
+
+
+class RecordFacetCount(SQLModel):
+    value: Optional[str]
+    count: int
+
+
+class RecordFacets(SQLModel):
+    total: int
+    facets: dict[str, list[RecordFacetCount]]
+
+
+class PlayerSuggestion(SQLModel):
+    name: str
+    match_count: int
+
+
+class RivalStats(SQLModel):
+    name: str
+    matches: int
+    wins: int
+    losses: int
+    win_rate: Optional[float]
+    last_played_at: datetime
+    last_my_rate: int
+    last_rate_band: Optional[str]
+    top_character: Optional[str]
+    top_racket: Optional[str]
+
+
+class RivalStatsPage(SQLModel):
+    total: int
+    items: list[RivalStats]
+
+
+class WinRateBreakdownGroup(SQLModel):
+    values: dict[str, Optional[str]]
+    total: int
+    wins: int
+    win_rate: Optional[float]
+
+
+class WinRateBreakdown(SQLModel):
+    dimensions: list[str]
+    total: int
+    wins: int
+    win_rate: Optional[float]
+    groups: list[WinRateBreakdownGroup]
+    sets: dict[str, list[WinRateBreakdownGroup]] = {}
+
+
+class RateTrendPoint(SQLModel):
+    id: int
+    played_at: datetime
+    rate: int
+    rate_band: str
+    season: str
+    date: Optional[str] = None
+
+
+class RateTrendSeries(SQLModel):
+    rule: str
+    total_points: int
+    points: list[RateTrendPoint]
+
+
+class DailyRateCandle(SQLModel):
+    rule: str
+    date: str
+    open: int
+    high: int
+    low: int
+    close: int
+    matches: int
+
+
+class RateDelta(SQLModel):
+    id: int
+    delta: Optional[int]
+
+
+class BackupSnapshot(SQLModel):
+    name: str
+    reason: str
+    created_at: datetime
+    size: int
+    archives: list[str]
+
+
+class BackupStatus(SQLModel):
+    state: str
+    reason: Optional[str]
+    started_at: Optional[datetime]
+    finished_at: Optional[datetime]
+    pages_copied: int
+    pages_total: int
+    error: Optional[str]
+    snapshots: list[BackupSnapshot]
+
+
+class BulkImportRowError(SQLModel):
+    row: int
+    errors: list[str]
+
+
+class BulkImportReport(SQLModel):
+    received: int
+    inserted: int
+    failed: int
+    errors: list[BulkImportRowError]
+    committed_through_row: int
+    aborted: Optional[str] = None
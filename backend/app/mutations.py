@@ -0,0 +1,98 @@
+import json
+from typing import Optional
+
+from sqlalchemy import and_, func, literal
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlmodel import Session, SQLModel, delete, select, update
+
+from .filters import RecordFilters, record_filter_conditions
+from .models import MatchRecord, MatchRecordTombstone, MatchRecordUpdate
+from .revisions import bump_data_revision
+from .rollups import adjust_match_stat_rollups
+from .season import normalize_played_at
+
+
+class RecordsNotFoundError(LookupError):
+    pass
+
+
+class MatchRecordSelection(SQLModel):
+    ids: Optional[list[int]] = None
+    filters: Optional[RecordFilters] = None
+
+
+class MatchRecordBatchUpdate(MatchRecordSelection):
+    changes: MatchRecordUpdate
+
+
+def selection_condition(selection: MatchRecordSelection):
+    if (selection.ids is None) == (selection.filters is None):
+        raise ValueError("Specify either ids or filters")
+    if selection.ids is not None:
+        # A single JSON parameter keeps large id lists clear of SQLite's bound-variable limit.
+        selected_ids = func.json_each(json.dumps(selection.ids)).table_valued("value")
+        return MatchRecord.id.in_(select(selected_ids.c.value))
+
+    conditions = record_filter_conditions(selection.filters)
+    if not conditions:
+        raise ValueError("Filters must narrow the selection; refusing to modify every record")
+    return and_(*conditions)
+
+
+def _check_selected_ids(session: Session, selection: MatchRecordSelection, condition) -> None:
+    # A batch by ids is all or nothing, so one unknown id fails it before anything is written.
+    if selection.ids is None:
+        return
+    found = set(session.exec(select(MatchRecord.id).where(condition)).all())
+    missing = sorted(set(selection.ids) - found)
+    if missing:
+        raise RecordsNotFoundError(f"Records not found: {', '.join(map(str, missing))}")
+
+
+def update_records(session: Session, selection: MatchRecordSelection, changes: MatchRecordUpdate) -> int:
+    condition = selection_condition(selection)
+    values = changes.model_dump(exclude_unset=True)
+    if not values:
+        raise ValueError("No changes given")
+    required_columns = [
+        name for name, value in values.items() if value is None and not MatchRecord.__table__.c[name].nullable
+    ]
+    if required_columns:
+        raise ValueError(f"Cannot clear required fields: {', '.join(required_columns)}")
+    if values.get("played_at") is not None:
+        values["played_at"] = normalize_played_at(values["played_at"])
+    _check_selected_ids(session, selection, condition)
+
+    # Stamping the new revision lets the rollups be re-added for exactly the updated rows,
+    # even when the change moves them out of the original filter.
+    revision = bump_data_revision(session)
+    adjust_match_stat_rollups(session, condition, -1)
+    affected = session.execute(update(MatchRecord).where(condition).values(**values, revision=revision)).rowcount
+    if not affected:
+        session.rollback()
+        return 0
+    adjust_match_stat_rollups(session, MatchRecord.revision == revision, 1)
+    session.commit()
+    return affected
+
+
+def delete_records(session: Session, selection: MatchRecordSelection) -> int:
+    condition = selection_condition(selection)
+    _check_selected_ids(session, selection, condition)
+    revision = bump_data_revision(session)
+    adjust_match_stat_rollups(session, condition, -1)
+    tombstones = sqlite_insert(MatchRecordTombstone).from_select(
+        ["record_id", "revision"],
+        select(MatchRecord.id, literal(revision)).where(condition)
+    )
+    tombstones = tombstones.on_conflict_do_update(
+        index_elements=["record_id"],
+        set_={"revision": tombstones.excluded.revision}
+    )
+    session.execute(tombstones)
+    affected = session.execute(delete(MatchRecord).where(condition)).rowcount
+    if not affected:
+        session.rollback()
+        return 0
+    session.commit()
+    return affected
@@ -0,0 +1,360 @@
+import logging
+import os
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+from contextlib import contextmanager
+from datetime import datetime
+from itertools import count
+from typing import Iterator, Optional
+
+from sqlmodel import Session, select
+
+from .archive import attach_archives
+from .columnar import DICTIONARY_ENCODED_COLUMNS, RECORD_COLUMNS, normalize_record_row, select_record_rows, to_iso_datetime
+from .database import read_engine
+from .facets import FACET_DIMENSIONS, build_record_facets
+from .filters import RECORD_FILTER_COLUMNS, RecordFilters
+from .models import DataRevision, MatchRecord, MatchRecordTombstone, RecordFacets, WinRateBreakdown
+from .stats import BreakdownDimension, BreakdownGrouping, build_win_rate_breakdown
+
+NUMERIC_COLUMNS = {"id", "my_score", "opponent_score", "my_rate", "revision"}
+# Past this many changed rows, rebuilding the bitmaps in bulk beats patching them bit by bit.
+RELOAD_CHANGE_THRESHOLD = 1000
+SLOT_SCAN_WINDOW_BITS = 4096
+
+logger = logging.getLogger("mfstat.record_store")
+
+_ID_INDEX = RECORD_COLUMNS.index("id")
+_PLAYED_AT_INDEX = RECORD_COLUMNS.index("played_at")
+
+
+def _slot_bitmap(slots: list[int], slot_count: int) -> int:
+    buffer = bytearray((slot_count + 7) // 8)
+    for slot in slots:
+        buffer[slot >> 3] |= 1 << (slot & 7)
+    return int.from_bytes(buffer, "little")
+
+
+def _iter_slots_descending(mask: int, end: Optional[int] = None) -> Iterator[int]:
+    # A page usually ends near the top bit, so the mask is read in windows that double in size on
+    # the way down; shifting copies only the bits above a window, and a short page never converts
+    # the whole table-sized mask.
+    top = mask.bit_length() if end is None else min(end, mask.bit_length())
+    window = SLOT_SCAN_WINDOW_BITS
+    while top > 0:
+        low = max(0, top - window)
+        bits = bin((mask >> low) & ((1 << (top - low)) - 1))[2:]
+        highest = low + len(bits) - 1
+        position = bits.find("1")
+        while position != -1:
+            yield highest - position
+            position = bits.find("1", position + 1)
+        top = low
+        window *= 2
+
+
+# Slots follow (played_at, id) order, so walking a bitmap from its top bit lists records newest first.
+# Deleted records leave holes that are only cleared from the live bitmap until the next full load.
+class RecordStore:
+    def __init__(self) -> None:
+        self._lock = threading.RLock()
+        self._wake = threading.Event()
+        self.ready = False
+        self.revision = 0
+        # Writers bump the requested generation; a sync records the one it started from, so a
+        # write that lands mid-sync keeps the store stale until the next pass picks it up.
+        self._generations = count(1)
+        self._requested = 0
+        self._synced = 0
+        self._reset()
+
+    def _reset(self) -> None:
+        self._columns: dict[str, list | array] = {
+            name: array("q") if name in NUMERIC_COLUMNS else []
+            for name in RECORD_COLUMNS
+            if name not in DICTIONARY_ENCODED_COLUMNS
+        }
+        self._codes: dict[str, array] = {name: array("i") for name in DICTIONARY_ENCODED_COLUMNS}
+        self._dictionaries: dict[str, dict[object, int]] = {name: {} for name in DICTIONARY_ENCODED_COLUMNS}
+        self._values: dict[str, list] = {name: [] for name in DICTIONARY_ENCODED_COLUMNS}
+        self._bitmaps: dict[str, list[int]] = {name: [] for name in DICTIONARY_ENCODED_COLUMNS}
+        self._sort_keys: list[tuple[str, int]] = []
+        self._slots: dict[int, int] = {}
+        self._live = 0
+
+    def _encode(self, name: str, value: object) -> int:
+        dictionary = self._dictionaries[name]
+        code = dictionary.get(value)
+        if code is None:
+            code = len(dictionary)
+            dictionary[value] = code
+            self._values[name].append(value)
+            self._bitmaps[name].append(0)
+        return code
+
+    def _load(self, session: Session) -> None:
+        revision = session.exec(select(DataRevision.revision)).one()
+        statement = select_record_rows().order_by(MatchRecord.played_at, MatchRecord.id)
+        rows = [normalize_record_row(row) for row in session.execute(statement)]
+
+        self._reset()
+        slot_count = len(rows)
+        for index, name in enumerate(RECORD_COLUMNS):
+            if name not in DICTIONARY_ENCODED_COLUMNS:
+                self._columns[name].extend(row[index] for row in rows)
+                continue
+            codes = self._codes[name]
+            code_slots: list[list[int]] = []
+            for slot, row in enumerate(rows):
+                code = self._encode(name, row[index])
+                if code == len(code_slots):
+                    code_slots.append([])
+                code_slots[code].append(slot)
+                codes.append(code)
+            self._bitmaps[name] = [_slot_bitmap(slots, slot_count) for slots in code_slots]
+
+        self._sort_keys = [(row[_PLAYED_AT_INDEX], row[_ID_INDEX]) for row in rows]
+        self._slots = {row[_ID_INDEX]: slot for slot, row in enumerate(rows)}
+        self._live = (1 << slot_count) - 1
+        self.revision = revision
+        self.ready = True
+
+    def _append(self, row: tuple) -> None:
+        slot = len(self._sort_keys)
+        bit = 1 << slot
+        for index, name in enumerate(RECORD_COLUMNS):
+            if name in DICTIONARY_ENCODED_COLUMNS:
+                code = self._encode(name, row[index])
+                self._codes[name].append(code)
+                self._bitmaps[name][code] |= bit
+            else:
+                self._columns[name].append(row[index])
+        self._sort_keys.append((row[_PLAYED_AT_INDEX], row[_ID_INDEX]))
+        self._slots[row[_ID_INDEX]] = slot
+        self._live |= bit
+
+    def _replace(self, slot: int, row: tuple) -> None:
+        bit = 1 << slot
+        for index, name in enumerate(RECORD_COLUMNS):
+            if name not in DICTIONARY_ENCODED_COLUMNS:
+                self._columns[name][slot] = row[index]
+                continue
+            old_code = self._codes[name][slot]
+            code = self._encode(name, row[index])
+            if code != old_code:
+                self._bitmaps[name][old_code] &= ~bit
+                self._bitmaps[name][code] |= bit
+                self._codes[name][slot] = code
+
+    def _apply_changes(self, upserts: list[tuple], deleted_ids: list[int]) -> bool:
+        for record_id in deleted_ids:
+            slot = self._slots.pop(record_id, None)
+            if slot is not None:
+                self._live &= ~(1 << slot)
+        for row in upserts:
+            sort_key = (row[_PLAYED_AT_INDEX], row[_ID_INDEX])
+            slot = self._slots.get(row[_ID_INDEX])
+            if slot is not None:
+                if self._sort_keys[slot] != sort_key:
+                    return False
+                self._replace(slot, row)
+            elif self._sort_keys and sort_key < self._sort_keys[-1]:
+                return False
+            else:
+                self._append(row)
+        return True
+
+    @property
+    def stale(self) -> bool:
+        return self._synced != self._requested
+
+    def invalidate(self) -> None:
+        self._requested = next(self._generations)
+        self._wake.set()
+
+    def run(self) -> None:
+        while True:
+            self._wake.wait()
+            self._wake.clear()
+            try:
+                self.sync()
+            except Exception:
+                logger.exception("Record store sync failed; reads fall back to the database")
+
+    def sync(self) -> None:
+        with self._lock:
+            requested = self._requested
+            with Session(read_engine) as session:
+                attach_archives(session)
+                self._sync(session)
+            self._synced = requested
+
+    def _sync(self, session: Session) -> None:
+        if not self.ready:
+            self._load(session)
+            logger.info("Loaded %d records into the record store", len(self._slots))
+            return
+
+        revision = session.exec(select(DataRevision.revision)).one()
+        if revision == self.revision:
+            return
+        upserts = [
+            normalize_record_row(row)
+            for row in session.execute(
+                select_record_rows()
+                .where(MatchRecord.revision > self.revision)
+                .order_by(MatchRecord.played_at, MatchRecord.id)
+            )
+        ]
+        deleted_ids = session.exec(
+            select(MatchRecordTombstone.record_id).where(MatchRecordTombstone.revision > self.revision)
+        ).all()
+        # Changes that would break slot order (back-dated inserts, edited played_at) force a reload.
+        if len(upserts) + len(deleted_ids) > RELOAD_CHANGE_THRESHOLD or not self._apply_changes(
+            upserts,
+            deleted_ids
+        ):
+            self._load(session)
+            return
+        self.revision = revision
+
+    def _filter_mask(self, filters: RecordFilters, exclude: Optional[str] = None) -> int:
+        mask = self._live
+        for name in RECORD_FILTER_COLUMNS:
+            values = getattr(filters, name)
+            if name == exclude or not values:
+                continue
+            dictionary = self._dictionaries[name]
+            bitmaps = self._bitmaps[name]
+            matched = 0
+            for value in values:
+                code = dictionary.get(value)
+                if code is not None:
+                    matched |= bitmaps[code]
+            mask &= matched
+        if filters.played_from is not None:
+            start = bisect_left(self._sort_keys, (to_iso_datetime(filters.played_from),))
+            mask &= -(1 << start)
+        if filters.played_to is not None:
+            end = bisect_right(self._sort_keys, (to_iso_datetime(filters.played_to), float("inf")))
+            mask &= (1 << end) - 1
+        return mask
+
+    def _row(self, slot: int) -> tuple:
+        return tuple(
+            self._values[name][self._codes[name][slot]] if name in DICTIONARY_ENCODED_COLUMNS else self._columns[name][slot]
+            for name in RECORD_COLUMNS
+        )
+
+    def list_rows(
+        self,
+        filters: RecordFilters,
+        cursor: Optional[tuple[datetime, int]] = None,
+        limit: Optional[int] = None
+    ) -> list[tuple]:
+        with self._lock:
+            mask = self._filter_mask(filters)
+            end = None
+            if cursor is not None:
+                played_at, record_id = cursor
+                end = bisect_left(self._sort_keys, (to_iso_datetime(played_at), record_id))
+            rows = []
+            for slot in _iter_slots_descending(mask, end):
+                if limit is not None and len(rows) >= limit:
+                    break
+                rows.append(self._row(slot))
+            return rows
+
+    def _partition(self, name: str, mask: int) -> Iterator[tuple[int, int]]:
+        bitmaps = self._bitmaps[name]
+        if mask.bit_count() >= len(bitmaps):
+            for code, bitmap in enumerate(bitmaps):
+                group_mask = mask & bitmap
+                if group_mask:
+                    yield code, group_mask
+            return
+        # Fewer rows than values: reading each row's code visits only the groups that exist,
+        # instead of intersecting the mask with every bitmap of a high-cardinality column.
+        codes = self._codes[name]
+        groups: dict[int, int] = {}
+        for slot in _iter_slots_descending(mask):
+            code = codes[slot]
+            groups[code] = groups.get(code, 0) | 1 << slot
+        yield from groups.items()
+
+    def win_rate_breakdown(
+        self,
+        dimensions: list[BreakdownDimension],
+        filters: RecordFilters,
+        grouping: BreakdownGrouping = "joint"
+    ) -> WinRateBreakdown:
+        dimensions = list(dict.fromkeys(dimensions))
+        with self._lock:
+            win_code = self._dictionaries["result"].get("WIN")
+            win_mask = self._bitmaps["result"][win_code] if win_code is not None else 0
+
+            def iter_groups(depth: int, mask: int, values: tuple) -> Iterator[tuple[dict, int, int]]:
+                if depth == len(dimensions):
+                    yield dict(zip(dimensions, values)), mask.bit_count(), (mask & win_mask).bit_count()
+                    return
+                name = dimensions[depth]
+                for code, group_mask in self._partition(name, mask):
+                    yield from iter_groups(depth + 1, group_mask, (*values, self._values[name][code]))
+
+            group_counts = list(iter_groups(0, self._filter_mask(filters), ()))
+        return build_win_rate_breakdown(dimensions, group_counts, grouping)
+
+    def facets(self, filters: RecordFilters) -> RecordFacets:
+        with self._lock:
+            total = self._filter_mask(filters).bit_count()
+            counts = {}
+            for name in FACET_DIMENSIONS:
+                mask = self._filter_mask(filters, exclude=name)
+                counts[name] = {
+                    self._values[name][code]: (mask & bitmap).bit_count()
+                    for code, bitmap in enumerate(self._bitmaps[name])
+                }
+        return build_record_facets(total, counts)
+
+
+def _record_store_enabled() -> bool:
+    return os.getenv("MFSTAT_RECORD_CACHE", "").strip().lower() in {"1", "true", "yes", "on"}
+
+
+RECORD_STORE = RecordStore() if _record_store_enabled() else None
+
+
+def active_record_store() -> Optional[RecordStore]:
+    # Until the background sync catches up with the latest write, reads go to the database.
+    if RECORD_STORE is None or not RECORD_STORE.ready or RECORD_STORE.stale:
+        return None
+    return RECORD_STORE
+
+
+@contextmanager
+def pinned_record_store(revision: int) -> Iterator[Optional[RecordStore]]:
+    # The store lock is held for the whole read, so a sync cannot move the store past the revision
+    # the response is tagged with; a store at any other revision is skipped for the database.
+    record_store = active_record_store()
+    if record_store is None:
+        yield None
+        return
+    with record_store._lock:
+        yield record_store if record_store.revision == revision else None
+
+
+def start_record_store() -> None:
+    if RECORD_STORE is not None:
+        threading.Thread(target=RECORD_STORE.run, name="mfstat-record-store", daemon=True).start()
+        RECORD_STORE.invalidate()
+
+
+def invalidate_record_store() -> None:
+    if RECORD_STORE is not None:
+        RECORD_STORE.invalidate()
+
+
+def sync_record_store() -> None:
+    if RECORD_STORE is not None:
+        RECORD_STORE.sync()
@@ -0,0 +1,95 @@
+import hashlib
+
+from fastapi import Depends, HTTPException, Request, Response, status
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.engine import Connection
+from sqlmodel import Session, select, update
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from .database import get_async_read_session
+from .models import DataRevision, MatchRecord, MatchRecordChanges, MatchRecordTombstone
+
+DATA_REVISION_ID = 1
+REVALIDATE_CACHE_CONTROL = "no-cache"
+
+
+def bump_data_revision(session: Session) -> int:
+    statement = (
+        update(DataRevision)
+        .where(DataRevision.id == DATA_REVISION_ID)
+        .values(revision=DataRevision.revision + 1)
+        .returning(DataRevision.revision)
+    )
+    return session.execute(statement).scalar_one()
+
+
+def current_data_revision(session: Session) -> int:
+    statement = select(DataRevision.revision).where(DataRevision.id == DATA_REVISION_ID)
+    return session.exec(statement).one()
+
+
+def read_snapshot_revision(connection: Connection) -> int:
+    # pysqlite runs SELECTs outside any transaction, so each statement would see whatever was
+    # committed by then; BEGIN pins one WAL snapshot for the revision and every read after it.
+    connection.exec_driver_sql("BEGIN")
+    statement = select(DataRevision.revision).where(DataRevision.id == DATA_REVISION_ID)
+    return connection.execute(statement).scalar_one()
+
+
+def _read_session_snapshot_revision(session: Session) -> int:
+    return read_snapshot_revision(session.connection())
+
+
+def record_tombstone(session: Session, record_id: int, revision: int) -> None:
+    statement = sqlite_insert(MatchRecordTombstone).values(record_id=record_id, revision=revision)
+    statement = statement.on_conflict_do_update(
+        index_elements=["record_id"],
+        set_={"revision": statement.excluded.revision}
+    )
+    session.execute(statement)
+
+
+def list_record_changes(session: Session, since: int) -> MatchRecordChanges:
+    revision = current_data_revision(session)
+    upserts = session.exec(
+        select(MatchRecord).where(MatchRecord.revision > since).order_by(MatchRecord.revision, MatchRecord.id)
+    ).all()
+    deletes = session.exec(
+        select(MatchRecordTombstone.record_id)
+        .where(MatchRecordTombstone.revision > since)
+        .order_by(MatchRecordTombstone.revision, MatchRecordTombstone.record_id)
+    ).all()
+    return MatchRecordChanges(revision=revision, upserts=upserts, deletes=deletes)
+
+
+def _representation_etag(request: Request, revision: int) -> str:
+    # GZipMiddleware decides on compression after this runs, so the tag is weak: it names the
+    # content, and the gzip and identity bodies of one revision are never byte-identical.
+    representation = f"{request.url.path}?{request.url.query}".encode()
+    return f'W/"{revision}-{hashlib.sha1(representation).hexdigest()[:16]}"'
+
+
+def revision_etag_headers(request: Request, revision: int) -> dict[str, str]:
+    return {"ETag": _representation_etag(request, revision), "Cache-Control": REVALIDATE_CACHE_CONTROL}
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    # If-None-Match uses the weak comparison, so W/ prefixes are ignored on both sides.
+    candidates = [candidate.strip().removeprefix("W/") for candidate in if_none_match.split(",")]
+    return "*" in candidates or etag.removeprefix("W/") in candidates
+
+
+async def check_data_revision_etag(
+    request: Request,
+    response: Response,
+    session: AsyncSession = Depends(get_async_read_session)
+) -> int:
+    # The request's read session stays in this snapshot, so the payload is read at the revision
+    # its ETag names; routes answering from the record store use it only at that same revision.
+    revision = await session.run_sync(_read_session_snapshot_revision)
+    headers = revision_etag_headers(request, revision)
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _etag_matches(if_none_match, headers["ETag"]):
+        raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
+    return revision
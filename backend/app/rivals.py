@@ -0,0 +1,167 @@
+import string
+from typing import Literal
+
+from sqlalchemy import case, func
+from sqlmodel import Session, select
+
+from .filters import RecordFilters, apply_record_filters
+from .models import MatchRecord, RivalStats, RivalStatsPage
+from .stats import compute_win_rate
+
+RivalRole = Literal["opponent", "partner"]
+RivalSort = Literal["matches", "wins", "win_rate", "last_played", "name"]
+SortOrder = Literal["asc", "desc"]
+
+RIVAL_ROLE_COLUMNS = {
+    "opponent": (
+        MatchRecord.opponent_player_name,
+        MatchRecord.opponent_character,
+        MatchRecord.opponent_racket,
+        MatchRecord.opponent_rate_band
+    ),
+    "partner": (
+        MatchRecord.my_partner_player_name,
+        MatchRecord.my_partner_character,
+        MatchRecord.my_partner_racket,
+        MatchRecord.my_partner_rate_band
+    )
+}
+# SQLite's NOCASE only folds ASCII letters, so keys built in Python must do the same.
+_NOCASE_TABLE = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+
+
+def _nocase_key(name: str) -> str:
+    return name.translate(_NOCASE_TABLE)
+
+
+def _latest_matches(
+    session: Session,
+    name_column,
+    rate_band_column,
+    names: list[str],
+    filters: RecordFilters
+) -> dict[str, tuple[int, str | None]]:
+    name_key = name_column.collate("NOCASE")
+    latest_rank = func.row_number().over(
+        partition_by=name_key,
+        order_by=(MatchRecord.played_at.desc(), MatchRecord.id.desc())
+    )
+    ranked = apply_record_filters(
+        select(
+            name_column.label("name"),
+            MatchRecord.my_rate,
+            rate_band_column.label("rate_band"),
+            latest_rank.label("latest_rank")
+        ).where(name_key.in_(names)),
+        filters
+    ).subquery()
+    rows = session.exec(
+        select(ranked.c.name, ranked.c.my_rate, ranked.c.rate_band).where(ranked.c.latest_rank == 1)
+    ).all()
+    return {_nocase_key(name): (my_rate, rate_band) for name, my_rate, rate_band in rows}
+
+
+def _most_used(
+    session: Session,
+    name_column,
+    value_column,
+    names: list[str],
+    filters: RecordFilters
+) -> dict[str, str]:
+    name_key = name_column.collate("NOCASE")
+    usage = apply_record_filters(
+        select(
+            func.min(name_column).label("name"),
+            value_column.label("value"),
+            func.count().label("uses"),
+            func.max(MatchRecord.played_at).label("last_used")
+        ).where(name_key.in_(names), value_column.is_not(None), value_column != ""),
+        filters
+    ).group_by(name_key, value_column).subquery()
+    usage_rank = func.row_number().over(
+        partition_by=usage.c.name.collate("NOCASE"),
+        order_by=(usage.c.uses.desc(), usage.c.last_used.desc())
+    )
+    ranked = select(usage.c.name, usage.c.value, usage_rank.label("usage_rank")).subquery()
+    rows = session.exec(select(ranked.c.name, ranked.c.value).where(ranked.c.usage_rank == 1)).all()
+    return {_nocase_key(name): value for name, value in rows}
+
+
+def compute_rival_stats(
+    session: Session,
+    role: RivalRole,
+    filters: RecordFilters,
+    name: str | None = None,
+    min_matches: int = 1,
+    sort: RivalSort = "matches",
+    order: SortOrder = "desc",
+    limit: int = 50,
+    offset: int = 0
+) -> RivalStatsPage:
+    name_column, character_column, racket_column, rate_band_column = RIVAL_ROLE_COLUMNS[role]
+    name_key = name_column.collate("NOCASE")
+    display_name = func.min(name_column)
+    matches = func.count()
+    wins = func.sum(case((MatchRecord.result == "WIN", 1), else_=0))
+    losses = func.sum(case((MatchRecord.result == "LOSS", 1), else_=0))
+    last_played_at = func.max(MatchRecord.played_at)
+    sort_expressions = {
+        "matches": matches,
+        "wins": wins,
+        "win_rate": wins * 1.0 / matches,
+        "last_played": last_played_at,
+        "name": display_name
+    }
+    sort_expression = sort_expressions[sort]
+
+    statement = apply_record_filters(
+        select(
+            display_name.label("name"),
+            matches.label("matches"),
+            wins.label("wins"),
+            losses.label("losses"),
+            last_played_at.label("last_played_at"),
+            func.count().over().label("total")
+        ).where(name_column.is_not(None), name_column != ""),
+        filters
+    )
+    if name:
+        statement = statement.where(name_key == name)
+    statement = statement.group_by(name_key)
+    if min_matches > 1:
+        # One-off opponents would crowd a win-rate leaderboard, so the threshold drops them before paging.
+        statement = statement.having(matches >= min_matches)
+    rows = session.exec(
+        statement.order_by(sort_expression.desc() if order == "desc" else sort_expression.asc(), display_name)
+        .limit(limit)
+        .offset(offset)
+    ).all()
+    if not rows:
+        # The windowed total rides along with page rows, so an empty page past the end counts separately.
+        total = session.exec(select(func.count()).select_from(statement.subquery())).one() if offset else 0
+        return RivalStatsPage(total=total, items=[])
+
+    names = [row.name for row in rows]
+    latest_matches = _latest_matches(session, name_column, rate_band_column, names, filters)
+    top_characters = _most_used(session, name_column, character_column, names, filters)
+    top_rackets = _most_used(session, name_column, racket_column, names, filters)
+
+    items = []
+    for row in rows:
+        key = _nocase_key(row.name)
+        last_my_rate, last_rate_band = latest_matches[key]
+        items.append(
+            RivalStats(
+                name=row.name,
+                matches=row.matches,
+                wins=row.wins,
+                losses=row.losses,
+                win_rate=compute_win_rate(row.matches, row.wins),
+                last_played_at=row.last_played_at,
+                last_my_rate=last_my_rate,
+                last_rate_band=last_rate_band,
+                top_character=top_characters.get(key),
+                top_racket=top_rackets.get(key)
+            )
+        )
+    return RivalStatsPage(total=rows[0].total, items=items)
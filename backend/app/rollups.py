@@ -0,0 +1,163 @@
+import argparse
+from typing import Optional
+
+from sqlalchemy import case, func, literal, true, union_all
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlmodel import Session, select
+
+from .archive import archive_slot, attach_record_archives, detach_record_archives
+from .filters import RECORD_FILTER_COLUMNS, RecordFilters
+from .models import MatchRecord, MatchStatRollup, WinRateBreakdown
+from .stats import BreakdownDimension, BreakdownGrouping, build_win_rate_breakdown, build_win_rate_set_breakdown
+
+TOTAL_DIMENSION = "total"
+ROLLUP_DIMENSIONS = (
+    TOTAL_DIMENSION,
+    "stage",
+    "my_character",
+    "opponent_character",
+    "my_racket",
+    "opponent_racket",
+    "opponent_rate_band"
+)
+ROLLUP_KEY_COLUMNS = {"season": MatchStatRollup.season, "rule": MatchStatRollup.rule}
+
+
+def _rollup_source(condition, sign: int):
+    win_count = func.sum(case((MatchRecord.result == "WIN", 1), else_=0))
+    selects = []
+    for dimension in ROLLUP_DIMENSIONS:
+        if dimension == TOTAL_DIMENSION:
+            value = literal("")
+        else:
+            value = func.coalesce(getattr(MatchRecord, dimension), "")
+        selects.append(
+            select(
+                MatchRecord.season,
+                MatchRecord.rule,
+                literal(dimension),
+                value,
+                func.count() * sign,
+                win_count * sign
+            )
+            .where(condition)
+            .group_by(MatchRecord.season, MatchRecord.rule, value)
+        )
+    return union_all(*selects).subquery()
+
+
+def adjust_match_stat_rollups(session: Session, condition, sign: int) -> None:
+    source = _rollup_source(condition, sign)
+    rollup_table = MatchStatRollup.__table__
+    statement = sqlite_insert(rollup_table).from_select(
+        ["season", "rule", "dimension", "value", "match_count", "win_count"],
+        # SQLite needs a WHERE clause to parse INSERT ... SELECT ... ON CONFLICT unambiguously.
+        select(*source.c).where(true())
+    )
+    statement = statement.on_conflict_do_update(
+        index_elements=["season", "rule", "dimension", "value"],
+        set_={
+            "match_count": rollup_table.c.match_count + statement.excluded.match_count,
+            "win_count": rollup_table.c.win_count + statement.excluded.win_count
+        }
+    )
+    session.execute(statement)
+    if sign < 0:
+        session.execute(rollup_table.delete().where(rollup_table.c.match_count <= 0))
+
+
+def _rollup_group_counts(
+    session: Session,
+    dimensions: list[BreakdownDimension],
+    filters: RecordFilters
+) -> list[tuple[dict[str, Optional[str]], int, int]]:
+    value_dimensions = [dimension for dimension in dimensions if dimension not in ROLLUP_KEY_COLUMNS]
+    rollup_dimension = value_dimensions[0] if value_dimensions else TOTAL_DIMENSION
+    columns = [ROLLUP_KEY_COLUMNS.get(dimension, MatchStatRollup.value) for dimension in dimensions]
+    statement = select(*columns, func.sum(MatchStatRollup.match_count), func.sum(MatchStatRollup.win_count)).where(
+        MatchStatRollup.dimension == rollup_dimension
+    )
+    for name, column in ROLLUP_KEY_COLUMNS.items():
+        if getattr(filters, name):
+            statement = statement.where(column.in_(getattr(filters, name)))
+    if columns:
+        statement = statement.group_by(*columns)
+    # Rollups store a missing optional value as "", where the record columns hold NULL.
+    nullable = {dimension for dimension in value_dimensions if MatchRecord.__table__.c[dimension].nullable}
+    return [
+        (
+            {
+                dimension: None if dimension in nullable and value == "" else value
+                for dimension, value in zip(dimensions, row[:-2])
+            },
+            int(row[-2] or 0),
+            int(row[-1] or 0)
+        )
+        for row in session.exec(statement).all()
+    ]
+
+
+def compute_rollup_win_rate_breakdown(
+    session: Session,
+    dimensions: list[BreakdownDimension],
+    filters: RecordFilters,
+    grouping: BreakdownGrouping = "joint"
+) -> Optional[WinRateBreakdown]:
+    # Rollups are keyed by season and rule only, so any other filter, a dimension they do not
+    # count, or a joint grouping across two counted dimensions goes to the record table instead.
+    dimensions = list(dict.fromkeys(dimensions))
+    if filters.played_from is not None or filters.played_to is not None:
+        return None
+    if any(getattr(filters, name) for name in RECORD_FILTER_COLUMNS if name not in ROLLUP_KEY_COLUMNS):
+        return None
+    value_dimensions = [dimension for dimension in dimensions if dimension not in ROLLUP_KEY_COLUMNS]
+    if any(dimension not in ROLLUP_DIMENSIONS for dimension in value_dimensions):
+        return None
+
+    if grouping == "joint":
+        if len(value_dimensions) > 1:
+            return None
+        return build_win_rate_breakdown(dimensions, _rollup_group_counts(session, dimensions, filters))
+
+    (_, total, wins), = _rollup_group_counts(session, [], filters)
+    set_counts = {
+        dimension: [
+            (values[dimension], value_total, value_wins)
+            for values, value_total, value_wins in _rollup_group_counts(session, [dimension], filters)
+        ]
+        for dimension in dimensions
+    }
+    return build_win_rate_set_breakdown(dimensions, total, wins, set_counts)
+
+
+def rebuild_match_stat_rollups(session: Session) -> None:
+    # Archived seasons only have rollups left in the working database, so their rows are
+    # counted again from the archive files through the same union view the reads use.
+    attach_record_archives(session.connection(), read_only=False)
+    try:
+        session.execute(MatchStatRollup.__table__.delete())
+        adjust_match_stat_rollups(session, true(), 1)
+        session.commit()
+    finally:
+        session.rollback()
+        detach_record_archives(session.connection())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m app.rollups")
+    parser.add_argument("command", choices=["rebuild"])
+    parser.parse_args()
+
+    from .database import ServerRunningError, engine, init_db, maintenance_slot, writer_slot
+
+    try:
+        with maintenance_slot():
+            init_db()
+            with archive_slot(), writer_slot(), Session(engine) as session:
+                rebuild_match_stat_rollups(session)
+    except ServerRunningError as exc:
+        parser.exit(1, f"{parser.prog}: {exc}\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+from sqlalchemy import column, literal_column, or_, table
+from sqlmodel import Session, select
+
+from .filters import RecordFilters, apply_record_filters
+from .models import MatchRecord, PlayerName
+
+SEARCH_COLUMNS = ("stage", "opponent_player_name", "my_partner_player_name", "opponent_partner_player_name")
+MIN_TRIGRAM_TERM_LENGTH = 3
+MAX_CODE_POINT = "\U0010ffff"
+
+matchrecord_fts = table("matchrecord_fts", column("rowid"), column("rank"))
+
+
+def _fts_match_expression(terms: list[str]) -> str:
+    # Quoting each term keeps FTS5 operators in user input from being interpreted.
+    return " AND ".join('"' + term.replace('"', '""') + '"' for term in terms)
+
+
+def _escape_like(term: str) -> str:
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def search_records(session: Session, query: str, filters: RecordFilters, limit: int) -> list[MatchRecord]:
+    terms = query.split()
+    if not terms:
+        return []
+
+    statement = apply_record_filters(select(MatchRecord), filters)
+    if all(len(term) >= MIN_TRIGRAM_TERM_LENGTH for term in terms):
+        statement = (
+            statement.join(matchrecord_fts, matchrecord_fts.c.rowid == MatchRecord.id)
+            .where(literal_column("matchrecord_fts").op("MATCH")(_fts_match_expression(terms)))
+            .order_by(matchrecord_fts.c.rank, MatchRecord.played_at.desc(), MatchRecord.id.desc())
+        )
+    else:
+        # Trigrams cannot match terms shorter than three characters, so those fall back to a scan.
+        for term in terms:
+            pattern = f"%{_escape_like(term)}%"
+            statement = statement.where(
+                or_(*[getattr(MatchRecord, name).like(pattern, escape="\\") for name in SEARCH_COLUMNS])
+            )
+        statement = statement.order_by(MatchRecord.played_at.desc(), MatchRecord.id.desc())
+    return session.exec(statement.limit(limit)).all()
+
+
+def suggest_player_names(session: Session, prefix: str, limit: int) -> list[PlayerName]:
+    # A NOCASE range on the primary key is an index seek, unlike LIKE with an ESCAPE clause.
+    statement = (
+        select(PlayerName)
+        .where(PlayerName.name >= prefix, PlayerName.name < prefix + MAX_CODE_POINT)
+        .order_by(PlayerName.match_count.desc(), PlayerName.name)
+        .limit(limit)
+    )
+    return session.exec(statement).all()
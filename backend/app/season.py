@@ -1,6 +1,8 @@
-from datetime import UTC, datetime, timedelta
+from datetime import UTC, datetime, timedelta, timezone
 
 JST_OFFSET = timedelta(hours=9)
+JST = timezone(JST_OFFSET)
+SEASON_SQL_EXPRESSION = "strftime('%Y/%m', played_at, '-9 hours')"
 
 
 def compute_season_from_played_at(played_at: datetime) -> str:
@@ -11,6 +13,12 @@ def compute_season_from_played_at(played_at: datetime) -> str:
     return utc_played_at.strftime("%Y/%m")
 
 
+def normalize_played_at(played_at: datetime) -> datetime:
+    if played_at.tzinfo is None:
+        return played_at
+    return played_at.astimezone(JST).replace(tzinfo=None)
+
+
 def parse_database_datetime(value: object) -> datetime | None:
     if isinstance(value, datetime):
         return value
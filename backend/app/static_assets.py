@@ -0,0 +1,150 @@
+import argparse
+import gzip
+import mimetypes
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from fastapi import Request, Response, status
+from fastapi.responses import FileResponse
+
+IMMUTABLE_ASSET_PREFIX = "assets/"
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "no-cache"
+COMPRESSIBLE_SUFFIXES = {".css", ".html", ".js", ".json", ".map", ".mjs", ".svg", ".txt", ".webmanifest"}
+MIN_COMPRESSIBLE_SIZE = 1024
+PRECOMPRESSED_ENCODINGS = {"br": ".br", "gzip": ".gz"}
+ENCODING_PREFERENCE = ["br", "gzip"]
+
+
+@dataclass
+class StaticAsset:
+    path: Path
+    media_type: str
+    etag: str
+    immutable: bool
+    compressible: bool
+    variants: dict[str, Path] = field(default_factory=dict)
+    gzip_body: bytes | None = None
+
+
+def _is_compressible(path: Path, size: int) -> bool:
+    return path.suffix in COMPRESSIBLE_SUFFIXES and size >= MIN_COMPRESSIBLE_SIZE
+
+
+def build_static_asset_index(dist_dir: Path) -> dict[str, StaticAsset]:
+    index: dict[str, StaticAsset] = {}
+    for path in dist_dir.rglob("*"):
+        if not path.is_file() or path.suffix in {".br", ".gz"}:
+            continue
+        stat = path.stat()
+        relative_path = path.relative_to(dist_dir).as_posix()
+        variants = {}
+        for encoding, suffix in PRECOMPRESSED_ENCODINGS.items():
+            variant_path = path.with_name(path.name + suffix)
+            if variant_path.is_file():
+                variants[encoding] = variant_path
+        index[relative_path] = StaticAsset(
+            path=path,
+            media_type=mimetypes.guess_type(path.name)[0] or "application/octet-stream",
+            etag=f"{stat.st_mtime_ns:x}-{stat.st_size:x}",
+            immutable=relative_path.startswith(IMMUTABLE_ASSET_PREFIX),
+            compressible=_is_compressible(path, stat.st_size),
+            variants=variants
+        )
+    return index
+
+
+def _accepted_encodings(header: str) -> set[str]:
+    accepted = set()
+    for item in header.split(","):
+        name, _, params = item.strip().partition(";")
+        quality = params.strip()
+        if quality.startswith("q="):
+            try:
+                if float(quality[2:]) <= 0:
+                    continue
+            except ValueError:
+                continue
+        if name:
+            accepted.add(name.strip().lower())
+    return accepted
+
+
+_gzip_lock = threading.Lock()
+
+
+def _gzip_body(asset: StaticAsset) -> bytes:
+    # Builds without precompressed siblings (e.g. plain `npm run build`) pay this once per asset.
+    if asset.gzip_body is None:
+        with _gzip_lock:
+            if asset.gzip_body is None:
+                asset.gzip_body = gzip.compress(asset.path.read_bytes(), mtime=0)
+    return asset.gzip_body
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    candidates = {candidate.strip().removeprefix("W/") for candidate in if_none_match.split(",")}
+    return "*" in candidates or etag in candidates
+
+
+def serve_static_asset(request: Request, asset: StaticAsset) -> Response:
+    accepted = _accepted_encodings(request.headers.get("accept-encoding", "")) if asset.compressible else set()
+    encoding = next((name for name in ENCODING_PREFERENCE if name in accepted and name in asset.variants), None)
+    if encoding is None and "gzip" in accepted:
+        encoding = "gzip"
+
+    etag = f'"{asset.etag}-{encoding}"' if encoding else f'"{asset.etag}"'
+    headers = {
+        "ETag": etag,
+        "Cache-Control": IMMUTABLE_CACHE_CONTROL if asset.immutable else REVALIDATE_CACHE_CONTROL
+    }
+    if asset.compressible:
+        headers["Vary"] = "Accept-Encoding"
+    if _etag_matches(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    if encoding is None:
+        return FileResponse(asset.path, media_type=asset.media_type, headers=headers)
+    headers["Content-Encoding"] = encoding
+    if encoding in asset.variants:
+        return FileResponse(asset.variants[encoding], media_type=asset.media_type, headers=headers)
+    return Response(_gzip_body(asset), media_type=asset.media_type, headers=headers)
+
+
+def precompress_static_assets(dist_dir: Path) -> int:
+    try:
+        import brotli
+    except ImportError:
+        brotli = None
+
+    written = 0
+    for path in sorted(dist_dir.rglob("*")):
+        if not path.is_file() or path.suffix in {".br", ".gz"}:
+            continue
+        if not _is_compressible(path, path.stat().st_size):
+            continue
+        body = path.read_bytes()
+        path.with_name(path.name + ".gz").write_bytes(gzip.compress(body, compresslevel=9, mtime=0))
+        written += 1
+        if brotli is not None:
+            path.with_name(path.name + ".br").write_bytes(brotli.compress(body, quality=11))
+            written += 1
+    return written
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m app.static_assets")
+    parser.add_argument("command", choices=["precompress"])
+    parser.add_argument("dist_dir", nargs="?", type=Path, default=Path(__file__).resolve().parents[2] / "frontend" / "dist")
+    args = parser.parse_args()
+
+    written = precompress_static_assets(args.dist_dir)
+    print(f"Wrote {written} precompressed files under {args.dist_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+from collections import defaultdict
+from typing import Iterable, Literal, Optional
+
+from sqlalchemy import case, func
+from sqlmodel import Session, select
+
+from .filters import RecordFilters, apply_record_filters
+from .models import MatchRecord, WinRateBreakdown, WinRateBreakdownGroup
+
+BreakdownDimension = Literal[
+    "rule",
+    "season",
+    "stage",
+    "my_character",
+    "my_partner_character",
+    "opponent_character",
+    "opponent_partner_character",
+    "my_racket",
+    "my_partner_racket",
+    "opponent_racket",
+    "opponent_partner_racket",
+    "my_rate_band",
+    "opponent_rate_band",
+    "result"
+]
+BreakdownGrouping = Literal["joint", "sets"]
+
+WIN_COUNT_EXPRESSION = func.sum(case((MatchRecord.result == "WIN", 1), else_=0))
+
+
+def compute_win_rate(total: int, wins: int) -> Optional[float]:
+    if total <= 0:
+        return None
+    return wins / total * 100
+
+
+def _breakdown_group(values: dict[str, Optional[str]], total: int, wins: int) -> WinRateBreakdownGroup:
+    return WinRateBreakdownGroup(values=values, total=total, wins=wins, win_rate=compute_win_rate(total, wins))
+
+
+def _sorted_groups(groups: list[WinRateBreakdownGroup]) -> list[WinRateBreakdownGroup]:
+    return sorted(groups, key=lambda group: group.total, reverse=True)
+
+
+def build_win_rate_breakdown(
+    dimensions: list[BreakdownDimension],
+    group_counts: Iterable[tuple[dict[str, Optional[str]], int, int]],
+    grouping: BreakdownGrouping = "joint"
+) -> WinRateBreakdown:
+    groups: list[WinRateBreakdownGroup] = []
+    set_totals: dict[str, dict[Optional[str], list[int]]] = {
+        dimension: defaultdict(lambda: [0, 0]) for dimension in dimensions
+    }
+    total = 0
+    wins = 0
+    # Like GROUPING SETS, the sets grouping answers with one list per dimension and no joint groups.
+    for values, group_total, group_wins in group_counts:
+        total += group_total
+        wins += group_wins
+        if grouping == "joint":
+            groups.append(_breakdown_group(values, group_total, group_wins))
+            continue
+        for dimension, value in values.items():
+            counts = set_totals[dimension][value]
+            counts[0] += group_total
+            counts[1] += group_wins
+
+    set_counts = {}
+    if grouping == "sets":
+        set_counts = {
+            dimension: [(value, counts[0], counts[1]) for value, counts in value_counts.items()]
+            for dimension, value_counts in set_totals.items()
+        }
+    return build_win_rate_set_breakdown(dimensions, total, wins, set_counts, groups)
+
+
+def build_win_rate_set_breakdown(
+    dimensions: list[BreakdownDimension],
+    total: int,
+    wins: int,
+    set_counts: dict[str, Iterable[tuple[Optional[str], int, int]]],
+    groups: Optional[list[WinRateBreakdownGroup]] = None
+) -> WinRateBreakdown:
+    return WinRateBreakdown(
+        dimensions=dimensions,
+        total=total,
+        wins=wins,
+        win_rate=compute_win_rate(total, wins),
+        groups=_sorted_groups(groups or []),
+        sets={
+            dimension: _sorted_groups([
+                _breakdown_group({dimension: value}, value_total, value_wins)
+                for value, value_total, value_wins in counts
+            ])
+            for dimension, counts in set_counts.items()
+        }
+    )
+
+
+def compute_win_rate_breakdown(
+    session: Session,
+    dimensions: list[BreakdownDimension],
+    filters: RecordFilters,
+    grouping: BreakdownGrouping = "joint"
+) -> WinRateBreakdown:
+    dimensions = list(dict.fromkeys(dimensions))
+    columns = [getattr(MatchRecord, dimension) for dimension in dimensions]
+    statement = apply_record_filters(
+        select(*columns, func.count(), WIN_COUNT_EXPRESSION),
+        filters
+    ).group_by(*columns)
+    group_counts = (
+        (dict(zip(dimensions, row[:-2])), int(row[-2]), int(row[-1] or 0))
+        for row in session.exec(statement).all()
+    )
+    return build_win_rate_breakdown(dimensions, group_counts, grouping)
@@ -0,0 +1,171 @@
+from itertools import groupby
+from typing import Literal, Sequence, TypeVar
+
+from sqlalchemy import func
+from sqlmodel import Session, select
+
+from .filters import RecordFilters, apply_record_filters
+from .models import DailyRateCandle, MatchRecord, RateDelta, RateTrendPoint, RateTrendSeries
+
+RateTrendGranularity = Literal["match", "daily"]
+
+PointT = TypeVar("PointT", bound=RateTrendPoint)
+
+PLAYED_DATE_EXPRESSION = func.date(MatchRecord.played_at)
+
+
+def downsample_lttb(points: Sequence[PointT], threshold: int) -> list[PointT]:
+    if threshold >= len(points) or threshold < 3:
+        return list(points)
+
+    xs = [point.played_at.timestamp() for point in points]
+    ys = [float(point.rate) for point in points]
+    sampled = [points[0]]
+    bucket_size = (len(points) - 2) / (threshold - 2)
+    selected_index = 0
+
+    for bucket in range(threshold - 2):
+        next_start = int((bucket + 1) * bucket_size) + 1
+        next_end = min(int((bucket + 2) * bucket_size) + 1, len(points))
+        average_x = sum(xs[next_start:next_end]) / (next_end - next_start)
+        average_y = sum(ys[next_start:next_end]) / (next_end - next_start)
+
+        range_start = int(bucket * bucket_size) + 1
+        range_end = next_start
+        selected_x = xs[selected_index]
+        selected_y = ys[selected_index]
+        max_area = -1.0
+        next_selected_index = range_start
+        for index in range(range_start, range_end):
+            area = abs(
+                (selected_x - average_x) * (ys[index] - selected_y)
+                - (selected_x - xs[index]) * (average_y - selected_y)
+            )
+            if area > max_area:
+                max_area = area
+                next_selected_index = index
+
+        sampled.append(points[next_selected_index])
+        selected_index = next_selected_index
+
+    sampled.append(points[-1])
+    return sampled
+
+
+def compute_rate_trend(
+    session: Session,
+    filters: RecordFilters,
+    granularity: RateTrendGranularity = "match",
+    max_points: int | None = None
+) -> list[RateTrendSeries]:
+    columns = [
+        MatchRecord.rule,
+        MatchRecord.id,
+        MatchRecord.played_at,
+        MatchRecord.my_rate,
+        MatchRecord.my_rate_band,
+        MatchRecord.season,
+        PLAYED_DATE_EXPRESSION.label("played_date")
+    ]
+    if granularity == "daily":
+        day_rank = func.row_number().over(
+            partition_by=(MatchRecord.rule, PLAYED_DATE_EXPRESSION),
+            order_by=(MatchRecord.played_at.desc(), MatchRecord.id.desc())
+        )
+        ranked = apply_record_filters(select(*columns, day_rank.label("day_rank")), filters).subquery()
+        statement = select(*[ranked.c[column.key] for column in columns]).where(ranked.c.day_rank == 1)
+        source = ranked.c
+    else:
+        statement = apply_record_filters(select(*columns), filters)
+        source = MatchRecord
+    statement = statement.order_by(source.rule, source.played_at, source.id)
+
+    series: list[RateTrendSeries] = []
+    for rule, rows in groupby(session.exec(statement).all(), key=lambda row: row[0]):
+        points = [
+            RateTrendPoint(
+                id=row[1],
+                played_at=row[2],
+                rate=row[3],
+                rate_band=row[4].strip(),
+                season=row[5],
+                date=row[6] if granularity == "daily" else None
+            )
+            for row in rows
+        ]
+        total_points = len(points)
+        if max_points is not None:
+            points = downsample_lttb(points, max_points)
+        series.append(RateTrendSeries(rule=rule, total_points=total_points, points=points))
+    return series
+
+
+def compute_daily_rate_candles(session: Session, filters: RecordFilters) -> list[DailyRateCandle]:
+    day_partition = (MatchRecord.rule, PLAYED_DATE_EXPRESSION)
+    ascending = (MatchRecord.played_at, MatchRecord.id)
+    descending = (MatchRecord.played_at.desc(), MatchRecord.id.desc())
+    windowed = apply_record_filters(
+        select(
+            MatchRecord.rule,
+            PLAYED_DATE_EXPRESSION.label("date"),
+            func.first_value(MatchRecord.my_rate).over(partition_by=day_partition, order_by=ascending).label("open"),
+            func.first_value(MatchRecord.my_rate).over(partition_by=day_partition, order_by=descending).label("close"),
+            func.max(MatchRecord.my_rate).over(partition_by=day_partition).label("high"),
+            func.min(MatchRecord.my_rate).over(partition_by=day_partition).label("low"),
+            func.count().over(partition_by=day_partition).label("matches"),
+            func.row_number().over(partition_by=day_partition, order_by=ascending).label("day_rank")
+        ),
+        filters
+    ).subquery()
+    statement = (
+        select(
+            windowed.c.rule,
+            windowed.c.date,
+            windowed.c.open,
+            windowed.c.high,
+            windowed.c.low,
+            windowed.c.close,
+            windowed.c.matches
+        )
+        .where(windowed.c.day_rank == 1)
+        .order_by(windowed.c.rule, windowed.c.date)
+    )
+    return [
+        DailyRateCandle(
+            rule=row[0],
+            date=row[1],
+            open=row[2],
+            high=row[3],
+            low=row[4],
+            close=row[5],
+            matches=row[6]
+        )
+        for row in session.exec(statement).all()
+    ]
+
+
+def compute_rate_deltas(session: Session, rule: list[str], season: list[str]) -> list[RateDelta]:
+    rule_order = {
+        "partition_by": MatchRecord.rule,
+        "order_by": (MatchRecord.played_at, MatchRecord.created_at, MatchRecord.id)
+    }
+    statement = select(
+        MatchRecord.id,
+        MatchRecord.my_rate,
+        MatchRecord.season,
+        func.lag(MatchRecord.my_rate).over(**rule_order),
+        func.lag(MatchRecord.season).over(**rule_order)
+    )
+    # Deltas never cross a rule or season boundary, so narrowing by either keeps them intact.
+    if rule:
+        statement = statement.where(MatchRecord.rule.in_(rule))
+    if season:
+        statement = statement.where(MatchRecord.season.in_(season))
+
+    return [
+        RateDelta(
+            id=row[0],
+            delta=row[1] - row[3] if row[3] is not None and row[4] == row[2] else None
+        )
+        for row in session.exec(statement).all()
+    ]
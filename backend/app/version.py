@@ -0,0 +1,82 @@
+import argparse
+import os
+import subprocess
+import sys
+from functools import cache
+from pathlib import Path
+
+PROJECT_ROOT_DIR = Path(__file__).resolve().parents[2]
+VERSION_MODULE_PATH = Path(__file__).resolve().parent / "_version.py"
+UNKNOWN_VERSION = "unknown"
+
+
+def _run_git(*args: str) -> str:
+    try:
+        result = subprocess.run(
+            ["git", "-C", str(PROJECT_ROOT_DIR), *args],
+            check=False,
+            capture_output=True,
+            text=True
+        )
+    except OSError:
+        return ""
+    return result.stdout.strip() if result.returncode == 0 else ""
+
+
+def _resolve_git_version() -> str:
+    tag = next((line.strip() for line in _run_git("tag", "--points-at", "HEAD").splitlines() if line.strip()), "")
+    if tag:
+        return tag
+
+    short_sha = _run_git("rev-parse", "--short", "HEAD")
+    latest_tag = _run_git("describe", "--tags", "--abbrev=0")
+    if latest_tag and short_sha:
+        return f"{latest_tag}+{short_sha}"
+    if short_sha:
+        return f"dev-{short_sha}"
+    return ""
+
+
+def _resolve_baked_version() -> str:
+    try:
+        from ._version import APP_VERSION
+    except ImportError:
+        return ""
+    return APP_VERSION
+
+
+@cache
+def resolve_app_version() -> str:
+    # Frozen bundles carry no git checkout, so they go straight to the version baked in by the build
+    # scripts; source checkouts ask git once so a stale _version.py never masks the working tree.
+    if getattr(sys, "frozen", False):
+        version = _resolve_baked_version()
+    else:
+        version = _resolve_git_version() or _resolve_baked_version()
+    return version or os.getenv("MFSTAT_APP_VERSION") or UNKNOWN_VERSION
+
+
+def write_version_module(version: str) -> Path:
+    VERSION_MODULE_PATH.write_text(
+        f"# Generated by `python -m app.version write` during builds; do not commit.\nAPP_VERSION = {version!r}\n",
+        encoding="utf-8"
+    )
+    return VERSION_MODULE_PATH
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m app.version")
+    parser.add_argument("command", choices=["show", "write"])
+    parser.add_argument("version", nargs="?", default=None)
+    args = parser.parse_args()
+
+    if args.command == "show":
+        print(resolve_app_version())
+        return
+
+    version = args.version or os.getenv("MFSTAT_APP_VERSION") or resolve_app_version()
+    print(f"Wrote {version} to {write_version_module(version)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+import argparse
+import json
+import sys
+from pathlib import Path
+
+DEFAULT_THRESHOLD = 0.1
+
+
+def _load_medians(path: Path) -> tuple[dict, dict[tuple[str, str], float]]:
+    report = json.loads(path.read_text(encoding="utf-8"))
+    medians = {(result["dataset"], result["case"]): result["median"] for result in report["results"]}
+    return report["meta"], medians
+
+
+def _describe(meta: dict) -> str:
+    revision = meta.get("git_revision") or "unknown"
+    return f"{revision}{'+dirty' if meta.get('git_dirty') else ''} ({meta.get('created_at')})"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.compare")
+    parser.add_argument("baseline", type=Path)
+    parser.add_argument("candidate", type=Path)
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="relative median slowdown reported as a regression (default: 0.1)"
+    )
+    args = parser.parse_args()
+
+    baseline_meta, baseline = _load_medians(args.baseline)
+    candidate_meta, candidate = _load_medians(args.candidate)
+    print(f"baseline:  {_describe(baseline_meta)}")
+    print(f"candidate: {_describe(candidate_meta)}")
+    print()
+    print(f"{'dataset':<8} {'case':<44} {'baseline ms':>12} {'candidate ms':>13} {'change':>8}")
+
+    regressions = 0
+    for key in sorted(baseline.keys() | candidate.keys()):
+        dataset, case = key
+        before = baseline.get(key)
+        after = candidate.get(key)
+        if before is None or after is None:
+            present = "candidate" if before is None else "baseline"
+            print(f"{dataset:<8} {case:<44} {'only in ' + present:>35}")
+            continue
+        change = (after - before) / before if before else 0.0
+        marker = ""
+        if change > args.threshold:
+            regressions += 1
+            marker = "  slower"
+        elif change < -args.threshold:
+            marker = "  faster"
+        print(f"{dataset:<8} {case:<44} {before * 1000:>12.2f} {after * 1000:>13.2f} {change:>+8.1%}{marker}")
+
+    if regressions:
+        print(f"\n{regressions} case(s) slower than the {args.threshold:.0%} threshold")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+import argparse
+import json
+import random
+import re
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Iterator
+
+OPTIONS_PATH = Path(__file__).resolve().parents[2] / "frontend" / "src" / "constants" / "options.ts"
+DEFAULT_SEED = 20250601
+DEFAULT_SPAN_DAYS = 730
+DEFAULT_START = datetime(2024, 1, 1, 19, 0)
+RATE_BAND_STEP = 100
+RATE_BAND_FLOOR = 1000
+RULE_WEIGHTS = {
+    "singles_fever_on": 40,
+    "singles_fever_off": 20,
+    "doubles_fever_on": 25,
+    "doubles_fever_off": 15
+}
+PLAYER_NAME_RATE = 0.6
+DATASET_SIZES = {"10k": 10_000, "100k": 100_000, "1m": 1_000_000}
+
+
+def parse_dataset_size(value: str) -> int:
+    normalized = value.strip().lower()
+    if normalized in DATASET_SIZES:
+        return DATASET_SIZES[normalized]
+    return int(normalized.replace("_", ""))
+
+
+def dataset_label(rows: int) -> str:
+    for label, size in DATASET_SIZES.items():
+        if size == rows:
+            return label
+    return str(rows)
+
+
+def _option_block(source: str, name: str) -> str:
+    match = re.search(rf"export const {name}\b[^=]*=\s*\[(.*?)\n\];", source, re.S)
+    if match is None:
+        raise ValueError(f"{name} not found in {OPTIONS_PATH}")
+    return match.group(1)
+
+
+def load_frontend_options(path: Path = OPTIONS_PATH) -> dict[str, list]:
+    source = path.read_text(encoding="utf-8")
+    rules = [
+        {"value": value, "is_doubles": is_doubles == "true", "has_fever_racket": has_fever_racket == "true"}
+        for value, is_doubles, has_fever_racket in re.findall(
+            r'value:\s*"([^"]+)".*?isDoubles:\s*(true|false),\s*hasFeverRacket:\s*(true|false)',
+            _option_block(source, "RULE_OPTIONS"),
+            re.S
+        )
+    ]
+    return {
+        "rules": rules,
+        "stages": re.findall(r'"([^"]+)"', _option_block(source, "STAGE_OPTIONS")),
+        "rate_bands": re.findall(r'"([^"]+)"', _option_block(source, "RATE_BAND_OPTIONS")),
+        "characters": re.findall(r'value:\s*"([^"]+)"', _option_block(source, "CHARACTER_OPTIONS")),
+        "rackets": re.findall(r'"([^"]+)"', _option_block(source, "RACKET_OPTIONS"))
+    }
+
+
+def _zipf_weights(count: int, exponent: float) -> list[float]:
+    return [1 / (rank + 1) ** exponent for rank in range(count)]
+
+
+def _shuffled(rng: random.Random, values: list[str]) -> list[str]:
+    values = list(values)
+    rng.shuffle(values)
+    return values
+
+
+def generate_records(
+    rows: int,
+    seed: int = DEFAULT_SEED,
+    span_days: int = DEFAULT_SPAN_DAYS,
+    start: datetime = DEFAULT_START,
+    options: dict[str, list] | None = None
+) -> Iterator[dict]:
+    # A single player's history: a few main characters and rackets, a popularity skew among
+    # opponents, recurring rivals and a rate that random-walks with results.
+    options = options or load_frontend_options()
+    rng = random.Random(seed)
+    rules = {rule["value"]: rule for rule in options["rules"]}
+    rule_values = [value for value in RULE_WEIGHTS if value in rules]
+    rule_weights = [RULE_WEIGHTS[value] for value in rule_values]
+    stages = options["stages"]
+    rate_bands = options["rate_bands"]
+    my_characters = _shuffled(rng, options["characters"])
+    my_character_weights = _zipf_weights(len(my_characters), 1.6)
+    characters = _shuffled(rng, options["characters"])
+    character_weights = _zipf_weights(len(characters), 0.7)
+    my_rackets = _shuffled(rng, options["rackets"])
+    my_racket_weights = _zipf_weights(len(my_rackets), 1.4)
+    rackets = _shuffled(rng, options["rackets"])
+    racket_weights = _zipf_weights(len(rackets), 0.6)
+    player_names = [f"Player{index:05d}" for index in range(max(50, int(rows ** 0.5) * 4))]
+    player_name_weights = _zipf_weights(len(player_names), 1.1)
+
+    def pick(values: list[str], weights: list[float]) -> str:
+        return rng.choices(values, weights)[0]
+
+    def player_name() -> str | None:
+        return pick(player_names, player_name_weights) if rng.random() < PLAYER_NAME_RATE else None
+
+    def rate_band(rate: int) -> str:
+        index = (rate - RATE_BAND_FLOOR) // RATE_BAND_STEP
+        return rate_bands[min(max(index, 0), len(rate_bands) - 1)]
+
+    def nearby_rate_band(band: str) -> str:
+        index = rate_bands.index(band) + rng.choice((-1, 0, 0, 0, 1))
+        return rate_bands[min(max(index, 0), len(rate_bands) - 1)]
+
+    mean_gap_seconds = span_days * 86400 / max(rows, 1)
+    played_at = start
+    my_rate = 1500
+    for _ in range(rows):
+        played_at += timedelta(seconds=max(1, int(rng.expovariate(1 / mean_gap_seconds))))
+        rule = rules[pick(rule_values, rule_weights)]
+        is_doubles = rule["is_doubles"]
+        has_fever_racket = rule["has_fever_racket"]
+        my_rate_band = rate_band(my_rate)
+        opponent_rate_band = nearby_rate_band(my_rate_band)
+        band_gap = rate_bands.index(my_rate_band) - rate_bands.index(opponent_rate_band)
+        won = rng.random() < 0.5 + 0.08 * band_gap
+        losing_score = rng.randint(0, 6)
+        winning_score = 8 if losing_score == 6 else 7
+
+        yield {
+            "played_at": played_at.isoformat(),
+            "rule": rule["value"],
+            "stage": rng.choice(stages),
+            "my_score": winning_score if won else losing_score,
+            "opponent_score": losing_score if won else winning_score,
+            "my_character": pick(my_characters, my_character_weights),
+            "my_partner_character": pick(characters, character_weights) if is_doubles else None,
+            "opponent_character": pick(characters, character_weights),
+            "opponent_partner_character": pick(characters, character_weights) if is_doubles else None,
+            "my_racket": pick(my_rackets, my_racket_weights) if has_fever_racket else None,
+            "my_partner_racket": pick(rackets, racket_weights) if has_fever_racket and is_doubles else None,
+            "opponent_racket": pick(rackets, racket_weights) if has_fever_racket else None,
+            "opponent_partner_racket": pick(rackets, racket_weights) if has_fever_racket and is_doubles else None,
+            "my_rate": my_rate,
+            "my_rate_band": my_rate_band,
+            "my_partner_rate_band": nearby_rate_band(my_rate_band) if is_doubles else None,
+            "opponent_rate_band": opponent_rate_band,
+            "opponent_partner_rate_band": nearby_rate_band(my_rate_band) if is_doubles else None,
+            "opponent_player_name": player_name(),
+            "my_partner_player_name": player_name() if is_doubles else None,
+            "opponent_partner_player_name": player_name() if is_doubles else None
+        }
+        my_rate = max(0, my_rate + (rng.randint(10, 30) if won else -rng.randint(10, 30)))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.dataset")
+    parser.add_argument("rows", type=parse_dataset_size, help="row count, or one of 10k / 100k / 1m")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--span-days", type=int, default=DEFAULT_SPAN_DAYS)
+    args = parser.parse_args()
+
+    for record in generate_records(args.rows, args.seed, args.span_days):
+        sys.stdout.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,385 @@
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import shutil
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from itertools import islice
+from pathlib import Path
+
+from .dataset import DEFAULT_SEED, dataset_label, generate_records, parse_dataset_size
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+BENCHMARKS_DIR = Path(__file__).resolve().parent
+DEFAULT_CACHE_DIR = BENCHMARKS_DIR / ".cache"
+DEFAULT_RESULTS_DIR = BENCHMARKS_DIR / "results"
+DEFAULT_SIZES = "10k,100k"
+DEFAULT_REPEAT = 5
+DEFAULT_WARMUP = 1
+SEED_CHUNK_ROWS = 5000
+BULK_WRITE_ROWS = 1000
+BATCH_MUTATION_ROWS = 100
+BASE_URL = "http://mfstat.bench"
+
+
+def _git_revision() -> str | None:
+    result = subprocess.run(
+        ["git", "-C", str(BACKEND_DIR), "rev-parse", "--short", "HEAD"],
+        check=False,
+        capture_output=True,
+        text=True
+    )
+    if result.returncode != 0:
+        return None
+    return result.stdout.strip() or None
+
+
+def _git_dirty() -> bool:
+    result = subprocess.run(
+        ["git", "-C", str(BACKEND_DIR), "status", "--porcelain", "--untracked-files=no"],
+        check=False,
+        capture_output=True,
+        text=True
+    )
+    return result.returncode == 0 and bool(result.stdout.strip())
+
+
+def _summarize(runs: list[float]) -> dict:
+    return {
+        "runs": runs,
+        "min": min(runs),
+        "median": statistics.median(runs),
+        "mean": statistics.fmean(runs),
+        "max": max(runs)
+    }
+
+
+def _worker_env(data_dir: Path, record_cache: bool) -> dict[str, str]:
+    env = dict(os.environ)
+    env["MFSTAT_DATA_DIR"] = str(data_dir)
+    env["MFSTAT_RECORD_CACHE"] = "1" if record_cache else "0"
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(BACKEND_DIR), env.get("PYTHONPATH")]))
+    return env
+
+
+def _run_worker(command: str, data_dir: Path, record_cache: bool, *arguments: str) -> list[dict]:
+    # The app binds its engines to MFSTAT_DATA_DIR at import time, so every database gets a fresh process;
+    # that also keeps import and init_db timings cold.
+    with tempfile.NamedTemporaryFile(suffix=".json", delete=False) as result_file:
+        result_path = Path(result_file.name)
+    try:
+        subprocess.run(
+            [sys.executable, "-m", "benchmarks.run", command, "--result-file", str(result_path), *arguments],
+            check=True,
+            cwd=BACKEND_DIR,
+            env=_worker_env(data_dir, record_cache)
+        )
+        return json.loads(result_path.read_text(encoding="utf-8"))
+    finally:
+        result_path.unlink(missing_ok=True)
+
+
+def _schema_head_revision() -> str:
+    versions = sorted((BACKEND_DIR / "alembic" / "versions").glob("*.py"))
+    return versions[-1].name.split("_", 1)[0]
+
+
+def ensure_dataset(rows: int, seed: int, cache_dir: Path) -> Path:
+    cached_path = cache_dir / f"mfstat-{rows}-{seed}-{_schema_head_revision()}.db"
+    if cached_path.exists():
+        return cached_path
+
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    with tempfile.TemporaryDirectory() as data_dir:
+        print(f"Seeding {rows} rows (seed {seed})...", file=sys.stderr)
+        _run_worker("_seed", Path(data_dir), False, "--rows", str(rows), "--seed", str(seed))
+        shutil.move(str(Path(data_dir) / "mfstat.db"), cached_path)
+    return cached_path
+
+
+def run_benchmarks(
+    sizes: list[int],
+    seed: int,
+    repeat: int,
+    warmup: int,
+    record_cache: bool,
+    cache_dir: Path
+) -> list[dict]:
+    results = []
+    with tempfile.TemporaryDirectory() as data_dir:
+        for result in _run_worker("_empty", Path(data_dir), record_cache):
+            results.append({"dataset": "empty", "rows": 0, **result})
+
+    for rows in sizes:
+        dataset_path = ensure_dataset(rows, seed, cache_dir)
+        with tempfile.TemporaryDirectory() as data_dir:
+            shutil.copy2(dataset_path, Path(data_dir) / "mfstat.db")
+            print(f"Benchmarking {dataset_label(rows)}...", file=sys.stderr)
+            for result in _run_worker(
+                "_suite",
+                Path(data_dir),
+                record_cache,
+                "--rows",
+                str(rows),
+                "--seed",
+                str(seed),
+                "--repeat",
+                str(repeat),
+                "--warmup",
+                str(warmup)
+            ):
+                results.append({"dataset": dataset_label(rows), "rows": rows, **result})
+    return results
+
+
+def _timed(function, *args) -> tuple[float, object]:
+    started_at = time.perf_counter()
+    value = function(*args)
+    return time.perf_counter() - started_at, value
+
+
+async def _seed_dataset(rows: int, seed: int) -> list[dict]:
+    import httpx
+
+    from app.database import engine, init_db
+    from app.main import app
+
+    init_db()
+
+    async def chunks():
+        lines = []
+        for record in generate_records(rows, seed):
+            lines.append(json.dumps(record, ensure_ascii=False))
+            if len(lines) >= SEED_CHUNK_ROWS:
+                yield ("\n".join(lines) + "\n").encode()
+                lines = []
+        if lines:
+            yield ("\n".join(lines) + "\n").encode()
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url=BASE_URL, timeout=None) as client:
+        response = await client.post(
+            "/records/bulk",
+            content=chunks(),
+            headers={"content-type": "application/x-ndjson"}
+        )
+    response.raise_for_status()
+    report = response.json()
+    if report["inserted"] != rows:
+        raise RuntimeError(f"Seeding inserted {report['inserted']} of {rows} rows: {report['errors'][:5]}")
+    engine.dispose()
+    with sqlite3.connect(Path(os.environ["MFSTAT_DATA_DIR"]) / "mfstat.db") as connection:
+        connection.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        connection.execute("ANALYZE")
+    return []
+
+
+def _measure_empty() -> list[dict]:
+    import_seconds, _ = _timed(__import__, "app.main")
+    from app.database import init_db
+
+    init_seconds, _ = _timed(init_db)
+    return [
+        {"case": "import app.main", **_summarize([import_seconds])},
+        {"case": "init_db (migrate empty database)", **_summarize([init_seconds])}
+    ]
+
+
+async def _measure_suite(rows: int, seed: int, repeat: int, warmup: int) -> list[dict]:
+    import_seconds, _ = _timed(__import__, "app.main")
+    import httpx
+
+    from app.database import init_db
+    from app.main import app
+    from app.record_store import RECORD_STORE, sync_record_store
+
+    results = [{"case": "import app.main", **_summarize([import_seconds])}]
+    init_seconds, _ = _timed(init_db)
+    results.append({"case": "init_db (up to date)", **_summarize([init_seconds])})
+    if RECORD_STORE is not None:
+        load_seconds, _ = _timed(sync_record_store)
+        results.append({"case": "record store load", **_summarize([load_seconds])})
+
+    rng = random.Random(seed)
+    # The generator is deterministic, so a prefix of the seeded history yields values that exist in the data.
+    history = list(islice(generate_records(rows, seed), 2000))
+    season = datetime.fromisoformat(history[-1]["played_at"]).strftime("%Y/%m")
+    character = history[0]["my_character"]
+    stage = history[0]["stage"]
+    player_name = next(record["opponent_player_name"] for record in history if record["opponent_player_name"])
+    write_start = datetime(2100, 1, 1)
+    write_records = iter(generate_records(10 ** 7, seed + 1, start=write_start))
+
+    def next_write_record() -> dict:
+        return next(write_records)
+
+    live_ids = list(range(1, rows + 1))
+
+    def existing_ids(count: int) -> list[int]:
+        return rng.sample(live_ids, min(count, len(live_ids)))
+
+    def take_ids(count: int) -> list[int]:
+        # Batch deletes are all-or-nothing, so an id must never be picked again once a case deleted it.
+        taken = []
+        for _ in range(min(count, len(live_ids))):
+            index = rng.randrange(len(live_ids))
+            live_ids[index], live_ids[-1] = live_ids[-1], live_ids[index]
+            taken.append(live_ids.pop())
+        return taken
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url=BASE_URL, timeout=None) as client:
+
+        async def measure(case: str, request_factory, iterations: int = repeat, warmups: int = warmup) -> None:
+            runs = []
+            response_bytes = 0
+            for iteration in range(warmups + iterations):
+                method, path, kwargs = request_factory()
+                started_at = time.perf_counter()
+                response = await client.request(method, path, **kwargs)
+                elapsed = time.perf_counter() - started_at
+                if response.status_code >= 400:
+                    raise RuntimeError(f"{case}: {method} {path} returned {response.status_code}: {response.text[:200]}")
+                if iteration >= warmups:
+                    runs.append(elapsed)
+                    response_bytes = len(response.content)
+            results.append({"case": case, "response_bytes": response_bytes, **_summarize(runs)})
+
+        def get(path: str):
+            return lambda: ("GET", path, {})
+
+        read_cases = {
+            "GET /records": "/records",
+            "GET /records?format=columnar": "/records?format=columnar",
+            "GET /records?limit=100": "/records?limit=100",
+            "GET /records?limit=100 filtered": f"/records?limit=100&my_character={character}&season={season}",
+            "GET /records/changes": f"/records/changes?since={max(0, rows // SEED_CHUNK_ROWS - 1)}",
+            "GET /records/facets": "/records/facets",
+            "GET /records/facets filtered": f"/records/facets?stage={stage}&my_character={character}",
+            "GET /stats/breakdown my_character": "/stats/breakdown?group_by=my_character",
+            "GET /stats/breakdown sets": "/stats/breakdown?group_by=stage&group_by=opponent_character&grouping=sets",
+            "GET /stats/rollups": "/stats/rollups",
+            "GET /stats/rivals": "/stats/rivals",
+            "GET /stats/rate-trend": "/stats/rate-trend",
+            "GET /stats/rate-trend daily": "/stats/rate-trend?granularity=daily",
+            "GET /stats/rate-candles": "/stats/rate-candles",
+            "GET /stats/rate-deltas": f"/stats/rate-deltas?season={season}",
+            "GET /search": f"/search?q={player_name}",
+            "GET /players/suggest": f"/players/suggest?prefix={player_name[:-2]}"
+        }
+        for case, path in read_cases.items():
+            await measure(case, get(path))
+
+        await measure(
+            "POST /records",
+            lambda: ("POST", "/records", {"json": next_write_record()})
+        )
+        updated_ids = iter(existing_ids(repeat + warmup))
+        await measure(
+            "PUT /records/{id}",
+            lambda: ("PUT", f"/records/{next(updated_ids)}", {"json": {"stage": stage, "my_score": 7, "opponent_score": 3}})
+        )
+        deleted_ids = iter(take_ids(repeat + warmup))
+        await measure("DELETE /records/{id}", lambda: ("DELETE", f"/records/{next(deleted_ids)}", {}))
+        await measure(
+            f"POST /records/bulk ({BULK_WRITE_ROWS} rows)",
+            lambda: (
+                "POST",
+                "/records/bulk",
+                {
+                    "content": "\n".join(
+                        json.dumps(next_write_record(), ensure_ascii=False) for _ in range(BULK_WRITE_ROWS)
+                    ).encode(),
+                    "headers": {"content-type": "application/x-ndjson"}
+                }
+            )
+        )
+        await measure(
+            f"PATCH /records ({BATCH_MUTATION_ROWS} ids)",
+            lambda: (
+                "PATCH",
+                "/records",
+                {"json": {"ids": existing_ids(BATCH_MUTATION_ROWS), "changes": {"stage": stage}}}
+            )
+        )
+        await measure(
+            f"DELETE /records ({BATCH_MUTATION_ROWS} ids)",
+            lambda: ("DELETE", "/records", {"json": {"ids": take_ids(BATCH_MUTATION_ROWS)}})
+        )
+    return results
+
+
+def _write_worker_result(path: Path, results: list[dict]) -> None:
+    path.write_text(json.dumps(results), encoding="utf-8")
+
+
+def _default_output_path(revision: str | None) -> Path:
+    timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+    return DEFAULT_RESULTS_DIR / f"{timestamp}-{revision or 'unknown'}.json"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.run")
+    subparsers = parser.add_subparsers(dest="command")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help="comma separated row counts, e.g. 10k,100k,1m")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    parser.add_argument("--warmup", type=int, default=DEFAULT_WARMUP)
+    parser.add_argument("--record-cache", action="store_true", help="serve reads from the in-memory record store")
+    parser.add_argument("--cache-dir", type=Path, default=DEFAULT_CACHE_DIR)
+    parser.add_argument("--output", type=Path, default=None)
+
+    for command in ("_seed", "_empty", "_suite"):
+        worker = subparsers.add_parser(command)
+        worker.add_argument("--result-file", type=Path, required=True)
+        worker.add_argument("--rows", type=int, default=0)
+        worker.add_argument("--seed", type=int, default=DEFAULT_SEED)
+        worker.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+        worker.add_argument("--warmup", type=int, default=DEFAULT_WARMUP)
+    args = parser.parse_args()
+
+    if args.command == "_seed":
+        _write_worker_result(args.result_file, asyncio.run(_seed_dataset(args.rows, args.seed)))
+        return
+    if args.command == "_empty":
+        _write_worker_result(args.result_file, _measure_empty())
+        return
+    if args.command == "_suite":
+        _write_worker_result(
+            args.result_file,
+            asyncio.run(_measure_suite(args.rows, args.seed, args.repeat, args.warmup))
+        )
+        return
+
+    sizes = [parse_dataset_size(size) for size in args.sizes.split(",") if size.strip()]
+    revision = _git_revision()
+    results = run_benchmarks(sizes, args.seed, args.repeat, args.warmup, args.record_cache, args.cache_dir)
+    report = {
+        "meta": {
+            "created_at": datetime.now().astimezone().isoformat(timespec="seconds"),
+            "git_revision": revision,
+            "git_dirty": _git_dirty(),
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "platform": platform.platform(),
+            "seed": args.seed,
+            "repeat": args.repeat,
+            "warmup": args.warmup,
+            "record_cache": args.record_cache
+        },
+        "results": results
+    }
+    output_path = args.output or _default_output_path(revision)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    output_path.write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+    print(f"Wrote {len(results)} results to {output_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,33 +1,83 @@
+import time
+
+STARTUP_STARTED_AT = time.perf_counter()
+
 import os
 import socket
+import sys
 import threading
-import time
-from urllib.error import URLError
-from urllib.request import urlopen
 
 import uvicorn
-import webview
-
-from app.main import app
 
 HOST = "127.0.0.1"
 DEFAULT_PORT = 8000
+SERVER_START_TIMEOUT_SECONDS = 20
 WINDOW_TITLE = "MFStat"
 WINDOW_WIDTH = 1280
 WINDOW_HEIGHT = 820
 WINDOW_MIN_WIDTH = 1024
 WINDOW_MIN_HEIGHT = 680
+LOADING_HTML = (
+    "<!doctype html><html><body style=\"margin:0;display:flex;align-items:center;justify-content:center;"
+    "height:100vh;font-family:sans-serif;color:#666\">MFStat を起動しています…</body></html>"
+)
+
 
+class StartupTimer:
+    def __init__(self) -> None:
+        self.enabled = os.getenv("MFSTAT_STARTUP_TIMING", "").strip().lower() in {"1", "true", "yes", "on"}
+        configured_budget = os.getenv("MFSTAT_STARTUP_BUDGET_MS")
+        self.budget_ms = float(configured_budget) if configured_budget else None
+        self._marked: set[str] = set()
+        self._lock = threading.Lock()
 
-def _wait_for_server(url: str, timeout_seconds: float) -> bool:
-    deadline = time.time() + timeout_seconds
-    while time.time() < deadline:
+    def mark(self, phase: str) -> None:
+        with self._lock:
+            if not self.enabled or phase in self._marked:
+                return
+            self._marked.add(phase)
+        elapsed_ms = (time.perf_counter() - STARTUP_STARTED_AT) * 1000
+        print(f"[startup] {elapsed_ms:8.1f} ms  {phase}", file=sys.stderr, flush=True)
+
+    def check_budget(self, phase: str) -> None:
+        elapsed_ms = (time.perf_counter() - STARTUP_STARTED_AT) * 1000
+        if self.budget_ms is not None and elapsed_ms > self.budget_ms:
+            print(
+                f"[startup] {phase} took {elapsed_ms:.1f} ms, over the {self.budget_ms:.0f} ms budget",
+                file=sys.stderr,
+                flush=True
+            )
+
+
+class ReadyServer(uvicorn.Server):
+    def __init__(self, config: uvicorn.Config, timer: StartupTimer) -> None:
+        super().__init__(config)
+        self.ready = threading.Event()
+        self.timer = timer
+
+    async def startup(self, sockets=None) -> None:
+        self.timer.mark("app imported, running startup")
+        await super().startup(sockets=sockets)
+        self.timer.mark("server listening")
+
+    def run(self, sockets=None) -> None:
         try:
-            with urlopen(url, timeout=1):
-                return True
-        except URLError:
-            time.sleep(0.1)
-    return False
+            super().run(sockets=sockets)
+        finally:
+            self.ready.set()
+
+    async def main_loop(self) -> None:
+        # uvicorn enters the main loop only after startup succeeded; a failed startup exits run() instead.
+        self.ready.set()
+        await super().main_loop()
+
+
+def _create_app():
+    # Imported on the server thread so the window can open while FastAPI, SQLModel and the
+    # migrations load.
+    from app.main import app
+
+    return app
 
 
 def _resolve_port() -> int:
@@ -44,37 +94,65 @@ def _resolve_port() -> int:
 
 
 def main() -> None:
+    timer = StartupTimer()
     port = _resolve_port()
     config = uvicorn.Config(
-        app,
+        _create_app,
+        factory=True,
         host=HOST,
         port=port,
         access_log=False,
         log_level="warning"
     )
-    server = uvicorn.Server(config)
+    server = ReadyServer(config, timer)
     server_thread = threading.Thread(target=server.run, daemon=True)
     server_thread.start()
+    timer.mark("server thread started")
 
-    if not _wait_for_server(f"http://{HOST}:{port}/health", timeout_seconds=20):
-        server.should_exit = True
-        server_thread.join(timeout=3)
-        raise RuntimeError("Local API server failed to start.")
+    import webview
 
-    webview.create_window(
+    timer.mark("webview imported")
+    window = webview.create_window(
         WINDOW_TITLE,
-        f"http://{HOST}:{port}",
+        html=LOADING_HTML,
         width=WINDOW_WIDTH,
         height=WINDOW_HEIGHT,
         min_size=(WINDOW_MIN_WIDTH, WINDOW_MIN_HEIGHT)
     )
+    app_url = f"http://{HOST}:{port}"
+    startup_failed = threading.Event()
+    app_requested = threading.Event()
+
+    def on_shown() -> None:
+        timer.mark("window shown")
+        timer.check_budget("first window")
+
+    def on_loaded() -> None:
+        if app_requested.is_set():
+            timer.mark("app page loaded")
+            timer.check_budget("app page load")
+
+    def load_app() -> None:
+        if not server.ready.wait(SERVER_START_TIMEOUT_SECONDS) or not server.started:
+            startup_failed.set()
+            window.destroy()
+            return
+        timer.mark("server ready")
+        app_requested.set()
+        window.load_url(app_url)
+
+    window.events.shown += on_shown
+    window.events.loaded += on_loaded
 
     try:
-        webview.start()
+        webview.start(load_app)
     finally:
         server.should_exit = True
         server_thread.join(timeout=5)
 
+    if startup_failed.is_set():
+        raise RuntimeError("Local API server failed to start.")
+
 
 if __name__ == "__main__":
     main()
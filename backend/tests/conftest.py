@@ -0,0 +1,50 @@
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+# The app resolves its database path at import time, so the test data dir must be set first.
+os.environ["MFSTAT_DATA_DIR"] = tempfile.mkdtemp(prefix="mfstat-tests-")
+
+
+def run_backend(code: str, data_dir: Path, **env: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=BACKEND_DIR,
+        env={**os.environ, "MFSTAT_DATA_DIR": str(data_dir), **env},
+        capture_output=True,
+        text=True,
+        check=True
+    )
+
+
+@pytest.fixture(scope="session")
+def client():
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+def make_record(**overrides) -> dict:
+    record = {
+        "played_at": "2025-05-01T12:00:00",
+        "rule": "singles",
+        "stage": "Court",
+        "my_score": 7,
+        "opponent_score": 3,
+        "my_character": "Mario",
+        "opponent_character": "Luigi",
+        "my_rate": 1500,
+        "my_rate_band": "A",
+        "opponent_rate_band": "B"
+    }
+    record.update(overrides)
+    return record
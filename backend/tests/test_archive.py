@@ -0,0 +1,78 @@
+import json
+import os
+import subprocess
+import sys
+
+import app.database
+from app.archive import ARCHIVE_LOCK
+
+from .conftest import BACKEND_DIR, run_backend
+
+MAINTENANCE_COMMANDS = (["app.archive", "archive", "--before", "2000/01"], ["app.rollups", "rebuild"])
+
+ARCHIVE_SCENARIO = """
+import json
+from fastapi.testclient import TestClient
+from app.archive import archive_closed_seasons, restore_archive
+from app.main import app
+from tests.conftest import make_record
+
+def snapshot(client):
+    records = client.get("/records")
+    return {
+        "etag": records.headers["etag"],
+        "records": len(records.json()),
+        "search": [record["id"] for record in client.get("/search", params={"q": "Archivist"}).json()],
+        "suggest": client.get("/players/suggest", params={"prefix": "Archi"}).json()
+    }
+
+with TestClient(app) as client:
+    client.post("/records", json=make_record(played_at="2024-05-01T12:00:00", opponent_player_name="Archivist"))
+    client.post("/records", json=make_record(played_at="2025-02-01T12:00:00", opponent_player_name="Newcomer"))
+    before = snapshot(client)
+    archive_closed_seasons("2025/01")
+    archived = snapshot(client)
+    restore_archive("2024")
+    restored = snapshot(client)
+print(json.dumps({"before": before, "archived": archived, "restored": restored}))
+"""
+
+
+def test_archived_seasons_stay_searchable_and_change_the_etag(tmp_path):
+    result = json.loads(run_backend(ARCHIVE_SCENARIO, tmp_path).stdout)
+    before, archived, restored = result["before"], result["archived"], result["restored"]
+
+    assert before["search"] == archived["search"] == restored["search"] == [1]
+    assert before["suggest"] == archived["suggest"] == restored["suggest"] == [
+        {"name": "Archivist", "match_count": 1}
+    ]
+    assert before["records"] == archived["records"] == restored["records"] == 2
+    assert len({before["etag"], archived["etag"], restored["etag"]}) == 3
+
+
+def test_archiving_during_a_backup_returns_retryable_503(client, monkeypatch):
+    monkeypatch.setattr(app.database, "WRITE_TIMEOUT_SECONDS", 0.05)
+    with ARCHIVE_LOCK:
+        response = client.post("/archives", json={"before": "2020/01"})
+        assert client.get("/archives").status_code == 200
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "1"
+    assert client.post("/archives", json={"before": "2000/01"}).status_code == 200
+
+
+def run_maintenance(command: list[str], data_dir) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, "-m", *command],
+        cwd=BACKEND_DIR,
+        env={**os.environ, "MFSTAT_DATA_DIR": str(data_dir)},
+        capture_output=True,
+        text=True
+    )
+
+
+def test_maintenance_commands_refuse_to_run_beside_the_server(client, tmp_path):
+    for command in MAINTENANCE_COMMANDS:
+        busy = run_maintenance(command, app.database.DATABASE_PATH.parent)
+        assert busy.returncode == 1
+        assert "server" in busy.stderr
+        assert run_maintenance(command, tmp_path).returncode == 0
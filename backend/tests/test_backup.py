@@ -0,0 +1,103 @@
+import sqlite3
+from datetime import datetime, timedelta
+
+import app.backup
+from app.backup import BACKUP_DIR, create_backup, list_backups
+
+from .conftest import run_backend
+
+
+def test_baseline_database_gets_pre_migration_snapshot(tmp_path):
+    connection = sqlite3.connect(tmp_path / "mfstat.db")
+    # The pre-Alembic schema: created by SQLModel.create_all, without alembic_version or generated columns.
+    connection.execute(
+        "CREATE TABLE matchrecord (id INTEGER PRIMARY KEY, played_at DATETIME NOT NULL, rule VARCHAR(64) NOT NULL, "
+        "stage VARCHAR(200) NOT NULL, my_score INTEGER NOT NULL, opponent_score INTEGER NOT NULL, "
+        "my_character VARCHAR(100) NOT NULL, opponent_character VARCHAR(100) NOT NULL, my_rate INTEGER NOT NULL, "
+        "my_rate_band VARCHAR(3) NOT NULL, opponent_rate_band VARCHAR(3) NOT NULL, season VARCHAR(7) NOT NULL, "
+        "result VARCHAR(10) NOT NULL, created_at DATETIME NOT NULL)"
+    )
+    connection.execute(
+        "INSERT INTO matchrecord (played_at, rule, stage, my_score, opponent_score, my_character, opponent_character, "
+        "my_rate, my_rate_band, opponent_rate_band, season, result, created_at) VALUES ('2024-05-01 12:00:00', "
+        "'singles', 'Court', 7, 3, 'Mario', 'Luigi', 1500, 'A', 'B', '2024/05', 'WIN', '2024-05-01 12:00:00')"
+    )
+    connection.commit()
+    connection.close()
+
+    run_backend("from app.database import init_db; init_db()", tmp_path)
+
+    snapshots = list((tmp_path / "backups").glob("mfstat-*-pre-migration"))
+    assert len(snapshots) == 1
+    snapshot = sqlite3.connect(snapshots[0] / "mfstat.db")
+    try:
+        assert snapshot.execute("SELECT count(*) FROM matchrecord").fetchone() == (1,)
+        assert snapshot.execute("SELECT count(*) FROM sqlite_master WHERE name = 'alembic_version'").fetchone() == (0,)
+    finally:
+        snapshot.close()
+
+
+def test_new_database_skips_pre_migration_snapshot(tmp_path):
+    run_backend("from app.database import init_db; init_db()", tmp_path)
+
+    assert not list((tmp_path / "backups").glob("mfstat-*-pre-migration"))
+
+
+def test_backup_includes_archived_seasons(tmp_path):
+    run_backend(
+        """
+from fastapi.testclient import TestClient
+from app.archive import archive_closed_seasons
+from app.backup import create_backup
+from app.main import app
+from tests.conftest import make_record
+
+with TestClient(app) as client:
+    client.post("/records", json=make_record(played_at="2024-05-01T12:00:00"))
+    client.post("/records", json=make_record(played_at="2025-02-01T12:00:00"))
+archive_closed_seasons("2025/01")
+create_backup()
+""",
+        tmp_path
+    )
+
+    snapshots = list((tmp_path / "backups").glob("mfstat-*-manual"))
+    assert len(snapshots) == 1
+    archive = sqlite3.connect(snapshots[0] / "archives" / "mfstat-2024.db")
+    working = sqlite3.connect(snapshots[0] / "mfstat.db")
+    try:
+        assert archive.execute("SELECT season FROM matchrecord").fetchall() == [("2024/05",)]
+        assert working.execute("SELECT season FROM matchrecord").fetchall() == [("2025/02",)]
+        assert working.execute("SELECT season, archive FROM archivedseason").fetchall() == [("2024/05", "2024")]
+    finally:
+        archive.close()
+        working.close()
+
+
+def test_backups_started_in_the_same_tick_get_distinct_names(client, monkeypatch):
+    tick = datetime(2026, 1, 2, 3, 4, 5, 678901)
+    # The clock stays on one tick for both names, then moves on only when a name is retried.
+    readings = iter([tick, tick, tick + timedelta(microseconds=1)])
+
+    class FrozenDatetime(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return next(readings)
+
+    monkeypatch.setattr(app.backup, "datetime", FrozenDatetime)
+    first = create_backup()
+    second = create_backup()
+
+    assert first.name == "mfstat-20260102-030405-678901-manual"
+    assert second.name == "mfstat-20260102-030405-678902-manual"
+    assert (second / "mfstat.db").exists()
+
+
+def test_second_resolution_snapshot_names_still_list(client):
+    legacy = BACKUP_DIR / "mfstat-20200101-120000-manual"
+    legacy.mkdir(parents=True)
+    (legacy / "mfstat.db").write_bytes(b"")
+
+    snapshot, = [snapshot for snapshot in list_backups() if snapshot.name == legacy.name]
+    assert snapshot.created_at == datetime(2020, 1, 1, 12, 0, 0)
+    assert snapshot.reason == "manual"
@@ -0,0 +1,62 @@
+import csv
+import io
+import json
+
+import app.bulk_import
+from app.database import WriterBusyError
+
+from .conftest import make_record
+
+
+def _csv_body(records: list[dict]) -> str:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=list(records[0]))
+    writer.writeheader()
+    writer.writerows(records)
+    return buffer.getvalue()
+
+
+def test_csv_rows_parse_with_the_csv_module(client):
+    records = [make_record(stage="Bulk Court", opponent_player_name='Ace,\n"Kid"')]
+    # A quote inside an unquoted field is data, not the start of a multi-line field.
+    loose_quote_row = ",".join(map(str, make_record(my_character='Mario "Jr"', opponent_player_name="Ace").values()))
+    body = f'{_csv_body(records)}{loose_quote_row}\nnot,enough,"columns\n'
+    response = client.post("/records/bulk", content=body, headers={"content-type": "text/csv"})
+
+    report = response.json()
+    assert response.status_code == 200
+    assert (report["received"], report["inserted"], report["failed"]) == (3, 2, 1)
+    assert report["committed_through_row"] == 3
+    assert report["errors"][0]["row"] == 3
+    names = [record["opponent_player_name"] for record in client.get("/records", params={"stage": "Bulk Court"}).json()]
+    assert names == ['Ace,\n"Kid"']
+
+
+def test_error_list_is_capped_but_counted(client, monkeypatch):
+    monkeypatch.setattr(app.bulk_import, "BULK_IMPORT_MAX_ERRORS", 3)
+    body = "\n".join(json.dumps({"stage": "Broken Court"}) for _ in range(10))
+    report = client.post("/records/bulk", content=body).json()
+    assert report["failed"] == 10
+    assert [error["row"] for error in report["errors"]] == [1, 2, 3]
+
+
+def test_failed_batch_reports_the_resume_point(client, monkeypatch):
+    insert_batch = app.bulk_import._insert_batch
+    calls = []
+
+    def flaky_insert_batch(rows):
+        calls.append(len(rows))
+        if len(calls) == 2:
+            raise WriterBusyError("Another write is in progress; retry shortly")
+        insert_batch(rows)
+
+    monkeypatch.setattr(app.bulk_import, "BULK_IMPORT_BATCH_SIZE", 2)
+    monkeypatch.setattr(app.bulk_import, "_insert_batch", flaky_insert_batch)
+    body = "\n".join(json.dumps(make_record(stage="Resume Court", my_rate=1000 + index)) for index in range(5))
+    response = client.post("/records/bulk", content=body)
+
+    report = response.json()
+    assert response.status_code == 503
+    assert (report["inserted"], report["committed_through_row"]) == (2, 2)
+    assert report["aborted"]
+    assert len(client.get("/records", params={"stage": "Resume Court"}).json()) == 2
@@ -0,0 +1,39 @@
+from .conftest import make_record
+
+
+def _changes(client, since: int) -> dict:
+    response = client.get("/records/changes", params={"since": since})
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_change_feed_orders_upserts_and_tombstones_by_revision(client):
+    start = _changes(client, 0)["revision"]
+
+    first, second, third = [
+        client.post("/records", json=make_record(stage="Change Court", my_rate=rate)).json()
+        for rate in (1500, 1510, 1520)
+    ]
+    client.put(f"/records/{first['id']}", json={"my_rate": 1600})
+    client.delete(f"/records/{third['id']}")
+
+    changes = _changes(client, start)
+    assert [record["id"] for record in changes["upserts"]] == [second["id"], first["id"]]
+    assert changes["upserts"][1]["my_rate"] == 1600
+    assert changes["deletes"] == [third["id"]]
+    assert changes["revision"] == start + 5
+    assert [record["revision"] for record in changes["upserts"]] == [start + 2, start + 4]
+
+
+def test_change_feed_resumes_from_a_since_token(client):
+    record = client.post("/records", json=make_record(stage="Resume Court")).json()
+    since = _changes(client, record["revision"] - 1)["revision"]
+
+    assert _changes(client, since) == {"revision": since, "upserts": [], "deletes": []}
+
+    client.put(f"/records/{record['id']}", json={"stage": "Resume Court 2"})
+    client.delete(f"/records/{record['id']}")
+    resumed = _changes(client, since)
+    assert resumed["upserts"] == []
+    assert resumed["deletes"] == [record["id"]]
+    assert resumed["revision"] == since + 2
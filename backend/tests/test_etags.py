@@ -0,0 +1,51 @@
+import threading
+
+from sqlalchemy import func, select
+
+from app.database import read_engine
+from app.models import DataRevision, MatchRecord
+from app.revisions import read_snapshot_revision
+
+from .conftest import make_record
+
+
+def test_revision_etags_are_weak_and_revalidate(client):
+    client.post("/records", json=make_record(stage="Etag Court"))
+    params = {"stage": "Etag Court"}
+    response = client.get("/records", params=params)
+    etag = response.headers["etag"]
+    assert etag.startswith('W/"')
+
+    assert client.get("/records", params=params, headers={"If-None-Match": etag}).status_code == 304
+    strong_form = etag.removeprefix("W/")
+    assert client.get("/records", params=params, headers={"If-None-Match": strong_form}).status_code == 304
+
+    client.post("/records", json=make_record(stage="Etag Court"))
+    assert client.get("/records", params=params, headers={"If-None-Match": etag}).status_code == 200
+
+
+def test_snapshot_revision_pins_later_reads(client):
+    with read_engine.connect() as connection:
+        revision = read_snapshot_revision(connection)
+        count = connection.execute(select(func.count()).select_from(MatchRecord)).scalar_one()
+        client.post("/records", json=make_record(stage="Snapshot Court"))
+        assert connection.execute(select(DataRevision.revision)).scalar_one() == revision
+        assert connection.execute(select(func.count()).select_from(MatchRecord)).scalar_one() == count
+
+
+def test_etag_and_body_come_from_one_snapshot_under_writes(client):
+    stop = threading.Event()
+
+    def write() -> None:
+        while not stop.is_set():
+            client.post("/records", json=make_record(stage="Racing Court"))
+
+    writer = threading.Thread(target=write)
+    writer.start()
+    try:
+        for _ in range(40):
+            response = client.get("/records/changes", params={"since": 2**31})
+            assert response.headers["etag"].startswith(f'W/"{response.json()["revision"]}-')
+    finally:
+        stop.set()
+        writer.join()
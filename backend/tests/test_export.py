@@ -0,0 +1,16 @@
+import json
+
+from .conftest import make_record
+
+
+def test_columnar_export_is_compact_json(client):
+    client.post("/records", json=make_record(stage="Export Court", my_character="Mario"))
+    client.post("/records", json=make_record(stage="Export Court", my_character="Peach"))
+    response = client.get("/records/export", params={"format": "columnar", "stage": "Export Court"})
+
+    assert ", " not in response.text and '": ' not in response.text
+    body = json.loads(response.text)
+    columns = {column["name"]: column for column in body["columns"]}
+    assert body["row_count"] == 2
+    my_character = columns["my_character"]
+    assert sorted(my_character["dictionary"][code] for code in my_character["codes"]) == ["Mario", "Peach"]
@@ -0,0 +1,66 @@
+from collections import Counter
+
+from app.facets import FACET_DIMENSIONS
+from app.filters import RecordFilters
+from app.record_store import RecordStore
+
+from .conftest import make_record
+
+WINDOW = {"played_from": "2021-01-01T00:00:00", "played_to": "2021-01-31T23:59:59"}
+
+
+def _expected_facets(records: list[dict], filters: dict) -> dict:
+    def matches(record: dict, exclude: str | None = None) -> bool:
+        return all(record.get(name) in values for name, values in filters.items() if name != exclude)
+
+    facets = {}
+    for dimension in FACET_DIMENSIONS:
+        counts = Counter(record.get(dimension) for record in records if matches(record, exclude=dimension))
+        facets[dimension] = sorted(counts.items(), key=lambda item: (-item[1], item[0] is None, item[0] or ""))
+    return {"total": sum(matches(record) for record in records), "facets": facets}
+
+
+def _pairs(facets: dict) -> dict:
+    return {
+        "total": facets["total"],
+        "facets": {
+            dimension: [(item["value"], item["count"]) for item in items]
+            for dimension, items in facets["facets"].items()
+        }
+    }
+
+
+def test_facet_counts_exclude_each_dimensions_own_filter(client):
+    records = []
+    for index in range(18):
+        record = make_record(
+            played_at=f"2021-01-{index + 1:02d}T12:00:00",
+            rule=["singles", "doubles"][index % 2],
+            stage=f"Facet Court {index % 3}",
+            my_character=["Mario", "Peach", "Yoshi"][index % 3],
+            my_racket=None if index % 5 == 0 else f"Racket {index // 3 % 3}",
+            opponent_rate_band=["A", "B", "S"][index // 6]
+        )
+        records.append({**client.post("/records", json=record).json(), "my_racket": record["my_racket"]})
+
+    filters = {
+        "rule": ["singles"],
+        "my_character": ["Mario", "Peach"],
+        "my_racket": ["Racket 1", "Racket 2"],
+        "opponent_rate_band": ["A", "S"]
+    }
+    response = client.get("/records/facets", params={**filters, **WINDOW})
+    assert response.status_code == 200
+    expected = _expected_facets(records, filters)
+    assert _pairs(response.json()) == expected
+    assert expected["total"] > 0
+    assert len(client.get("/records", params={**filters, **WINDOW}).json()) == expected["total"]
+
+    store = RecordStore()
+    store.sync()
+    store_facets = store.facets(RecordFilters(**filters, **WINDOW))
+    assert _pairs(store_facets.model_dump()) == expected
+
+    expected = _expected_facets(records, {})
+    assert _pairs(client.get("/records/facets", params=WINDOW).json()) == expected
+    assert expected["total"] == 18
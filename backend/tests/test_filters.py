@@ -0,0 +1,94 @@
+from .conftest import make_record
+
+
+def test_offset_bounds_compare_in_stored_jst(client):
+    before_midnight_utc = client.post(
+        "/records",
+        json=make_record(played_at="2024-05-01T08:30:00", stage="Timezone Court")
+    ).json()
+    after_midnight_utc = client.post(
+        "/records",
+        json=make_record(played_at="2024-05-01T09:30:00", stage="Timezone Court")
+    ).json()
+
+    response = client.get(
+        "/records",
+        params={"stage": "Timezone Court", "played_from": "2024-05-01T00:00:00Z"}
+    )
+    assert [record["id"] for record in response.json()] == [after_midnight_utc["id"]]
+
+    response = client.get(
+        "/records",
+        params={"stage": "Timezone Court", "played_to": "2024-05-01T08:45:00+09:00"}
+    )
+    assert [record["id"] for record in response.json()] == [before_midnight_utc["id"]]
+
+
+def _page_through(client, params: dict, limit: int) -> list[list[int]]:
+    pages = []
+    cursor = None
+    while True:
+        page_params = {**params, "limit": limit}
+        if cursor:
+            page_params["cursor"] = cursor
+        response = client.get("/records", params=page_params)
+        assert response.status_code == 200
+        pages.append([record["id"] for record in response.json()])
+        cursor = response.headers.get("x-next-cursor")
+        if cursor is None:
+            return pages
+
+
+def test_cursor_pages_break_played_at_ties_by_id(client):
+    played_ats = [
+        "2024-06-01T12:00:00",
+        "2024-06-02T12:00:00",
+        "2024-06-02T12:00:00",
+        "2024-06-02T12:00:00",
+        "2024-06-03T12:00:00"
+    ]
+    ids = [
+        client.post("/records", json=make_record(played_at=played_at, stage="Cursor Court")).json()["id"]
+        for played_at in played_ats
+    ]
+    expected = [ids[4], ids[3], ids[2], ids[1], ids[0]]
+
+    pages = _page_through(client, {"stage": "Cursor Court"}, limit=2)
+    assert pages == [expected[:2], expected[2:4], expected[4:]]
+    assert [record["id"] for record in client.get("/records", params={"stage": "Cursor Court"}).json()] == expected
+    assert _page_through(client, {"stage": "Cursor Court"}, limit=5) == [expected]
+
+
+def test_invalid_cursor_is_rejected(client):
+    response = client.get("/records", params={"limit": 2, "cursor": "not-a-cursor"})
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid cursor"
+
+
+def test_filters_combine_within_and_across_fields_on_pages(client):
+    records = [
+        make_record(played_at="2024-07-01T12:00:00", rule="singles", my_character="Mario"),
+        make_record(played_at="2024-07-02T12:00:00", rule="doubles", my_character="Mario"),
+        make_record(played_at="2024-07-03T12:00:00", rule="singles", my_character="Peach"),
+        make_record(played_at="2024-07-04T12:00:00", rule="singles", my_character="Yoshi"),
+        make_record(played_at="2024-07-05T12:00:00", rule="singles", my_character="Mario")
+    ]
+    ids = [
+        client.post("/records", json={**record, "stage": "Filter Court"}).json()["id"]
+        for record in records
+    ]
+
+    params = {
+        "stage": "Filter Court",
+        "rule": "singles",
+        "my_character": ["Mario", "Peach"],
+        "played_from": "2024-07-01T12:00:00",
+        "played_to": "2024-07-03T23:59:59"
+    }
+    assert _page_through(client, params, limit=1) == [[ids[2]], [ids[0]]]
+
+    params = {"stage": "Filter Court", "my_character": "Mario", "played_from": "2024-07-02T00:00:00"}
+    assert _page_through(client, params, limit=1) == [[ids[4]], [ids[1]]]
+
+    params = {"stage": "Filter Court", "rule": "doubles", "my_character": "Peach"}
+    assert _page_through(client, params, limit=2) == [[]]
@@ -0,0 +1,87 @@
+import json
+import re
+
+from .conftest import run_backend
+
+METRICS_SCENARIO = """
+import json
+from fastapi.testclient import TestClient
+from app.main import app
+from tests.conftest import make_record
+
+with TestClient(app) as client:
+    first = client.post("/records", json=make_record()).json()
+    second = client.post("/records", json=make_record()).json()
+    server_timing = client.put(f"/records/{first['id']}", json={"my_rate": 1600}).headers.get("server-timing")
+    client.put(f"/records/{second['id']}", json={"my_rate": 1610})
+    client.put("/records/999999", json={"my_rate": 1620})
+    client.get("/records", params={"limit": 1})
+    metrics = client.get("/metrics")
+print(json.dumps({
+    "server_timing": server_timing,
+    "content_type": metrics.headers["content-type"],
+    "body": metrics.text
+}))
+"""
+SAMPLE_PATTERN = re.compile(r'^([a-z_]+)(?:\{((?:[a-z_]+="(?:[^"\\]|\\.)*",?)*)\})? (-?[0-9.e+-]+|\+Inf)$')
+LABEL_PATTERN = re.compile(r'([a-z_]+)="((?:[^"\\]|\\.)*)"')
+
+
+def _samples(body: str) -> list[tuple[str, dict, float]]:
+    samples = []
+    types = {}
+    for line in body.splitlines():
+        if line.startswith("# TYPE "):
+            _, _, name, kind = line.split(" ")
+            types[name] = kind
+            continue
+        if line.startswith("#"):
+            continue
+        match = SAMPLE_PATTERN.match(line)
+        assert match, line
+        name, labels, value = match.groups()
+        family = re.sub(r"_(bucket|sum|count)$", "", name) if name not in types else name
+        assert family in types, line
+        samples.append((name, dict(LABEL_PATTERN.findall(labels or "")), float(value)))
+    return samples
+
+
+def _value(samples, name: str, **labels) -> float:
+    values = [value for sample_name, sample_labels, value in samples if sample_name == name and sample_labels == labels]
+    assert len(values) == 1, (name, labels)
+    return values[0]
+
+
+def test_metrics_record_requests_by_route_template(tmp_path):
+    result = json.loads(
+        run_backend(METRICS_SCENARIO, tmp_path, MFSTAT_METRICS="1", MFSTAT_SERVER_TIMING="1").stdout
+    )
+    assert result["content_type"] == "text/plain; version=0.0.4; charset=utf-8"
+    assert re.fullmatch(r'app;dur=[0-9.]+, db;dur=[0-9.]+;desc="[1-9][0-9]* queries"', result["server_timing"])
+
+    body = result["body"]
+    assert body.endswith("\n")
+    assert "/records/999999" not in body
+    samples = _samples(body)
+    route = {"method": "PUT", "route": "/records/{record_id}"}
+    assert _value(samples, "mfstat_http_requests_total", **route, status="200") == 2
+    assert _value(samples, "mfstat_http_requests_total", **route, status="404") == 1
+    assert _value(samples, "mfstat_http_requests_total", method="POST", route="/records", status="201") == 2
+    assert _value(samples, "mfstat_http_request_duration_seconds_count", **route) == 3
+    assert _value(samples, "mfstat_http_request_duration_seconds_sum", **route) > 0
+    assert _value(samples, "mfstat_http_request_db_statements_count", **route) == 3
+    assert _value(samples, "mfstat_http_requests_in_progress") == 1
+
+    buckets = [
+        (labels["le"], value)
+        for name, labels, value in samples
+        if name == "mfstat_http_request_duration_seconds_bucket" and labels.items() >= route.items()
+    ]
+    assert buckets[-1] == ("+Inf", 3)
+    assert [value for _, value in buckets] == sorted(value for _, value in buckets)
+    assert [float(bound) for bound, _ in buckets[:-1]] == sorted(float(bound) for bound, _ in buckets[:-1])
+    assert _value(samples, "mfstat_db_statement_duration_seconds_count", engine="write") > 0
+
+
+def test_metrics_endpoint_is_off_by_default(client):
+    assert client.get("/metrics").status_code == 404
@@ -0,0 +1,83 @@
+from .conftest import make_record
+
+BATCH_SEASON = "2022/11"
+
+
+def _rollups(client) -> dict:
+    response = client.get("/stats/rollups", params={"season": BATCH_SEASON, "dimension": ["total", "stage"]})
+    return {
+        (rollup["rule"], rollup["dimension"], rollup["value"]): (rollup["match_count"], rollup["win_count"])
+        for rollup in response.json()
+    }
+
+
+def _revision(client) -> int:
+    return client.get("/records/changes", params={"since": 2**31}).json()["revision"]
+
+
+def test_batches_by_id_are_all_or_nothing(client):
+    record = client.post("/records", json=make_record(played_at="2022-11-20T12:00:00", stage="Atomic Court")).json()
+    rollups = _rollups(client)
+    revision = _revision(client)
+
+    response = client.patch("/records", json={"ids": [record["id"], 999999], "changes": {"stage": "Moved"}})
+    assert response.status_code == 404
+    assert response.json()["detail"] == "Records not found: 999999"
+    response = client.request("DELETE", "/records", json={"ids": [999998, record["id"], 999999]})
+    assert response.status_code == 404
+    assert response.json()["detail"] == "Records not found: 999998, 999999"
+    response = client.patch("/records", json={"ids": [record["id"], "x"], "changes": {"stage": "Moved"}})
+    assert response.status_code == 422
+    response = client.patch("/records", json={"ids": [record["id"]], "changes": {"rule": None}})
+    assert response.status_code == 400
+
+    assert client.get("/records", params={"stage": "Atomic Court"}).json()[0]["id"] == record["id"]
+    assert _rollups(client) == rollups
+    assert _revision(client) == revision
+
+
+def test_batches_keep_rollup_counters_in_step(client):
+    ids = [
+        client.post(
+            "/records",
+            json=make_record(
+                played_at=f"2022-11-{day:02d}T12:00:00",
+                stage="Batch Court A",
+                my_score=7 if day % 2 else 1
+            )
+        ).json()["id"]
+        for day in range(1, 5)
+    ]
+    before = _rollups(client)
+    assert before[("singles", "stage", "Batch Court A")] == (4, 2)
+
+    response = client.patch("/records", json={"ids": ids[:2], "changes": {"stage": "Batch Court B", "my_score": 1}})
+    assert response.json() == {"affected": 2}
+    rollups = _rollups(client)
+    assert rollups[("singles", "stage", "Batch Court A")] == (2, 1)
+    assert rollups[("singles", "stage", "Batch Court B")] == (2, 0)
+    assert rollups[("singles", "total", "")] == (
+        before[("singles", "total", "")][0],
+        before[("singles", "total", "")][1] - 1
+    )
+
+    response = client.patch(
+        "/records",
+        json={"filters": {"season": [BATCH_SEASON], "stage": ["Batch Court B"]}, "changes": {"rule": "doubles"}}
+    )
+    assert response.json() == {"affected": 2}
+    rollups = _rollups(client)
+    assert ("singles", "stage", "Batch Court B") not in rollups
+    assert rollups[("doubles", "stage", "Batch Court B")] == (2, 0)
+    assert rollups[("singles", "total", "")][0] == before[("singles", "total", "")][0] - 2
+
+    response = client.request("DELETE", "/records", json={"ids": [ids[0], ids[2]]})
+    assert response.json() == {"affected": 2}
+    rollups = _rollups(client)
+    assert rollups[("singles", "stage", "Batch Court A")] == (1, 0)
+    assert rollups[("doubles", "stage", "Batch Court B")] == (1, 0)
+
+    breakdown = client.get("/stats/breakdown", params={"group_by": "stage", "season": BATCH_SEASON}).json()
+    groups = {group["values"]["stage"]: (group["total"], group["wins"]) for group in breakdown["groups"]}
+    assert groups["Batch Court A"] == (1, 0)
+    assert groups["Batch Court B"] == (1, 0)
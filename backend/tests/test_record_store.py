@@ -0,0 +1,60 @@
+import random
+import time
+from itertools import islice
+
+from app.filters import RecordFilters
+from app.record_store import SLOT_SCAN_WINDOW_BITS, RecordStore, _iter_slots_descending
+
+from .conftest import make_record
+
+STAGES = ["Store Court 1", "Store Court 2", "Store Court 3"]
+
+
+def test_breakdown_matches_database_and_writes_only_mark_stale(client):
+    for index in range(12):
+        client.post(
+            "/records",
+            json=make_record(
+                played_at=f"2025-06-{index + 1:02d}T12:00:00",
+                stage=STAGES[index % 3],
+                my_character=["Mario", "Peach"][index % 2],
+                opponent_character=f"Rival {index // 2}",
+                my_score=7 if index % 4 else 2
+            )
+        )
+    store = RecordStore()
+    store.sync()
+
+    params = {"group_by": ["stage", "my_character", "opponent_character"], "stage": STAGES}
+    expected = client.get("/stats/breakdown", params=params).json()
+    breakdown = store.win_rate_breakdown(params["group_by"], RecordFilters(stage=STAGES))
+    # Groups are ordered by size only, so ties may come out in either order.
+    assert sorted(map(repr, breakdown.model_dump()["groups"])) == sorted(map(repr, expected["groups"]))
+    assert (breakdown.total, breakdown.wins) == (expected["total"], expected["wins"]) == (12, 9)
+
+    store.invalidate()
+    assert store.stale
+    store.sync()
+    assert not store.stale
+
+
+def test_slots_come_out_newest_first_across_scan_windows():
+    generator = random.Random(18)
+    cases = [(0, 0.5), (5, 1.0), (SLOT_SCAN_WINDOW_BITS * 5 + 17, 0.3), (SLOT_SCAN_WINDOW_BITS * 9, 0.001)]
+    for size, density in cases:
+        slots = [slot for slot in range(size) if generator.random() < density]
+        mask = sum(1 << slot for slot in slots)
+        expected = sorted(slots, reverse=True)
+        assert list(_iter_slots_descending(mask)) == expected
+        for end in (0, 1, SLOT_SCAN_WINDOW_BITS, size // 3, size + 100):
+            assert list(_iter_slots_descending(mask, end)) == [slot for slot in expected if slot < end]
+
+
+def test_short_pages_read_only_the_top_of_a_large_mask():
+    mask = (1 << 4_000_000) - 1
+    started_at = time.perf_counter()
+    for _ in range(100):
+        slots = list(islice(_iter_slots_descending(mask), 50))
+    assert slots == list(range(3_999_999, 3_999_949, -1))
+    # Converting the whole mask for every page took close to a second for these 100 pages.
+    assert time.perf_counter() - started_at < 0.1
@@ -0,0 +1,58 @@
+from .conftest import make_record
+
+
+def _rivals(client, **params) -> dict:
+    response = client.get("/stats/rivals", params={"stage": "Rival Court", **params})
+    assert response.status_code == 200
+    return response.json()
+
+
+def _names(page: dict) -> list[str]:
+    return [item["name"] for item in page["items"]]
+
+
+def test_rivals_rank_opponents_and_apply_the_match_threshold(client):
+    for day, name, my_score, character, my_rate in [
+        (1, "Alice", 7, "Peach", 1500),
+        (2, "Alice", 7, "Peach", 1510),
+        (3, "Alice", 1, "Daisy", 1490),
+        (4, "Bob", 1, "Wario", 1480),
+        (5, "bob", 1, "Wario", 1470),
+        (6, "Carol", 7, "Yoshi", 1520)
+    ]:
+        client.post(
+            "/records",
+            json=make_record(
+                played_at=f"2024-04-{day:02d}T12:00:00",
+                stage="Rival Court",
+                opponent_player_name=name,
+                opponent_character=character,
+                my_score=my_score,
+                my_rate=my_rate,
+                my_partner_player_name="Partner" if day % 2 else None
+            )
+        )
+
+    page = _rivals(client)
+    assert page["total"] == 3
+    assert _names(page) == ["Alice", "Bob", "Carol"]
+    alice, bob, carol = page["items"]
+    assert (alice["matches"], alice["wins"], alice["losses"]) == (3, 2, 1)
+    assert alice["top_character"] == "Peach"
+    assert (alice["last_my_rate"], alice["last_played_at"]) == (1490, "2024-04-03T12:00:00")
+    assert (bob["matches"], bob["wins"], bob["win_rate"]) == (2, 0, 0.0)
+    assert carol["win_rate"] == 100.0
+
+    assert _names(_rivals(client, sort="win_rate")) == ["Carol", "Alice", "Bob"]
+    assert _names(_rivals(client, sort="last_played", order="asc")) == ["Alice", "Bob", "Carol"]
+
+    page = _rivals(client, min_matches=2, sort="win_rate")
+    assert page["total"] == 2
+    assert _names(page) == ["Alice", "Bob"]
+    assert _rivals(client, min_matches=2, limit=1, offset=1) == {**page, "items": page["items"][1:]}
+    assert _rivals(client, min_matches=2, offset=5) == {"total": 2, "items": []}
+    assert _rivals(client, min_matches=4) == {"total": 0, "items": []}
+
+    partners = _rivals(client, role="partner")
+    assert [(item["name"], item["matches"]) for item in partners["items"]] == [("Partner", 3)]
+    assert client.get("/stats/rivals", params={"min_matches": 0}).status_code == 422
@@ -0,0 +1,87 @@
+import json
+
+from sqlmodel import Session
+
+from app.database import read_engine
+from app.filters import RecordFilters
+from app.rollups import compute_rollup_win_rate_breakdown
+from app.stats import compute_win_rate_breakdown
+
+from .conftest import make_record, run_backend
+
+REBUILD_SCENARIO = """
+import json
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+from app.archive import archive_closed_seasons
+from app.database import engine
+from app.main import app
+from app.rollups import rebuild_match_stat_rollups
+from tests.conftest import make_record
+
+def seasons(client):
+    groups = client.get("/stats/breakdown", params={"group_by": "season"}).json()["groups"]
+    return sorted((group["values"]["season"], group["total"], group["wins"]) for group in groups)
+
+with TestClient(app) as client:
+    client.post("/records", json=make_record(played_at="2024-05-01T12:00:00"))
+    client.post("/records", json=make_record(played_at="2024-05-02T12:00:00", my_score=1))
+    client.post("/records", json=make_record(played_at="2025-02-01T12:00:00"))
+    archive_closed_seasons("2025/01")
+    archived = seasons(client)
+    with Session(engine) as session:
+        rebuild_match_stat_rollups(session)
+        session.commit()
+    rebuilt = seasons(client)
+print(json.dumps({"archived": archived, "rebuilt": rebuilt}))
+"""
+
+
+def _normalized(breakdown) -> dict:
+    data = breakdown.model_dump()
+    # Groups are ordered by size only, so ties may come out in either order.
+    data["groups"] = sorted(map(repr, data["groups"]))
+    data["sets"] = {dimension: sorted(map(repr, groups)) for dimension, groups in data["sets"].items()}
+    return data
+
+
+def test_season_breakdowns_from_rollups_match_the_record_table(client):
+    season = None
+    for index in range(8):
+        record = client.post(
+            "/records",
+            json=make_record(
+                played_at=f"2023-03-{index + 1:02d}T12:00:00",
+                rule=["singles", "doubles"][index % 2],
+                stage=f"Rollup Court {index % 3}",
+                my_racket=None if index % 4 == 0 else f"Racket {index % 2}",
+                my_score=7 if index % 3 else 1
+            )
+        ).json()
+        season = record["season"]
+
+    filters = RecordFilters(season=[season])
+    cases = [
+        (["stage"], "joint"),
+        (["rule", "my_racket"], "joint"),
+        (["season", "rule"], "joint"),
+        (["stage", "my_racket", "opponent_rate_band", "rule"], "sets")
+    ]
+    with Session(read_engine) as session:
+        for dimensions, grouping in cases:
+            rollup = compute_rollup_win_rate_breakdown(session, dimensions, filters, grouping)
+            assert rollup is not None
+            expected = compute_win_rate_breakdown(session, dimensions, filters, grouping)
+            assert _normalized(rollup) == _normalized(expected)
+            assert rollup.total == 8
+
+        assert compute_rollup_win_rate_breakdown(session, ["stage", "my_racket"], filters, "joint") is None
+        assert compute_rollup_win_rate_breakdown(session, ["result"], filters, "sets") is None
+        assert compute_rollup_win_rate_breakdown(session, ["stage"], RecordFilters(stage=["Court"]), "sets") is None
+
+
+def test_rebuild_keeps_rollups_of_archived_seasons(tmp_path):
+    result = json.loads(run_backend(REBUILD_SCENARIO, tmp_path).stdout)
+
+    assert result["archived"] == [["2024/05", 2, 1], ["2025/02", 1, 1]]
+    assert result["rebuilt"] == result["archived"]
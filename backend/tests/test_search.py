@@ -0,0 +1,58 @@
+from .conftest import make_record
+
+
+def _search(client, q: str, **params) -> list[int]:
+    response = client.get("/search", params={"q": q, **params})
+    assert response.status_code == 200
+    return [record["id"] for record in response.json()]
+
+
+def test_trigram_search_matches_substrings_of_every_term(client):
+    yamada = client.post(
+        "/records",
+        json=make_record(opponent_player_name="やまだたろう", stage="Trigram Court")
+    ).json()["id"]
+    yamashita = client.post(
+        "/records",
+        json=make_record(
+            opponent_player_name="やましたはなこ",
+            my_partner_player_name="Trigramfriend",
+            stage="Trigram Field"
+        )
+    ).json()["id"]
+
+    assert _search(client, "まだた") == [yamada]
+    assert _search(client, "やまし") == [yamashita]
+    assert sorted(_search(client, "Trigram")) == [yamada, yamashita]
+    assert _search(client, "やまだ Court") == [yamada]
+    assert _search(client, "やまし friend") == [yamashita]
+    assert _search(client, "Trigram", stage="Trigram Court") == [yamada]
+    assert _search(client, 'やまだ NEAR(') == []
+
+
+def test_short_terms_fall_back_to_a_literal_like_scan(client):
+    percent = client.post("/records", json=make_record(stage="Short 5% Court")).json()["id"]
+    plain = client.post("/records", json=make_record(stage="Short 50 Court")).json()["id"]
+
+    assert _search(client, "5%") == [percent]
+    assert _search(client, "50") == [plain]
+    assert _search(client, "5_") == []
+    assert _search(client, "Short 5", stage=["Short 5% Court", "Short 50 Court"]) == [plain, percent]
+
+
+def test_suggestions_follow_record_updates(client):
+    record = client.post("/records", json=make_record(opponent_player_name="Suggestee")).json()
+    client.post("/records", json=make_record(opponent_player_name="suggestee", my_partner_player_name="Suggestor"))
+
+    assert client.get("/players/suggest", params={"prefix": "sugg"}).json() == [
+        {"name": "Suggestee", "match_count": 2},
+        {"name": "Suggestor", "match_count": 1}
+    ]
+
+    client.put(f"/records/{record['id']}", json={"opponent_player_name": "Suggestion"})
+    assert client.get("/players/suggest", params={"prefix": "Sugg"}).json() == [
+        {"name": "Suggestee", "match_count": 1},
+        {"name": "Suggestion", "match_count": 1},
+        {"name": "Suggestor", "match_count": 1}
+    ]
+    assert _search(client, "Suggestion") == [record["id"]]
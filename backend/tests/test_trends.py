@@ -0,0 +1,97 @@
+from datetime import datetime, timedelta
+
+from app.models import RateTrendPoint
+from app.trends import downsample_lttb
+
+from .conftest import make_record
+
+
+def test_lttb_keeps_endpoints_and_the_spike():
+    start = datetime(2024, 1, 1)
+    points = [
+        RateTrendPoint(
+            id=index,
+            played_at=start + timedelta(hours=index),
+            rate=2000 if index == 37 else 1500 + index % 5,
+            rate_band="A",
+            season="2024/01"
+        )
+        for index in range(100)
+    ]
+
+    sampled = downsample_lttb(points, 10)
+    assert len(sampled) == 10
+    assert sampled[0] is points[0]
+    assert sampled[-1] is points[-1]
+    assert points[37] in sampled
+    assert [point.id for point in sampled] == sorted(point.id for point in sampled)
+    assert downsample_lttb(points, 100) == points
+
+
+def test_rate_trend_bounds_points_per_rule(client):
+    ids = [
+        client.post(
+            "/records",
+            json=make_record(played_at=f"2024-02-{day:02d}T12:00:00", rule="Trend Rule", my_rate=1500 + day * 10)
+        ).json()["id"]
+        for day in range(1, 21)
+    ]
+
+    series, = client.get("/stats/rate-trend", params={"rule": "Trend Rule", "max_points": 5}).json()
+    assert series["rule"] == "Trend Rule"
+    assert series["total_points"] == 20
+    assert len(series["points"]) == 5
+    assert series["points"][0]["id"] == ids[0]
+    assert series["points"][-1]["id"] == ids[-1]
+
+    series, = client.get("/stats/rate-trend", params={"rule": "Trend Rule"}).json()
+    assert [point["id"] for point in series["points"]] == ids
+
+
+def test_daily_candles_take_open_high_low_close_per_day(client):
+    for played_at, rate in [
+        ("2024-03-01T13:00:00", 1510),
+        ("2024-03-01T10:00:00", 1500),
+        ("2024-03-01T12:00:00", 1480),
+        ("2024-03-01T11:00:00", 1540),
+        ("2024-03-02T09:00:00", 1490)
+    ]:
+        client.post("/records", json=make_record(played_at=played_at, rule="Candle Rule", my_rate=rate))
+
+    response = client.get("/stats/rate-candles", params={"rule": "Candle Rule"})
+    assert response.json() == [
+        {
+            "rule": "Candle Rule",
+            "date": "2024-03-01",
+            "open": 1500,
+            "high": 1540,
+            "low": 1480,
+            "close": 1510,
+            "matches": 4
+        },
+        {
+            "rule": "Candle Rule",
+            "date": "2024-03-02",
+            "open": 1490,
+            "high": 1490,
+            "low": 1490,
+            "close": 1490,
+            "matches": 1
+        }
+    ]
+
+
+def test_rate_deltas_reset_at_rule_and_season_boundaries(client):
+    def create(played_at: str, rule: str, rate: int) -> int:
+        return client.post("/records", json=make_record(played_at=played_at, rule=rule, my_rate=rate)).json()["id"]
+
+    first = create("2024-08-30T12:00:00", "Delta Rule A", 1500)
+    other_rule = create("2024-08-31T09:00:00", "Delta Rule B", 1400)
+    second = create("2024-08-31T12:00:00", "Delta Rule A", 1520)
+    # 08:00 JST on the 1st is still August in UTC, so it stays in the 2024/08 season.
+    same_season = create("2024-09-01T08:00:00", "Delta Rule A", 1510)
+    new_season = create("2024-09-01T10:00:00", "Delta Rule A", 1600)
+
+    response = client.get("/stats/rate-deltas", params={"rule": ["Delta Rule A", "Delta Rule B"]})
+    deltas = {delta["id"]: delta["delta"] for delta in response.json()}
+    assert deltas == {first: None, other_rule: None, second: 20, same_season: -10, new_season: None}
@@ -0,0 +1,26 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import app.database
+from app.database import writer_slot
+
+from .conftest import make_record
+
+
+def test_concurrent_writes_queue_instead_of_failing(client):
+    def post(index: int) -> int:
+        record = make_record(stage="Concurrency Court", my_rate=1000 + index)
+        return client.post("/records", json=record).status_code
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        statuses = list(executor.map(post, range(24)))
+    assert statuses == [201] * 24
+    assert len(client.get("/records", params={"stage": "Concurrency Court"}).json()) == 24
+
+
+def test_busy_writer_returns_retryable_503(client, monkeypatch):
+    monkeypatch.setattr(app.database, "WRITE_TIMEOUT_SECONDS", 0.05)
+    with writer_slot():
+        response = client.post("/records", json=make_record(stage="Busy Court"))
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "1"
+    assert client.post("/records", json=make_record(stage="Busy Court")).status_code == 201
@@ -42,9 +42,21 @@ import RateTrendStockChart, { DailyRateCandle } from "./components/RateTrendStoc
 import RateTrendStepChart, { RateTrendStepSeries } from "./components/RateTrendStepChart";
 import RateTrendViewSwitcher, { RateTrendViewMode } from "./components/RateTrendViewSwitcher";
 import {
+  BreakdownDimension,
   MatchRecord,
+  RateCandle,
+  RateTrendSeries,
+  RecordFacetFilters,
+  RecordFacets,
+  WinRateBreakdownSets,
+  WinRateCounts,
   createRecord,
   deleteRecord,
+  fetchRateCandles,
+  fetchRateDeltas,
+  fetchRateTrend,
+  fetchRecordFacets,
+  fetchWinRateBreakdown,
   listRecords,
   updateRecord
 } from "./api/records";
@@ -63,15 +75,6 @@ const RATE_TREND_RULE_STORAGE_KEY = "mfstat.rateTrend.rule";
 const WIN_RATE_MIN_MATCHES_ONLY_STORAGE_KEY = "mfstat.summary.winRate.minMatchesOnly";
 type DateFilterPreset = "all" | "last30" | "custom";
 type SummaryViewMode = "rate" | "winRate" | "usage";
-type FilterFieldKey =
-  | "rule"
-  | "stage"
-  | "myCharacter"
-  | "myRacket"
-  | "opponentCharacter"
-  | "opponentRacket"
-  | "opponentRateBand"
-  | "season";
 type ExpandableRateListKey =
   | "winRateCharacter"
   | "winRateRacket"
@@ -80,6 +83,27 @@ type ExpandableRateListKey =
 
 const RATE_BAND_COLLAPSE_ROW_COUNT = 13;
 const WIN_RATE_MIN_MATCH_COUNT = 5;
+const RATE_TREND_MAX_POINTS = 2000;
+const BREAKDOWN_DIMENSIONS: BreakdownDimension[] = [
+  "stage",
+  "my_character",
+  "opponent_character",
+  "my_racket",
+  "opponent_racket",
+  "opponent_rate_band"
+];
+const EMPTY_RECORD_FILTERS: RecordFacetFilters = {
+  rule: [],
+  stage: [],
+  myCharacter: [],
+  myRacket: [],
+  opponentCharacter: [],
+  opponentRacket: [],
+  opponentRateBand: [],
+  season: [],
+  playedFrom: null,
+  playedTo: null
+};
 const SAVE_SUCCESS_MESSAGE = "記録を保存しました。";
 const DELETE_SUCCESS_MESSAGE = "記録を削除しました。";
 const ALL_SEASONS_FILTER_VALUE = "";
@@ -134,8 +158,43 @@ const shouldResetStageSelection = (playedAt: string, openedAt: number | null) =>
 };
 
 const uniqueStringList = (values: string[]) => Array.from(new Set(values));
-const incrementCount = (map: Map<string, number>, key: string) => {
-  map.set(key, (map.get(key) ?? 0) + 1);
+const toWinRateItems = (counts: Map<string, WinRateCounts> | undefined) =>
+  Array.from(counts ?? new Map<string, WinRateCounts>())
+    .filter(([value, stats]) => value.trim().length > 0 && stats.total > 0)
+    .map(([value, stats]) => ({
+      value,
+      total: stats.total,
+      wins: stats.wins,
+      winRate: (stats.wins / stats.total) * 100
+    }));
+const compareWinRateItems = (
+  left: { label: string; winRate: number },
+  right: { label: string; winRate: number }
+) => {
+  const winRateDiff = right.winRate - left.winRate;
+  if (winRateDiff !== 0) {
+    return winRateDiff;
+  }
+  return left.label.localeCompare(right.label, "ja");
+};
+const toUsageItems = (counts: Map<string, WinRateCounts> | undefined) => {
+  const entries = Array.from(counts ?? new Map<string, WinRateCounts>()).filter(([value, stats]) => value.trim().length > 0 && stats.total > 0);
+  const totalMatches = entries.reduce((sum, [, stats]) => sum + stats.total, 0);
+  return entries.map(([value, stats]) => ({
+    value,
+    count: stats.total,
+    usageRate: (stats.total / totalMatches) * 100
+  }));
+};
+const compareUsageItems = (
+  left: { label: string; usageRate: number },
+  right: { label: string; usageRate: number }
+) => {
+  const usageRateDiff = right.usageRate - left.usageRate;
+  if (usageRateDiff !== 0) {
+    return usageRateDiff;
+  }
+  return left.label.localeCompare(right.label, "ja");
 };
 const compareSeasonStringsDesc = (left: string, right: string) => right.localeCompare(left, "ja");
 const mergeColumnOrderWithDefaults = (savedOrder: string[], defaultColumnOrder: string[]) => {
@@ -435,13 +494,6 @@ const RULE_TREND_COLORS: Record<MatchRecordValues["rule"], string> = {
   doubles_fever_off: "#6a1b9a"
 };
 
-const toDateKey = (timestamp: number) => {
-  const date = new Date(timestamp);
-  if (Number.isNaN(date.getTime())) {
-    return "";
-  }
-  return `${date.getFullYear()}-${pad2(date.getMonth() + 1)}-${pad2(date.getDate())}`;
-};
 const toDateStartTimestamp = (dateKey: string) => {
   const timestamp = new Date(`${dateKey}T00:00:00`).getTime();
   return Number.isNaN(timestamp) ? 0 : timestamp;
@@ -587,6 +639,10 @@ function App() {
     setErrorToastMessage(message);
   };
 
+  const showFetchError = (error: unknown, fallbackMessage: string) => {
+    setErrorMessage(error instanceof Error ? error.message : fallbackMessage);
+  };
+
   const editingRecord = useMemo(
     () => records.find((record) => record.id === editingRecordId),
     [records, editingRecordId]
@@ -900,122 +956,95 @@ function App() {
     }
     return { from: null as number | null, to: null as number | null };
   }, [dateFilterPreset, dateFrom, dateTo]);
-  const filterOptionCounts = useMemo(() => {
-    const ruleCounts = new Map<string, number>();
-    const stageCounts = new Map<string, number>();
-    const myCharacterCounts = new Map<string, number>();
-    const myRacketCounts = new Map<string, number>();
-    const opponentCharacterCounts = new Map<string, number>();
-    const opponentRacketCounts = new Map<string, number>();
-    const opponentRateBandCounts = new Map<string, number>();
-    const seasonCounts = new Map<string, number>();
-
-    const matchesOtherFilters = (record: MatchRecord, ignore?: FilterFieldKey) => {
-      if (ignore !== "rule" && selectedRules.length > 0 && !selectedRules.includes(record.rule)) {
-        return false;
-      }
-      if (ignore !== "stage" && selectedStages.length > 0 && !selectedStages.includes(record.stage)) {
-        return false;
-      }
-      if (
-        ignore !== "myCharacter" &&
-        selectedMyCharacters.length > 0 &&
-        !selectedMyCharacters.includes(record.myCharacter)
-      ) {
-        return false;
-      }
-      if (ignore !== "myRacket" && selectedMyRackets.length > 0 && !selectedMyRackets.includes(record.myRacket)) {
-        return false;
-      }
-      if (
-        ignore !== "opponentCharacter" &&
-        selectedOpponentCharacters.length > 0 &&
-        !selectedOpponentCharacters.includes(record.opponentCharacter)
-      ) {
-        return false;
-      }
-      if (
-        ignore !== "opponentRacket" &&
-        selectedOpponentRackets.length > 0 &&
-        !selectedOpponentRackets.includes(record.opponentRacket)
-      ) {
-        return false;
-      }
-      if (
-        ignore !== "opponentRateBand" &&
-        selectedOpponentRateBands.length > 0 &&
-        !selectedOpponentRateBands.includes(record.opponentRateBand)
-      ) {
-        return false;
-      }
-      if (ignore !== "season" && selectedSeason.length > 0 && record.season !== selectedSeason) {
-        return false;
-      }
-
-      const playedAtTs = parsePlayedAtTimestamp(record.playedAt);
-      if (dateRangeFilter.from !== null && playedAtTs < dateRangeFilter.from) {
-        return false;
-      }
-      if (dateRangeFilter.to !== null && playedAtTs > dateRangeFilter.to) {
-        return false;
-      }
-
-      return true;
+  const recordFilters = useMemo<RecordFacetFilters>(
+    () => ({
+      rule: selectedRules,
+      stage: selectedStages,
+      myCharacter: selectedMyCharacters,
+      myRacket: selectedMyRackets,
+      opponentCharacter: selectedOpponentCharacters,
+      opponentRacket: selectedOpponentRackets,
+      opponentRateBand: selectedOpponentRateBands,
+      season: selectedSeason.length > 0 ? [selectedSeason] : [],
+      playedFrom: dateRangeFilter.from,
+      playedTo: dateRangeFilter.to
+    }),
+    [
+      dateRangeFilter.from,
+      dateRangeFilter.to,
+      selectedMyCharacters,
+      selectedMyRackets,
+      selectedOpponentCharacters,
+      selectedOpponentRackets,
+      selectedOpponentRateBands,
+      selectedSeason,
+      selectedRules,
+      selectedStages
+    ]
+  );
+  const trendFilters = useMemo<RecordFacetFilters>(
+    () => ({
+      ...EMPTY_RECORD_FILTERS,
+      season: selectedSeason.length > 0 ? [selectedSeason] : [],
+      playedFrom: dateRangeFilter.from,
+      playedTo: dateRangeFilter.to
+    }),
+    [dateRangeFilter.from, dateRangeFilter.to, selectedSeason]
+  );
+  const [recordFacets, setRecordFacets] = useState<RecordFacets | null>(null);
+  useEffect(() => {
+    let isCurrent = true;
+    fetchRecordFacets(recordFilters)
+      .then((facets) => {
+        if (isCurrent) {
+          setRecordFacets(facets);
+        }
+      })
+      .catch((error) => {
+        // 直前の絞り込み条件の件数を残すと誤った件数になるため、表示を消してエラーを出す。
+        if (isCurrent) {
+          setRecordFacets(null);
+          showFetchError(error, "絞り込み件数の取得に失敗しました。");
+        }
+      });
+    return () => {
+      isCurrent = false;
     };
-
-    records.forEach((record) => {
-      if (matchesOtherFilters(record, "rule")) {
-        incrementCount(ruleCounts, record.rule);
-      }
-      if (matchesOtherFilters(record, "stage")) {
-        incrementCount(stageCounts, record.stage);
-      }
-      if (matchesOtherFilters(record, "myCharacter")) {
-        incrementCount(myCharacterCounts, record.myCharacter);
-      }
-      if (matchesOtherFilters(record, "myRacket")) {
-        incrementCount(myRacketCounts, record.myRacket);
-      }
-      if (matchesOtherFilters(record, "opponentCharacter")) {
-        incrementCount(opponentCharacterCounts, record.opponentCharacter);
-      }
-      if (matchesOtherFilters(record, "opponentRacket")) {
-        incrementCount(opponentRacketCounts, record.opponentRacket);
-      }
-      if (matchesOtherFilters(record, "opponentRateBand")) {
-        incrementCount(opponentRateBandCounts, record.opponentRateBand);
-      }
-      if (matchesOtherFilters(record, "season")) {
-        incrementCount(seasonCounts, record.season);
-      }
-    });
-
-    const allSeasonsCount = records.filter((record) => matchesOtherFilters(record, "season")).length;
-
+  }, [recordFilters, records]);
+  const [winRateBreakdown, setWinRateBreakdown] = useState<WinRateBreakdownSets | null>(null);
+  useEffect(() => {
+    let isCurrent = true;
+    fetchWinRateBreakdown(recordFilters, BREAKDOWN_DIMENSIONS)
+      .then((breakdown) => {
+        if (isCurrent) {
+          setWinRateBreakdown(breakdown);
+        }
+      })
+      .catch((error) => {
+        if (isCurrent) {
+          setWinRateBreakdown(null);
+          showFetchError(error, "勝率集計の取得に失敗しました。");
+        }
+      });
+    return () => {
+      isCurrent = false;
+    };
+  }, [recordFilters, records]);
+  const filterOptionCounts = useMemo(() => {
+    const counts = recordFacets?.counts;
+    const seasonCounts = counts?.season ?? new Map<string, number>();
     return {
-      ruleCounts,
-      stageCounts,
-      myCharacterCounts,
-      myRacketCounts,
-      opponentCharacterCounts,
-      opponentRacketCounts,
-      opponentRateBandCounts,
+      ruleCounts: counts?.rule ?? new Map<string, number>(),
+      stageCounts: counts?.stage ?? new Map<string, number>(),
+      myCharacterCounts: counts?.myCharacter ?? new Map<string, number>(),
+      myRacketCounts: counts?.myRacket ?? new Map<string, number>(),
+      opponentCharacterCounts: counts?.opponentCharacter ?? new Map<string, number>(),
+      opponentRacketCounts: counts?.opponentRacket ?? new Map<string, number>(),
+      opponentRateBandCounts: counts?.opponentRateBand ?? new Map<string, number>(),
       seasonCounts,
-      allSeasonsCount
+      allSeasonsCount: Array.from(seasonCounts.values()).reduce((sum, count) => sum + count, 0)
     };
-  }, [
-    dateRangeFilter.from,
-    dateRangeFilter.to,
-    records,
-    selectedMyCharacters,
-    selectedMyRackets,
-    selectedOpponentCharacters,
-    selectedOpponentRackets,
-    selectedOpponentRateBands,
-    selectedSeason,
-    selectedRules,
-    selectedStages
-  ]);
+  }, [recordFacets]);
   const sortedSeasonFilterOptions = useMemo(
     () =>
       [...seasonFilterOptions].sort((left, right) => {
@@ -1168,187 +1197,60 @@ function App() {
     const winRate = total > 0 ? (winCount / total) * 100 : null;
     return { total, winCount, winRate };
   }, [filteredRecords]);
-  const trendFilteredRecords = useMemo(
-    () =>
-      records.filter((record) => {
-        if (selectedSeason.length > 0 && record.season !== selectedSeason) {
-          return false;
-        }
-
-        const playedAtTs = parsePlayedAtTimestamp(record.playedAt);
-        if (dateRangeFilter.from !== null && playedAtTs < dateRangeFilter.from) {
-          return false;
-        }
-        if (dateRangeFilter.to !== null && playedAtTs > dateRangeFilter.to) {
-          return false;
-        }
-
-        return true;
-      }),
-    [dateRangeFilter.from, dateRangeFilter.to, records, selectedSeason]
-  );
   const opponentRateBandWinStats = useMemo(() => {
+    const statsByRateBand = winRateBreakdown?.sets.opponent_rate_band;
     const displayBands = [...RATE_BAND_OPTIONS].reverse();
     return displayBands
       .map((rateBand) => {
-        const targets = filteredRecords.filter((record) => record.opponentRateBand === rateBand);
-        const total = targets.length;
-        const wins = targets.filter((record) => record.result === "WIN").length;
+        const { total, wins } = statsByRateBand?.get(rateBand) ?? { total: 0, wins: 0 };
         const winRate = total > 0 ? (wins / total) * 100 : 0;
         return { rateBand, total, wins, winRate };
       })
       .filter((item) => item.total > 0);
-  }, [filteredRecords]);
-  const stageWinStats = useMemo(() => {
-    const statsByStage = new Map<string, { total: number; wins: number }>();
-
-    filteredRecords.forEach((record) => {
-      const current = statsByStage.get(record.stage) ?? { total: 0, wins: 0 };
-      current.total += 1;
-      if (record.result === "WIN") {
-        current.wins += 1;
-      }
-      statsByStage.set(record.stage, current);
-    });
-
-    return Array.from(statsByStage.entries())
-      .map(([stage, stats]) => ({
-        stage,
-        label: stage,
-        total: stats.total,
-        wins: stats.wins,
-        winRate: (stats.wins / stats.total) * 100
-      }))
-      .sort((left, right) => {
-        const winRateDiff = right.winRate - left.winRate;
-        if (winRateDiff !== 0) {
-          return winRateDiff;
-        }
-        return left.label.localeCompare(right.label, "ja");
-      });
-  }, [filteredRecords]);
-  const myCharacterWinStats = useMemo(() => {
-    const statsByCharacter = new Map<string, { total: number; wins: number }>();
-
-    filteredRecords.forEach((record) => {
-      const current = statsByCharacter.get(record.myCharacter) ?? { total: 0, wins: 0 };
-      current.total += 1;
-      if (record.result === "WIN") {
-        current.wins += 1;
-      }
-      statsByCharacter.set(record.myCharacter, current);
-    });
-
-    return Array.from(statsByCharacter.entries())
-      .map(([character, stats]) => ({
-        character,
-        label: characterLabelByValue[character] ?? character,
-        total: stats.total,
-        wins: stats.wins,
-        winRate: (stats.wins / stats.total) * 100
-      }))
-      .sort((left, right) => {
-        const winRateDiff = right.winRate - left.winRate;
-        if (winRateDiff !== 0) {
-          return winRateDiff;
-        }
-        return left.label.localeCompare(right.label, "ja");
-      });
-  }, [characterLabelByValue, filteredRecords]);
-  const opponentCharacterWinStats = useMemo(() => {
-    const statsByCharacter = new Map<string, { total: number; wins: number }>();
-
-    filteredRecords.forEach((record) => {
-      const current = statsByCharacter.get(record.opponentCharacter) ?? { total: 0, wins: 0 };
-      current.total += 1;
-      if (record.result === "WIN") {
-        current.wins += 1;
-      }
-      statsByCharacter.set(record.opponentCharacter, current);
-    });
-
-    return Array.from(statsByCharacter.entries())
-      .map(([character, stats]) => ({
-        character,
-        label: characterLabelByValue[character] ?? character,
-        total: stats.total,
-        wins: stats.wins,
-        winRate: (stats.wins / stats.total) * 100
-      }))
-      .sort((left, right) => {
-        const winRateDiff = right.winRate - left.winRate;
-        if (winRateDiff !== 0) {
-          return winRateDiff;
-        }
-        return left.label.localeCompare(right.label, "ja");
-      });
-  }, [characterLabelByValue, filteredRecords]);
-  const myRacketWinStats = useMemo(() => {
-    const statsByRacket = new Map<string, { total: number; wins: number }>();
-
-    filteredRecords.forEach((record) => {
-      const racket = record.myRacket.trim();
-      if (racket.length === 0) {
-        return;
-      }
-
-      const current = statsByRacket.get(racket) ?? { total: 0, wins: 0 };
-      current.total += 1;
-      if (record.result === "WIN") {
-        current.wins += 1;
-      }
-      statsByRacket.set(racket, current);
-    });
-
-    return Array.from(statsByRacket.entries())
-      .map(([racket, stats]) => ({
-        racket,
-        label: racket,
-        total: stats.total,
-        wins: stats.wins,
-        winRate: (stats.wins / stats.total) * 100
-      }))
-      .sort((left, right) => {
-        const winRateDiff = right.winRate - left.winRate;
-        if (winRateDiff !== 0) {
-          return winRateDiff;
-        }
-        return left.label.localeCompare(right.label, "ja");
-      });
-  }, [filteredRecords]);
-  const opponentRacketWinStats = useMemo(() => {
-    const statsByRacket = new Map<string, { total: number; wins: number }>();
-
-    filteredRecords.forEach((record) => {
-      const racket = record.opponentRacket.trim();
-      if (racket.length === 0) {
-        return;
-      }
-
-      const current = statsByRacket.get(racket) ?? { total: 0, wins: 0 };
-      current.total += 1;
-      if (record.result === "WIN") {
-        current.wins += 1;
-      }
-      statsByRacket.set(racket, current);
-    });
-
-    return Array.from(statsByRacket.entries())
-      .map(([racket, stats]) => ({
-        racket,
-        label: racket,
-        total: stats.total,
-        wins: stats.wins,
-        winRate: (stats.wins / stats.total) * 100
-      }))
-      .sort((left, right) => {
-        const winRateDiff = right.winRate - left.winRate;
-        if (winRateDiff !== 0) {
-          return winRateDiff;
-        }
-        return left.label.localeCompare(right.label, "ja");
-      });
-  }, [filteredRecords]);
+  }, [winRateBreakdown]);
+  const stageWinStats = useMemo(
+    () =>
+      toWinRateItems(winRateBreakdown?.sets.stage)
+        .map(({ value, ...stats }) => ({ stage: value, label: value, ...stats }))
+        .sort(compareWinRateItems),
+    [winRateBreakdown]
+  );
+  const myCharacterWinStats = useMemo(
+    () =>
+      toWinRateItems(winRateBreakdown?.sets.my_character)
+        .map(({ value, ...stats }) => ({
+          character: value,
+          label: characterLabelByValue[value] ?? value,
+          ...stats
+        }))
+        .sort(compareWinRateItems),
+    [characterLabelByValue, winRateBreakdown]
+  );
+  const opponentCharacterWinStats = useMemo(
+    () =>
+      toWinRateItems(winRateBreakdown?.sets.opponent_character)
+        .map(({ value, ...stats }) => ({
+          character: value,
+          label: characterLabelByValue[value] ?? value,
+          ...stats
+        }))
+        .sort(compareWinRateItems),
+    [characterLabelByValue, winRateBreakdown]
+  );
+  const myRacketWinStats = useMemo(
+    () =>
+      toWinRateItems(winRateBreakdown?.sets.my_racket)
+        .map(({ value, ...stats }) => ({ racket: value, label: value, ...stats }))
+        .sort(compareWinRateItems),
+    [winRateBreakdown]
+  );
+  const opponentRacketWinStats = useMemo(
+    () =>
+      toWinRateItems(winRateBreakdown?.sets.opponent_racket)
+        .map(({ value, ...stats }) => ({ racket: value, label: value, ...stats }))
+        .sort(compareWinRateItems),
+    [winRateBreakdown]
+  );
   const filterWinRateStatsByMinMatches = <T extends { total: number }>(items: T[]) => {
     if (!showOnlyMinMatchesWinRateStats) {
       return items;
@@ -1361,112 +1263,42 @@ function App() {
   const visibleOpponentCharacterWinStats = filterWinRateStatsByMinMatches(opponentCharacterWinStats);
   const visibleMyRacketWinStats = filterWinRateStatsByMinMatches(myRacketWinStats);
   const visibleOpponentRacketWinStats = filterWinRateStatsByMinMatches(opponentRacketWinStats);
-  const opponentCharacterUsageStats = useMemo(() => {
-    const totalMatches = filteredRecords.length;
-    if (totalMatches === 0) {
-      return [];
-    }
-
-    const countByCharacter = new Map<string, number>();
-    filteredRecords.forEach((record) => {
-      incrementCount(countByCharacter, record.opponentCharacter);
-    });
-
-    return Array.from(countByCharacter.entries())
-      .map(([character, count]) => ({
-        character,
-        label: characterLabelByValue[character] ?? character,
-        count,
-        usageRate: (count / totalMatches) * 100
-      }))
-      .sort((left, right) => {
-        const usageRateDiff = right.usageRate - left.usageRate;
-        if (usageRateDiff !== 0) {
-          return usageRateDiff;
-        }
-        return left.label.localeCompare(right.label, "ja");
-      });
-  }, [characterLabelByValue, filteredRecords]);
-  const myCharacterUsageStats = useMemo(() => {
-    const totalMatches = filteredRecords.length;
-    if (totalMatches === 0) {
-      return [];
-    }
-
-    const countByCharacter = new Map<string, number>();
-    filteredRecords.forEach((record) => {
-      incrementCount(countByCharacter, record.myCharacter);
-    });
-
-    return Array.from(countByCharacter.entries())
-      .map(([character, count]) => ({
-        character,
-        label: characterLabelByValue[character] ?? character,
-        count,
-        usageRate: (count / totalMatches) * 100
-      }))
-      .sort((left, right) => {
-        const usageRateDiff = right.usageRate - left.usageRate;
-        if (usageRateDiff !== 0) {
-          return usageRateDiff;
-        }
-        return left.label.localeCompare(right.label, "ja");
-      });
-  }, [characterLabelByValue, filteredRecords]);
-  const myRacketUsageStats = useMemo(() => {
-    const recordsWithRacket = filteredRecords.filter((record) => record.myRacket.trim().length > 0);
-    const totalMatches = recordsWithRacket.length;
-    if (totalMatches === 0) {
-      return [];
-    }
-
-    const countByRacket = new Map<string, number>();
-    recordsWithRacket.forEach((record) => {
-      incrementCount(countByRacket, record.myRacket);
-    });
-
-    return Array.from(countByRacket.entries())
-      .map(([racket, count]) => ({
-        racket,
-        label: racket,
-        count,
-        usageRate: (count / totalMatches) * 100
-      }))
-      .sort((left, right) => {
-        const usageRateDiff = right.usageRate - left.usageRate;
-        if (usageRateDiff !== 0) {
-          return usageRateDiff;
-        }
-        return left.label.localeCompare(right.label, "ja");
-      });
-  }, [filteredRecords]);
-  const opponentRacketUsageStats = useMemo(() => {
-    const recordsWithRacket = filteredRecords.filter((record) => record.opponentRacket.trim().length > 0);
-    const totalMatches = recordsWithRacket.length;
-    if (totalMatches === 0) {
-      return [];
-    }
-
-    const countByRacket = new Map<string, number>();
-    recordsWithRacket.forEach((record) => {
-      incrementCount(countByRacket, record.opponentRacket);
-    });
-
-    return Array.from(countByRacket.entries())
-      .map(([racket, count]) => ({
-        racket,
-        label: racket,
-        count,
-        usageRate: (count / totalMatches) * 100
-      }))
-      .sort((left, right) => {
-        const usageRateDiff = right.usageRate - left.usageRate;
-        if (usageRateDiff !== 0) {
-          return usageRateDiff;
-        }
-        return left.label.localeCompare(right.label, "ja");
-      });
-  }, [filteredRecords]);
+  const opponentCharacterUsageStats = useMemo(
+    () =>
+      toUsageItems(winRateBreakdown?.sets.opponent_character)
+        .map(({ value, ...usage }) => ({
+          character: value,
+          label: characterLabelByValue[value] ?? value,
+          ...usage
+        }))
+        .sort(compareUsageItems),
+    [characterLabelByValue, winRateBreakdown]
+  );
+  const myCharacterUsageStats = useMemo(
+    () =>
+      toUsageItems(winRateBreakdown?.sets.my_character)
+        .map(({ value, ...usage }) => ({
+          character: value,
+          label: characterLabelByValue[value] ?? value,
+          ...usage
+        }))
+        .sort(compareUsageItems),
+    [characterLabelByValue, winRateBreakdown]
+  );
+  const myRacketUsageStats = useMemo(
+    () =>
+      toUsageItems(winRateBreakdown?.sets.my_racket)
+        .map(({ value, ...usage }) => ({ racket: value, label: value, ...usage }))
+        .sort(compareUsageItems),
+    [winRateBreakdown]
+  );
+  const opponentRacketUsageStats = useMemo(
+    () =>
+      toUsageItems(winRateBreakdown?.sets.opponent_racket)
+        .map(({ value, ...usage }) => ({ racket: value, label: value, ...usage }))
+        .sort(compareUsageItems),
+    [winRateBreakdown]
+  );
   const getVisibleRateList = <T,>(items: T[], key: ExpandableRateListKey) =>
     expandedRateLists[key] ? items : items.slice(0, RATE_BAND_COLLAPSE_ROW_COUNT);
   const toggleRateListExpanded = (key: ExpandableRateListKey) => {
@@ -1491,192 +1323,87 @@ function App() {
       </div>
     );
   };
-  const rateTrendSeries = useMemo<RateTrendLineSeries[]>(() => {
-    const samples = trendFilteredRecords
-      .map((record) => ({
-        id: record.id,
-        rule: record.rule,
-        timestamp: parsePlayedAtTimestamp(record.playedAt),
-        playedAt: record.playedAt,
-        rate: Number(record.myRate),
-        rateBand: record.myRateBand.trim(),
-        season: record.season
-      }))
-      .filter((sample) => sample.timestamp > 0 && !Number.isNaN(sample.rate))
-      .sort((left, right) => {
-        const timestampDiff = left.timestamp - right.timestamp;
-        if (timestampDiff !== 0) {
-          return timestampDiff;
+  const [rateTrend, setRateTrend] = useState<RateTrendSeries[]>([]);
+  const [dailyRateTrend, setDailyRateTrend] = useState<RateTrendSeries[]>([]);
+  const [rateCandles, setRateCandles] = useState<RateCandle[]>([]);
+  useEffect(() => {
+    let isCurrent = true;
+    // 表示中のグラフに必要な系列だけを取得する。
+    const load = async () => {
+      if (rateTrendViewMode === "candlestick") {
+        const candles = await fetchRateCandles({ ...trendFilters, rule: [selectedTrendRule] });
+        if (isCurrent) {
+          setRateCandles(candles);
         }
-        return left.id - right.id;
-      });
-
-    const pointsByRule = new Map<MatchRecordValues["rule"], RateTrendLineSeries["points"]>();
-    samples.forEach((sample) => {
-      const points = pointsByRule.get(sample.rule) ?? [];
-      points.push({
-        id: sample.id,
-        timestamp: sample.timestamp,
-        playedAt: sample.playedAt,
-        rate: sample.rate,
-        rateBand: sample.rateBand,
-        season: sample.season
-      });
-      pointsByRule.set(sample.rule, points);
+        return;
+      }
+      if (rateTrendViewMode === "step") {
+        const series = await fetchRateTrend(trendFilters, "daily", RATE_TREND_MAX_POINTS);
+        if (isCurrent) {
+          setDailyRateTrend(series);
+        }
+        return;
+      }
+      const series = await fetchRateTrend(trendFilters, "match", RATE_TREND_MAX_POINTS);
+      if (isCurrent) {
+        setRateTrend(series);
+      }
+    };
+    load().catch((error) => {
+      if (isCurrent) {
+        setRateTrend([]);
+        setDailyRateTrend([]);
+        setRateCandles([]);
+        showFetchError(error, "レート推移の取得に失敗しました。");
+      }
     });
-
+    return () => {
+      isCurrent = false;
+    };
+  }, [rateTrendViewMode, records, selectedTrendRule, trendFilters]);
+  const rateTrendSeries = useMemo<RateTrendLineSeries[]>(() => {
+    const pointsByRule = new Map(rateTrend.map((series) => [series.rule, series.points]));
     return RULE_OPTIONS.map((option) => ({
       rule: option.value,
       label: option.label,
       color: RULE_TREND_COLORS[option.value],
-      points: pointsByRule.get(option.value) ?? []
+      points: (pointsByRule.get(option.value) ?? []).map((point) => ({
+        id: point.id,
+        timestamp: parsePlayedAtTimestamp(point.playedAt),
+        playedAt: point.playedAt,
+        rate: point.rate,
+        rateBand: point.rateBand,
+        season: point.season
+      }))
     })).filter((series) => series.points.length > 0);
-  }, [trendFilteredRecords]);
+  }, [rateTrend]);
   const rateTrendStepSeries = useMemo<RateTrendStepSeries[]>(() => {
-    const samples = trendFilteredRecords
-      .map((record) => ({
-        id: record.id,
-        rule: record.rule,
-        timestamp: parsePlayedAtTimestamp(record.playedAt),
-        playedAt: record.playedAt,
-        rate: Number(record.myRate),
-        rateBand: record.myRateBand.trim(),
-        season: record.season
-      }))
-      .filter((sample) => sample.timestamp > 0 && !Number.isNaN(sample.rate))
-      .sort((left, right) => {
-        const timestampDiff = left.timestamp - right.timestamp;
-        if (timestampDiff !== 0) {
-          return timestampDiff;
-        }
-        return left.id - right.id;
-      });
-
-    const dailyByRule = new Map<
-      MatchRecordValues["rule"],
-      Map<
-        string,
-        {
-          dateKey: string;
-          dayStartTimestamp: number;
-          end: (typeof samples)[number];
-        }
-      >
-    >();
-
-    samples.forEach((sample) => {
-      const dateKey = toDateKey(sample.timestamp);
-      if (dateKey.length === 0) {
-        return;
-      }
-
-      const dayStartTimestamp = toDateStartTimestamp(dateKey);
-      const groupedByDay = dailyByRule.get(sample.rule) ?? new Map();
-      const current = groupedByDay.get(dateKey);
-      if (!current) {
-        groupedByDay.set(dateKey, {
-          dateKey,
-          dayStartTimestamp,
-          end: sample
-        });
-        dailyByRule.set(sample.rule, groupedByDay);
-        return;
-      }
-
-      current.end = sample;
-    });
-
-    return RULE_OPTIONS.map((option) => {
-      const groupedByDay = dailyByRule.get(option.value);
-      if (!groupedByDay || groupedByDay.size === 0) {
+    const pointsByRule = new Map(dailyRateTrend.map((series) => [series.rule, series.points]));
+    return RULE_OPTIONS.map((option) => ({
+      rule: option.value,
+      label: option.label,
+      color: RULE_TREND_COLORS[option.value],
+      points: (pointsByRule.get(option.value) ?? []).map((point) => {
+        const dateKey = point.date ?? point.playedAt.slice(0, 10);
         return {
-          rule: option.value,
-          label: option.label,
-          color: RULE_TREND_COLORS[option.value],
-          points: []
+          id: point.id,
+          timestamp: toDateStartTimestamp(dateKey),
+          playedAt: point.playedAt,
+          rate: point.rate,
+          rateBand: point.rateBand,
+          dateKey,
+          season: point.season
         };
-      }
-
-      const points = Array.from(groupedByDay.values())
-        .sort((left, right) => left.dayStartTimestamp - right.dayStartTimestamp)
-        .map((item) => ({
-          id: item.end.id,
-          timestamp: item.dayStartTimestamp,
-          playedAt: item.end.playedAt,
-          rate: item.end.rate,
-          rateBand: item.end.rateBand,
-          dateKey: item.dateKey,
-          season: item.end.season
-        }));
-
-      return {
-        rule: option.value,
-        label: option.label,
-        color: RULE_TREND_COLORS[option.value],
-        points
-      };
-    }).filter((series) => series.points.length > 0);
-  }, [trendFilteredRecords]);
-  const dailyRateCandles = useMemo<DailyRateCandle[]>(() => {
-    const samples = trendFilteredRecords
-      .filter((record) => record.rule === selectedTrendRule)
-      .map((record) => ({
-        id: record.id,
-        timestamp: parsePlayedAtTimestamp(record.playedAt),
-        rate: Number(record.myRate)
-      }))
-      .filter((sample) => sample.timestamp > 0 && !Number.isNaN(sample.rate))
-      .sort((left, right) => {
-        const timestampDiff = left.timestamp - right.timestamp;
-        if (timestampDiff !== 0) {
-          return timestampDiff;
-        }
-        return left.id - right.id;
-      });
-
-    const grouped = new Map<
-      string,
-      DailyRateCandle & { firstTimestamp: number; lastTimestamp: number }
-    >();
-
-    samples.forEach((sample) => {
-      const dateKey = toDateKey(sample.timestamp);
-      if (dateKey.length === 0) {
-        return;
-      }
-
-      const current = grouped.get(dateKey);
-      if (!current) {
-        grouped.set(dateKey, {
-          date: dateKey,
-          open: sample.rate,
-          high: sample.rate,
-          low: sample.rate,
-          close: sample.rate,
-          matches: 1,
-          firstTimestamp: sample.timestamp,
-          lastTimestamp: sample.timestamp
-        });
-        return;
-      }
-
-      current.high = Math.max(current.high, sample.rate);
-      current.low = Math.min(current.low, sample.rate);
-      current.matches += 1;
-      if (sample.timestamp < current.firstTimestamp) {
-        current.firstTimestamp = sample.timestamp;
-        current.open = sample.rate;
-      }
-      if (sample.timestamp >= current.lastTimestamp) {
-        current.lastTimestamp = sample.timestamp;
-        current.close = sample.rate;
-      }
-    });
-
-    return Array.from(grouped.values())
-      .sort((left, right) => left.firstTimestamp - right.firstTimestamp)
-      .map(({ firstTimestamp, lastTimestamp, ...candle }) => candle);
-  }, [selectedTrendRule, trendFilteredRecords]);
+      })
+    })).filter((series) => series.points.length > 0);
+  }, [dailyRateTrend]);
+  const dailyRateCandles = useMemo<DailyRateCandle[]>(
+    () =>
+      rateCandles
+        .filter((candle) => candle.rule === selectedTrendRule)
+        .map(({ rule, ...candle }) => candle),
+    [rateCandles, selectedTrendRule]
+  );
   const ruleRateOverviewStats = useMemo(
     () =>
       RULE_OPTIONS.map((option) => {
@@ -1778,54 +1505,26 @@ function App() {
     setDateFrom("");
     setDateTo("");
   };
-  const myRateDeltaByRecordId = useMemo(() => {
-    const deltas = new Map<number, number | null>();
-    const groupedByRule = new Map<MatchRecord["rule"], MatchRecord[]>();
-
-    records.forEach((record) => {
-      const list = groupedByRule.get(record.rule);
-      if (list) {
-        list.push(record);
-        return;
-      }
-      groupedByRule.set(record.rule, [record]);
-    });
-
-    groupedByRule.forEach((ruleRecords) => {
-      const sorted = [...ruleRecords].sort((left, right) => {
-        const playedAtDiff = parsePlayedAtTimestamp(left.playedAt) - parsePlayedAtTimestamp(right.playedAt);
-        if (playedAtDiff !== 0) {
-          return playedAtDiff;
+  const [myRateDeltaByRecordId, setMyRateDeltaByRecordId] = useState<Map<number, number | null>>(
+    () => new Map()
+  );
+  useEffect(() => {
+    let isCurrent = true;
+    fetchRateDeltas()
+      .then((deltas) => {
+        if (isCurrent) {
+          setMyRateDeltaByRecordId(deltas);
         }
-
-        const createdAtDiff = new Date(left.createdAt).getTime() - new Date(right.createdAt).getTime();
-        if (!Number.isNaN(createdAtDiff) && createdAtDiff !== 0) {
-          return createdAtDiff;
+      })
+      .catch((error) => {
+        if (isCurrent) {
+          setMyRateDeltaByRecordId(new Map());
+          showFetchError(error, "レート増減の取得に失敗しました。");
         }
-
-        return left.id - right.id;
       });
-
-      for (let index = 0; index < sorted.length; index += 1) {
-        const current = sorted[index];
-        const currentRate = Number(current.myRate);
-        if (index === 0 || Number.isNaN(currentRate)) {
-          deltas.set(current.id, null);
-          continue;
-        }
-
-        const previous = sorted[index - 1];
-        const previousRate = Number(previous.myRate);
-        if (Number.isNaN(previousRate) || previous.season !== current.season) {
-          deltas.set(current.id, null);
-          continue;
-        }
-
-        deltas.set(current.id, currentRate - previousRate);
-      }
-    });
-
-    return deltas;
+    return () => {
+      isCurrent = false;
+    };
   }, [records]);
 
   const baseColumns = useMemo<GridColDef<MatchRecord>[]>(
@@ -35,6 +35,130 @@ type MatchRecordDto = {
   opponent_partner_player_name: string | null;
 };
 
+type ColumnarMatchRecordsDto = {
+  row_count: number;
+  columns: Array<
+    | { name: string; values: unknown[] }
+    | { name: string; dictionary: unknown[]; codes: number[] }
+  >;
+};
+
+type RecordFacetsDto = {
+  total: number;
+  facets: Record<string, Array<{ value: string | null; count: number }>>;
+};
+
+export type RecordFacetFilters = {
+  rule: string[];
+  stage: string[];
+  myCharacter: string[];
+  myRacket: string[];
+  opponentCharacter: string[];
+  opponentRacket: string[];
+  opponentRateBand: string[];
+  season: string[];
+  playedFrom: number | null;
+  playedTo: number | null;
+};
+
+type RecordFacetField = Exclude<keyof RecordFacetFilters, "playedFrom" | "playedTo">;
+
+type WinRateBreakdownGroupDto = {
+  values: Record<string, string | null>;
+  total: number;
+  wins: number;
+  win_rate: number | null;
+};
+
+type WinRateBreakdownDto = {
+  dimensions: string[];
+  total: number;
+  wins: number;
+  win_rate: number | null;
+  groups: WinRateBreakdownGroupDto[];
+  sets: Record<string, WinRateBreakdownGroupDto[]>;
+};
+
+export type BreakdownDimension =
+  | "stage"
+  | "my_character"
+  | "opponent_character"
+  | "my_racket"
+  | "opponent_racket"
+  | "opponent_rate_band";
+
+export type WinRateCounts = {
+  total: number;
+  wins: number;
+};
+
+export type WinRateBreakdownSets = WinRateCounts & {
+  sets: Record<BreakdownDimension, Map<string, WinRateCounts>>;
+};
+
+type RateTrendPointDto = {
+  id: number;
+  played_at: string;
+  rate: number;
+  rate_band: string;
+  season: string;
+  date: string | null;
+};
+
+type RateTrendSeriesDto = {
+  rule: MatchRecordValues["rule"];
+  total_points: number;
+  points: RateTrendPointDto[];
+};
+
+export type RateTrendPoint = {
+  id: number;
+  playedAt: string;
+  rate: number;
+  rateBand: string;
+  season: string;
+  date: string | null;
+};
+
+export type RateTrendSeries = {
+  rule: MatchRecordValues["rule"];
+  totalPoints: number;
+  points: RateTrendPoint[];
+};
+
+export type RateCandle = {
+  rule: MatchRecordValues["rule"];
+  date: string;
+  open: number;
+  high: number;
+  low: number;
+  close: number;
+  matches: number;
+};
+
+type RateDeltaDto = {
+  id: number;
+  delta: number | null;
+};
+
+export type RecordFacets = {
+  total: number;
+  counts: Record<RecordFacetField, Map<string, number>>;
+};
+
+const RECORD_FACET_PARAMS: Record<RecordFacetField, string> = {
+  rule: "rule",
+  stage: "stage",
+  myCharacter: "my_character",
+  myRacket: "my_racket",
+  opponentCharacter: "opponent_character",
+  opponentRacket: "opponent_racket",
+  opponentRateBand: "opponent_rate_band",
+  season: "season"
+};
+
+type MatchRecordDtoReader = <K extends keyof MatchRecordDto>(name: K) => MatchRecordDto[K];
+
 type MatchRecordPayload = {
   played_at: string;
   rule: string;
@@ -80,6 +204,13 @@ const formatDatetimeLocal = (isoValue: string) => {
   )}:${pad2(date.getMinutes())}`;
 };
 
+const formatDatetimeParam = (timestamp: number) => {
+  const date = new Date(timestamp);
+  return `${date.getFullYear()}-${pad2(date.getMonth() + 1)}-${pad2(date.getDate())}T${pad2(
+    date.getHours()
+  )}:${pad2(date.getMinutes())}:${pad2(date.getSeconds())}`;
+};
+
 const trimOrNull = (value: string) => {
   const trimmed = value.trim();
   return trimmed.length === 0 ? null : trimmed;
@@ -109,34 +240,57 @@ const toPayload = (values: MatchRecordValues): MatchRecordPayload => ({
   opponent_partner_player_name: trimOrNull(values.opponentPartnerPlayerName)
 });
 
-const fromDto = (dto: MatchRecordDto): MatchRecord => ({
-  id: dto.id,
-  createdAt: dto.created_at,
-  playedAt: formatDatetimeLocal(dto.played_at),
-  season: dto.season,
-  rule: dto.rule,
-  stage: dto.stage,
-  myScore: String(dto.my_score),
-  opponentScore: String(dto.opponent_score),
-  myCharacter: dto.my_character,
-  myPartnerCharacter: dto.my_partner_character ?? "",
-  opponentCharacter: dto.opponent_character,
-  opponentPartnerCharacter: dto.opponent_partner_character ?? "",
-  myRacket: dto.my_racket ?? "",
-  myPartnerRacket: dto.my_partner_racket ?? "",
-  opponentRacket: dto.opponent_racket ?? "",
-  opponentPartnerRacket: dto.opponent_partner_racket ?? "",
-  myRate: String(dto.my_rate),
-  result: dto.result,
-  myRateBand: dto.my_rate_band,
-  myPartnerRateBand: dto.my_partner_rate_band ?? "",
-  opponentRateBand: dto.opponent_rate_band,
-  opponentPartnerRateBand: dto.opponent_partner_rate_band ?? "",
-  opponentPlayerName: dto.opponent_player_name ?? "",
-  myPartnerPlayerName: dto.my_partner_player_name ?? "",
-  opponentPartnerPlayerName: dto.opponent_partner_player_name ?? ""
+const readMatchRecord = (read: MatchRecordDtoReader): MatchRecord => ({
+  id: read("id"),
+  createdAt: read("created_at"),
+  playedAt: formatDatetimeLocal(read("played_at")),
+  season: read("season"),
+  rule: read("rule"),
+  stage: read("stage"),
+  myScore: String(read("my_score")),
+  opponentScore: String(read("opponent_score")),
+  myCharacter: read("my_character"),
+  myPartnerCharacter: read("my_partner_character") ?? "",
+  opponentCharacter: read("opponent_character"),
+  opponentPartnerCharacter: read("opponent_partner_character") ?? "",
+  myRacket: read("my_racket") ?? "",
+  myPartnerRacket: read("my_partner_racket") ?? "",
+  opponentRacket: read("opponent_racket") ?? "",
+  opponentPartnerRacket: read("opponent_partner_racket") ?? "",
+  myRate: String(read("my_rate")),
+  result: read("result"),
+  myRateBand: read("my_rate_band"),
+  myPartnerRateBand: read("my_partner_rate_band") ?? "",
+  opponentRateBand: read("opponent_rate_band"),
+  opponentPartnerRateBand: read("opponent_partner_rate_band") ?? "",
+  opponentPlayerName: read("opponent_player_name") ?? "",
+  myPartnerPlayerName: read("my_partner_player_name") ?? "",
+  opponentPartnerPlayerName: read("opponent_partner_player_name") ?? ""
 });
 
+const fromDto = (dto: MatchRecordDto): MatchRecord => readMatchRecord((name) => dto[name]);
+
+const fromColumnarDto = (data: ColumnarMatchRecordsDto): MatchRecord[] => {
+  const columns = new Map<string, (index: number) => unknown>();
+  for (const column of data.columns) {
+    if ("codes" in column) {
+      const { dictionary, codes } = column;
+      columns.set(column.name, (index) => dictionary[codes[index]]);
+    } else {
+      const { values } = column;
+      columns.set(column.name, (index) => values[index]);
+    }
+  }
+
+  const records: MatchRecord[] = new Array(data.row_count);
+  for (let index = 0; index < data.row_count; index += 1) {
+    records[index] = readMatchRecord(
+      (name) => (columns.get(name)?.(index) ?? null) as MatchRecordDto[typeof name]
+    );
+  }
+  return records;
+};
+
 async function request<T>(path: string, init?: RequestInit): Promise<T> {
   let response: Response;
   try {
@@ -159,8 +313,100 @@ async function request<T>(path: string, init?: RequestInit): Promise<T> {
 }
 
 export async function listRecords(): Promise<MatchRecord[]> {
-  const data = await request<MatchRecordDto[]>("/records");
-  return data.map(fromDto);
+  const data = await request<ColumnarMatchRecordsDto>("/records?format=columnar");
+  return fromColumnarDto(data);
+}
+
+const toRecordFilterParams = (filters: RecordFacetFilters) => {
+  const params = new URLSearchParams();
+  const fields = Object.keys(RECORD_FACET_PARAMS) as RecordFacetField[];
+  for (const field of fields) {
+    for (const value of filters[field]) {
+      params.append(RECORD_FACET_PARAMS[field], value);
+    }
+  }
+  if (filters.playedFrom !== null) {
+    params.set("played_from", formatDatetimeParam(filters.playedFrom));
+  }
+  if (filters.playedTo !== null) {
+    params.set("played_to", formatDatetimeParam(filters.playedTo));
+  }
+  return params;
+};
+
+export async function fetchRecordFacets(filters: RecordFacetFilters): Promise<RecordFacets> {
+  const params = toRecordFilterParams(filters);
+  const data = await request<RecordFacetsDto>(`/records/facets?${params.toString()}`);
+  const fields = Object.keys(RECORD_FACET_PARAMS) as RecordFacetField[];
+  const counts = {} as RecordFacets["counts"];
+  for (const field of fields) {
+    // Missing optional values come back as null but are held as "" on the client.
+    counts[field] = new Map(
+      (data.facets[RECORD_FACET_PARAMS[field]] ?? []).map(({ value, count }) => [value ?? "", count])
+    );
+  }
+  return { total: data.total, counts };
+}
+
+export async function fetchWinRateBreakdown(
+  filters: RecordFacetFilters,
+  dimensions: BreakdownDimension[]
+): Promise<WinRateBreakdownSets> {
+  const params = toRecordFilterParams(filters);
+  for (const dimension of dimensions) {
+    params.append("group_by", dimension);
+  }
+  params.set("grouping", "sets");
+
+  const data = await request<WinRateBreakdownDto>(`/stats/breakdown?${params.toString()}`);
+  const sets = {} as WinRateBreakdownSets["sets"];
+  for (const dimension of dimensions) {
+    // Keyed like the facet counts, with null as "".
+    sets[dimension] = new Map(
+      (data.sets[dimension] ?? []).map((group) => [
+        group.values[dimension] ?? "",
+        { total: group.total, wins: group.wins }
+      ])
+    );
+  }
+  return { total: data.total, wins: data.wins, sets };
+}
+
+const fromRateTrendSeriesDto = (series: RateTrendSeriesDto): RateTrendSeries => ({
+  rule: series.rule,
+  totalPoints: series.total_points,
+  points: series.points.map((point) => ({
+    id: point.id,
+    playedAt: formatDatetimeLocal(point.played_at),
+    rate: point.rate,
+    rateBand: point.rate_band,
+    season: point.season,
+    date: point.date
+  }))
+});
+
+export async function fetchRateTrend(
+  filters: RecordFacetFilters,
+  granularity: "match" | "daily",
+  maxPoints?: number
+): Promise<RateTrendSeries[]> {
+  const params = toRecordFilterParams(filters);
+  params.set("granularity", granularity);
+  if (maxPoints !== undefined) {
+    params.set("max_points", String(maxPoints));
+  }
+  const data = await request<RateTrendSeriesDto[]>(`/stats/rate-trend?${params.toString()}`);
+  return data.map(fromRateTrendSeriesDto);
+}
+
+export async function fetchRateCandles(filters: RecordFacetFilters): Promise<RateCandle[]> {
+  const params = toRecordFilterParams(filters);
+  return request<RateCandle[]>(`/stats/rate-candles?${params.toString()}`);
+}
+
+export async function fetchRateDeltas(): Promise<Map<number, number | null>> {
+  const data = await request<RateDeltaDto[]>("/stats/rate-deltas");
+  return new Map(data.map(({ id, delta }) => [id, delta]));
 }
 
 export async function createRecord(values: MatchRecordValues): Promise<MatchRecord> {
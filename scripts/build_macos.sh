@@ -39,7 +39,7 @@ if [[ ! -x "${PIP_BIN}" ]]; then
 fi
 
 if [[ ! -x "${PYINSTALLER_BIN}" ]]; then
-  "${PIP_BIN}" install -r "${BACKEND_DIR}/requirements.txt" pyinstaller
+  "${PIP_BIN}" install -r "${BACKEND_DIR}/requirements.txt" pyinstaller brotli
 fi
 
 (
@@ -48,6 +48,12 @@ fi
   npm run build
 )
 
+(
+  cd "${BACKEND_DIR}"
+  "${PYTHON_BIN}" -m app.static_assets precompress "${FRONTEND_DIR}/dist"
+  "${PYTHON_BIN}" -m app.version write "${MFSTAT_APP_VERSION}"
+)
+
 # Keep PyInstaller cache inside workspace to avoid host-path permission issues.
 export PYINSTALLER_CONFIG_DIR="${BACKEND_DIR}/.pyinstaller"
 
@@ -59,6 +65,7 @@ export PYINSTALLER_CONFIG_DIR="${BACKEND_DIR}/.pyinstaller"
     --windowed \
     --name "${APP_NAME}" \
     --add-data "../frontend/dist:frontend/dist" \
+    --add-data "alembic:alembic" \
     --collect-all webview \
     desktop_launcher.py
 )
@@ -27,7 +27,7 @@ if (-not (Test-Path $PythonExe)) {
 }
 
 if (-not (Test-Path $PyInstallerExe)) {
-  & $PipExe install -r (Join-Path $BackendDir "requirements.txt") pyinstaller
+  & $PipExe install -r (Join-Path $BackendDir "requirements.txt") pyinstaller brotli
 }
 
 Push-Location $FrontendDir
@@ -39,6 +39,15 @@ finally {
   Pop-Location
 }
 
+Push-Location $BackendDir
+try {
+  & $PythonExe -m app.static_assets precompress (Join-Path $FrontendDir "dist")
+  & $PythonExe -m app.version write $env:MFSTAT_APP_VERSION
+}
+finally {
+  Pop-Location
+}
+
 $env:PYINSTALLER_CONFIG_DIR = Join-Path $BackendDir ".pyinstaller"
 
 Push-Location $BackendDir
@@ -49,6 +58,7 @@ try {
     --windowed `
     --name $AppName `
     --add-data "..\frontend\dist;frontend\dist" `
+    --add-data "alembic;alembic" `
     --collect-all webview `
     desktop_launcher.py
 }